@@ -10,19 +10,24 @@ from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 
 # Импорты из модулей
-from admin_bot.config.constants import BOT_TOKEN
+from admin_bot.config.constants import BOT_TOKEN, METRICS_HOST, METRICS_PORT
 from admin_bot.handlers.registration import register_all_handlers
+from admin_bot.utils.logo_store import run_logo_gc
+from admin_bot.utils.offer_manager import get_catalog_version, load_offers
+from shared.logging_setup import setup_queue_logging
+from shared.loop_monitor import LoopLagMonitor
+from shared.metrics import REGISTRY, MetricsServer, collect_catalog, collect_fsm_keys
+from shared.metrics_middleware import setup_metrics_middlewares
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Настройка логирования: JSON-строки через очередь, вывод в отдельном потоке
+setup_queue_logging(logging.INFO, sample_rates={"aiogram.event": 0.1})
 logger = logging.getLogger(__name__)
 
 # Инициализация бота
 bot = Bot(token=BOT_TOKEN)
 dp = Dispatcher(storage=MemoryStorage())
+metrics_server = MetricsServer(METRICS_PORT, METRICS_HOST)
+loop_monitor = LoopLagMonitor()
 
 
 async def main():
@@ -30,6 +35,13 @@ async def main():
     try:
         logger.info("🔧 Запуск админского бота...")
 
+        # Метрики: апдейты, обработчики, Bot API, каталог и FSM
+        setup_metrics_middlewares(dp, bot)
+        REGISTRY.add_collector(collect_catalog(get_catalog_version, lambda: load_offers().get('microloans', {})))
+        REGISTRY.add_collector(collect_fsm_keys(dp.storage))
+        await metrics_server.start()
+        loop_monitor.start()
+
         # Регистрируем все обработчики
         await register_all_handlers(dp, bot)
 
@@ -43,15 +55,23 @@ async def main():
         logger.info("   • 🔄 Активация/деактивация офферов")
         logger.info("   • 🗑️ Безопасное удаление")
 
+        # Периодическая очистка логотипов, на которые не ссылается ни один оффер
+        logo_gc_task = asyncio.create_task(run_logo_gc())
+
         # Удаляем устаревшие вебхуки и запускаем polling
         await bot.delete_webhook(drop_pending_updates=True)
-        await dp.start_polling(bot)
+        try:
+            await dp.start_polling(bot)
+        finally:
+            logo_gc_task.cancel()
 
     except Exception as e:
         logger.error(f"❌ Критическая ошибка запуска бота: {e}")
         raise
     finally:
         logger.info("🛑 Закрытие сессии бота...")
+        await metrics_server.stop()
+        await loop_monitor.stop()
         await bot.session.close()
 
 
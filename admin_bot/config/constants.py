@@ -9,7 +9,14 @@ BOT_TOKEN = os.getenv('ADMIN_BOT_TOKEN', 'YOUR_ADMIN_BOT_TOKEN')
 # Пути к файлам и директориям
 DATA_DIR = 'data'
 OFFERS_FILE = os.path.join(DATA_DIR, 'offers.json')
+OFFERS_DB_FILE = os.path.join(DATA_DIR, 'offers.db')
+ANALYTICS_DB_FILE = os.path.join(DATA_DIR, 'analytics.db')
 IMAGES_DIR = os.path.join(DATA_DIR, 'images', 'logos')
+CONTROL_DB_FILE = os.path.join(DATA_DIR, 'control.db')
+
+# Локальный эндпоинт /metrics (порт 0 - отключен)
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('ADMIN_BOT_METRICS_PORT', '9102'))
 
 # Способы получения средств
 PAYMENT_METHODS = {
@@ -0,0 +1,129 @@
+"""
+Обработчики экрана аналитики трафика основного бота
+"""
+import logging
+from datetime import datetime
+from aiogram import F
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
+
+from shared.analytics_reports import AnalyticsReports, REPORT_WINDOWS
+from admin_bot.config.auth import is_admin
+from admin_bot.config.constants import ANALYTICS_DB_FILE
+from admin_bot.utils.offer_manager import load_offers
+from admin_bot.utils.formatters import escape_html
+from admin_bot.utils.message_utils import safe_edit_message
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = "24h"
+COUNTRY_NAMES = {"russia": "🇷🇺 Россия", "kazakhstan": "🇰🇿 Казахстан"}
+FUNNEL_LABELS = {
+    "choosing_country": "Страна",
+    "choosing_age": "Возраст",
+    "choosing_amount": "Сумма",
+    "choosing_term": "Срок",
+    "choosing_payment": "Способ получения",
+    "choosing_zero_percent": "0%",
+    "viewing_offers": "Офферы"
+}
+
+_reports = AnalyticsReports(ANALYTICS_DB_FILE)
+
+
+def analytics_keyboard(window: str) -> InlineKeyboardMarkup:
+    """Переключатель окна отчета"""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=f"• {label} •" if code == window else label,
+                                 callback_data=f"analytics_{code}")
+            for code, (label, _, _) in REPORT_WINDOWS.items()
+        ],
+        [InlineKeyboardButton(text="🔄 Обновить", callback_data=f"analytics_refresh_{window}")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="main_menu")]
+    ])
+
+
+def format_dwell(seconds: float) -> str:
+    """Время на шаге: секунды или минуты"""
+    return f"{seconds:.0f} с" if seconds < 90 else f"{seconds / 60:.1f} мин"
+
+
+def format_funnel(funnel: list) -> str:
+    """Пошаговая воронка: вошли, доля ушедших дальше, среднее время на шаге"""
+    if not any(step['entered'] for step in funnel):
+        return "   • Нет переходов"
+
+    lines = []
+    for index, step in enumerate(funnel, 1):
+        line = f"   {index}. {FUNNEL_LABELS.get(step['state'], step['state'])}: {step['entered']}"
+        if index < len(funnel):
+            line += f" → дальше {step['advance_rate']}%"
+        if step['left']:
+            line += f", ~{format_dwell(step['avg_dwell'])}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_analytics(summary: dict, window: str) -> str:
+    """Текст отчета по трафику"""
+    microloans = load_offers().get("microloans", {})
+
+    top_text = "\n".join(
+        f"{i}. {escape_html(microloans.get(row['offer_id'], {}).get('name', row['offer_id']))}: {row['clicks']}"
+        for i, row in enumerate(summary['top_offers'], 1)
+    ) or "Нет кликов"
+
+    countries_text = "\n".join(
+        f"   • {COUNTRY_NAMES.get(row['country'], escape_html(str(row['country'])))}: "
+        f"{row['sessions']} сессий, {row['completed'] or 0} с кликом"
+        for row in summary['countries']
+    ) or "   • Нет сессий"
+
+    built_at = datetime.fromtimestamp(summary['built_at']).strftime('%H:%M:%S')
+
+    return (
+        f"📈 <b>Аналитика за {REPORT_WINDOWS[window][0]}</b>\n\n"
+        f"👥 <b>Пользователи:</b>\n"
+        f"   • Новых: {summary['new_users']}\n"
+        f"   • Активных: {summary['active_users']}\n"
+        f"   • С кликами: {summary['converting_users']} ({summary['conversion_rate']}%)\n\n"
+        f"🔎 <b>Сессии подбора:</b>\n"
+        f"   • Всего: {summary['sessions']}\n"
+        f"   • Завершены кликом: {summary['completed_sessions']} ({summary['completion_rate']}%)\n\n"
+        f"🎯 <b>Клики:</b> {summary['clicks']}\n"
+        f"📊 <b>CTR:</b> {summary['ctr']}%\n\n"
+        f"🏆 <b>ТОП офферов по кликам:</b>\n{top_text}\n\n"
+        f"🌍 <b>Страны:</b>\n{countries_text}\n\n"
+        f"🪜 <b>Воронка подбора:</b>\n{format_funnel(summary['funnel'])}\n\n"
+        f"<i>Данные на {built_at}</i>"
+    )
+
+
+async def show_analytics(callback: CallbackQuery):
+    """Показать аналитику трафика за выбранное окно"""
+    if not is_admin(callback.from_user.id):
+        return
+
+    window = callback.data.rsplit("_", 1)[-1]
+    if window not in REPORT_WINDOWS:
+        window = DEFAULT_WINDOW
+
+    if callback.data.startswith("analytics_refresh_"):
+        _reports.invalidate()
+
+    try:
+        # Запросы выполняются в отдельном потоке по соединению только для чтения
+        summary = await _reports.get_summary(window)
+        text = format_analytics(summary, window)
+    except Exception as e:
+        logger.error(f"Ошибка в show_analytics: {e}")
+        await callback.answer("❌ Нет доступа к базе аналитики")
+        return
+
+    await safe_edit_message(callback.message, text, reply_markup=analytics_keyboard(window))
+    await callback.answer()
+
+
+def register_analytics_handlers(dp):
+    """Регистрирует обработчики аналитики"""
+    dp.callback_query.register(show_analytics, F.data.startswith("analytics_"))
@@ -0,0 +1,195 @@
+"""
+Обработчики массового импорта и экспорта офферов
+"""
+import io
+import os
+import logging
+import tempfile
+from datetime import datetime
+from aiogram import F
+from aiogram.types import Message, FSInputFile
+from aiogram.filters import Command, CommandObject
+from aiogram.fsm.context import FSMContext
+
+from admin_bot.config.auth import is_admin
+from admin_bot.config.constants import DATA_DIR
+from admin_bot.states.bulk_states import BulkImportStates
+from admin_bot.keyboards.main_keyboards import main_keyboard
+from admin_bot.utils.offer_manager import load_offers, upsert_offers, generate_offer_id, update_offers_metrics
+from admin_bot.utils.formatters import escape_html
+from admin_bot.utils.bulk_io import COLUMNS, parse_document, validate_rows, format_import_report, write_export
+from admin_bot.utils.metrics_feed import parse_metrics_feed, match_metrics, format_metrics_report
+
+logger = logging.getLogger(__name__)
+
+MAX_IMPORT_SIZE = 5 * 1024 * 1024
+
+
+async def cmd_import_offers(message: Message, state: FSMContext):
+    """Команда /import_offers - ожидание файла с офферами"""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Нет доступа")
+        return
+
+    await state.set_state(BulkImportStates.waiting_file)
+    await message.answer(
+        "📥 <b>Импорт офферов</b>\n\n"
+        "Отправьте CSV или JSON файл.\n\n"
+        f"<b>Колонки CSV:</b>\n<code>{', '.join(COLUMNS)}</code>\n\n"
+        "• <code>id</code> существующего оффера - обновление, пустые ячейки не меняют его поля\n"
+        "• <code>id</code> пустой или не из каталога - новый оффер с новым ID\n"
+        "• <code>amounts</code>, <code>age</code>, <code>loan_terms</code> - диапазоны вида 1000-30000\n"
+        "• <code>metrics</code> - «CR AR EPC EPL»\n"
+        "• JSON - список таких строк или файл из /export_offers json\n\n"
+        "Отправьте 'отмена' для прекращения",
+        parse_mode="HTML"
+    )
+
+
+async def cancel_import(message: Message, state: FSMContext):
+    """Отмена импорта"""
+    await state.clear()
+    await message.answer("❌ Импорт отменен", reply_markup=main_keyboard())
+
+
+async def handle_import_file(message: Message, state: FSMContext):
+    """Пакетная валидация файла и запись принятых офферов одной транзакцией"""
+    if not is_admin(message.from_user.id):
+        return
+
+    document = message.document
+    if document.file_size and document.file_size > MAX_IMPORT_SIZE:
+        await message.answer("❌ Файл слишком большой (максимум 5 МБ)")
+        return
+
+    try:
+        buffer = io.BytesIO()
+        await message.bot.download(document, destination=buffer)
+        rows = parse_document(document.file_name, buffer.getvalue())
+    except (ValueError, UnicodeDecodeError) as e:
+        await message.answer(f"❌ <b>Не удалось прочитать файл:</b> {escape_html(str(e))}", parse_mode="HTML")
+        return
+    except Exception as e:
+        logger.error(f"Ошибка загрузки файла импорта: {e}")
+        await message.answer("❌ Ошибка загрузки файла")
+        return
+
+    if not rows:
+        await message.answer("❌ В файле нет строк с офферами")
+        return
+
+    accepted, errors, created = validate_rows(rows, load_offers().get("microloans", {}), generate_offer_id)
+
+    if accepted and not upsert_offers(accepted):
+        await message.answer("❌ <b>Ошибка сохранения</b>\n\nКаталог не изменен", parse_mode="HTML")
+        return
+
+    await state.clear()
+    logger.info(f"Импорт офферов: принято {len(accepted)}, новых {created}, ошибок {len(errors)}")
+    await message.answer(
+        format_import_report(len(accepted), created, errors),
+        reply_markup=main_keyboard(),
+        parse_mode="HTML"
+    )
+
+
+async def cmd_import_metrics(message: Message, state: FSMContext):
+    """Команда /import_metrics - ожидание выгрузки статистики CPA-сети"""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Нет доступа")
+        return
+
+    await state.set_state(BulkImportStates.waiting_metrics)
+    await message.answer(
+        "📊 <b>Обновление метрик</b>\n\n"
+        "Отправьте выгрузку статистики CPA-сети файлом или текстом.\n\n"
+        "<b>CSV:</b> колонка <code>id</code> или <code>name</code> и колонки <code>cr, ar, epc, epl</code>\n"
+        "<b>Текст:</b> по строке на оффер:\n"
+        "<code>Займ Экспресс CR: 55.4% AR: 4.5% EPC: 110.89 EPL: 200.76</code>\n"
+        "<code>offer_002 55.4 4.5 110.89 200.76</code>\n\n"
+        "Отправьте 'отмена' для прекращения",
+        parse_mode="HTML"
+    )
+
+
+async def handle_metrics_feed(message: Message, state: FSMContext):
+    """Обновление метрик всех найденных офферов одной транзакцией"""
+    if not is_admin(message.from_user.id):
+        return
+
+    filename = None
+    try:
+        if message.document:
+            if message.document.file_size and message.document.file_size > MAX_IMPORT_SIZE:
+                await message.answer("❌ Файл слишком большой (максимум 5 МБ)")
+                return
+            buffer = io.BytesIO()
+            await message.bot.download(message.document, destination=buffer)
+            filename, content = message.document.file_name, buffer.getvalue().decode('utf-8-sig')
+        else:
+            content = message.text
+        rows = parse_metrics_feed(filename, content)
+    except (ValueError, UnicodeDecodeError) as e:
+        await message.answer(f"❌ <b>Не удалось прочитать выгрузку:</b> {escape_html(str(e))}", parse_mode="HTML")
+        return
+    except Exception as e:
+        logger.error(f"Ошибка загрузки выгрузки метрик: {e}")
+        await message.answer("❌ Ошибка загрузки файла")
+        return
+
+    microloans = load_offers().get("microloans", {})
+    updates, problems = match_metrics(rows, microloans)
+
+    if updates and not update_offers_metrics(updates):
+        await message.answer("❌ <b>Ошибка сохранения</b>\n\nМетрики не изменены", parse_mode="HTML")
+        return
+
+    await state.clear()
+    logger.info(f"Обновление метрик: офферов {len(updates)}, проблемных строк {len(problems)}")
+    await message.answer(
+        format_metrics_report(updates, microloans, problems),
+        reply_markup=main_keyboard(),
+        parse_mode="HTML"
+    )
+
+
+async def cmd_export_offers(message: Message, command: CommandObject):
+    """Команда /export_offers [csv|json] - выгрузка каталога файлом"""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Нет доступа")
+        return
+
+    fmt = (command.args or "csv").strip().lower()
+    if fmt not in ("csv", "json"):
+        await message.answer("❌ Формат: /export_offers csv или /export_offers json")
+        return
+
+    microloans = load_offers().get("microloans", {})
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # Пишем во временный файл, aiogram отправляет его с диска по частям
+    fd, export_path = tempfile.mkstemp(dir=DATA_DIR, prefix="export_", suffix=f".{fmt}")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            write_export(microloans, f, fmt)
+
+        await message.answer_document(
+            FSInputFile(export_path, filename=f"offers_{timestamp}.{fmt}"),
+            caption=f"📤 Экспорт каталога: {len(microloans)} офферов"
+        )
+    except Exception as e:
+        logger.error(f"Ошибка экспорта офферов: {e}")
+        await message.answer("❌ Ошибка экспорта")
+    finally:
+        os.remove(export_path)
+
+
+def register_bulk_handlers(dp):
+    """Регистрирует обработчики импорта и экспорта"""
+    dp.message.register(cmd_import_offers, Command("import_offers"))
+    dp.message.register(cmd_import_metrics, Command("import_metrics"))
+    dp.message.register(cmd_export_offers, Command("export_offers"))
+    dp.message.register(cancel_import, BulkImportStates.waiting_file, F.text.lower() == "отмена")
+    dp.message.register(cancel_import, BulkImportStates.waiting_metrics, F.text.lower() == "отмена")
+    dp.message.register(handle_import_file, BulkImportStates.waiting_file, F.document)
+    dp.message.register(handle_metrics_feed, BulkImportStates.waiting_metrics, F.document | F.text)
@@ -1,15 +1,13 @@
 """
 Обработчики для удаления офферов
 """
-import os
 import logging
 from aiogram import F
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from admin_bot.config.auth import is_admin
-from admin_bot.config.constants import IMAGES_DIR
 from admin_bot.keyboards.main_keyboards import main_keyboard
-from admin_bot.utils.offer_manager import load_offers, save_offers
+from admin_bot.utils.offer_manager import load_offers, delete_offer as remove_offer
 from admin_bot.utils.message_utils import safe_edit_message
 
 logger = logging.getLogger(__name__)
@@ -33,7 +31,8 @@ async def delete_offer(callback: CallbackQuery):
     await safe_edit_message(
         callback.message,
         "❗ <b>Подтверждение удаления</b>\n\nВы уверены, что хотите удалить оффер?\n\n"
-        "⚠️ Это действие необратимо!\n• Будет удален файл логотипа\n• Все данные оффера будут потеряны",
+        "⚠️ Это действие необратимо!\n• Все данные оффера будут потеряны\n"
+        "• Логотип, которым не пользуются другие офферы, будет удален при очистке",
         reply_markup=confirm_keyboard
     )
 
@@ -53,26 +52,15 @@ async def confirm_delete_offer(callback: CallbackQuery):
     try:
         offer = offers["microloans"][offer_id]
 
-        # Удаляем файл логотипа если существует
-        if offer.get('logo'):
-            logo_path = os.path.join(IMAGES_DIR, offer['logo'])
-            if os.path.exists(logo_path):
-                try:
-                    os.remove(logo_path)
-                    logger.info(f"Удален логотип: {logo_path}")
-                except Exception as e:
-                    logger.error(f"Ошибка удаления логотипа {logo_path}: {e}")
-
-        # Удаляем оффер из базы
+        # Удаляем оффер из базы; файл логотипа может быть общим - его удалит сборка мусора логотипов
         offer_name = offer.get('name', offer_id)
-        del offers["microloans"][offer_id]
 
         # Сохраняем изменения
-        if save_offers(offers):
+        if remove_offer(offer_id):
             await callback.answer("🗑️ Оффер удален")
             await safe_edit_message(
                 callback.message,
-                f"🗑️ <b>Оффер удален</b>\n\n📝 <b>Название:</b> {offer_name}\n🏷️ <b>ID:</b> {offer_id}\n\n✅ Логотип также удален с диска",
+                f"🗑️ <b>Оффер удален</b>\n\n📝 <b>Название:</b> {offer_name}\n🏷️ <b>ID:</b> {offer_id}",
                 reply_markup=main_keyboard()
             )
             logger.info(f"Оффер {offer_id} ({offer_name}) успешно удален")
@@ -11,7 +11,7 @@ from admin_bot.config.auth import is_admin
 from admin_bot.states.edit_states import EditStates, PaymentMethodsStates
 from admin_bot.keyboards.offer_keyboards import back_to_offer_keyboard
 from admin_bot.keyboards.payment_keyboards import get_payment_methods_keyboard
-from admin_bot.utils.offer_manager import load_offers, save_offers, update_offer_timestamp
+from admin_bot.utils.offer_manager import get_offer, upsert_offer, update_offer_timestamp
 from admin_bot.utils.formatters import format_payment_methods, escape_html
 from admin_bot.utils.message_utils import safe_edit_message
 from admin_bot.handlers.list_handlers import view_offer
@@ -43,8 +43,7 @@ async def edit_field(callback: CallbackQuery, state: FSMContext):
                 return
             offer_id, field = parts
 
-        offers = load_offers()
-        offer = offers.get("microloans", {}).get(offer_id)
+        offer = get_offer(offer_id)
         if not offer:
             await callback.answer("❌ Оффер не найден")
             return
@@ -54,8 +53,7 @@ async def edit_field(callback: CallbackQuery, state: FSMContext):
             current_zero = offer.get('zero_percent', False)
             offer['zero_percent'] = not current_zero
             offer = update_offer_timestamp(offer)
-            offers["microloans"][offer_id] = offer
-            save_offers(offers)
+            upsert_offer(offer_id, offer)
 
             await callback.answer(f"0% {'включен' if not current_zero else 'отключен'}")
             await view_offer(callback)
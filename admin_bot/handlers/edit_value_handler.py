@@ -1,16 +1,15 @@
 """
 Обработчики для редактирования значений полей офферов
 """
-import os
 import logging
 from datetime import datetime
+from aiogram import F
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 
-from admin_bot.config.constants import IMAGES_DIR
 from admin_bot.states.edit_states import EditStates
 from admin_bot.keyboards.offer_keyboards import edit_keyboard
-from admin_bot.utils.offer_manager import load_offers, save_offers, update_offer_timestamp
+from admin_bot.utils.offer_manager import get_offer, upsert_offer, update_offer_timestamp
 from admin_bot.utils.validators import parse_metrics, validate_age_range, validate_amount_range, validate_loan_terms, \
     validate_priority
 from admin_bot.utils.formatters import escape_html
@@ -32,8 +31,7 @@ async def process_edit_value(message: Message, state: FSMContext):
         return
 
     # Загрузка оффера
-    offers = load_offers()
-    offer = offers.get("microloans", {}).get(offer_id)
+    offer = get_offer(offer_id)
     if not offer:
         await message.answer("❌ Оффер не найден")
         await state.clear()
@@ -45,8 +43,7 @@ async def process_edit_value(message: Message, state: FSMContext):
         if success:
             # Обновляем timestamp и сохраняем
             offer = update_offer_timestamp(offer)
-            offers["microloans"][offer_id] = offer
-            save_offers(offers)
+            upsert_offer(offer_id, offer)
 
             # Возвращаем к редактированию
             await message.answer("🔧 Возврат к редактированию:", reply_markup=edit_keyboard(offer_id))
@@ -96,11 +93,7 @@ async def process_field_update(offer: dict, field: str, new_value: str, message:
 async def process_logo_field(offer: dict, new_value: str, message: Message) -> bool:
     """Обработка поля логотипа"""
     if new_value == "-":
-        # Удаление текущего логотипа
-        if offer.get('logo'):
-            logo_path = os.path.join(IMAGES_DIR, offer['logo'])
-            if os.path.exists(logo_path):
-                os.remove(logo_path)
+        # Удаление текущего логотипа; файл без ссылок удалит сборка мусора логотипов
         offer['logo'] = None
         await message.answer("🗑️ <b>Логотип удален</b>", parse_mode="HTML")
         return True
@@ -214,4 +207,5 @@ async def process_metrics_field(offer: dict, new_value: str, message: Message) -
 
 def register_edit_value_handlers(dp):
     """Регистрирует обработчики редактирования значений"""
-    dp.message.register(process_edit_value, EditStates.waiting_value)
\ No newline at end of file
+    # Фото в этом состоянии обрабатывает загрузчик логотипов (handle_photo_upload)
+    dp.message.register(process_edit_value, EditStates.waiting_value, ~F.photo)
\ No newline at end of file
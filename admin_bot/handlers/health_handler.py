@@ -0,0 +1,123 @@
+"""
+Экран состояния основного бота: память, CPU, дескрипторы, задачи и размеры файлов данных
+"""
+import logging
+from datetime import datetime
+from aiogram import F
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
+
+from admin_bot.config.auth import is_admin
+from admin_bot.config.constants import CONTROL_DB_FILE
+from admin_bot.utils.formatters import escape_html
+from admin_bot.utils.message_utils import safe_edit_message
+from shared.control_channel import ControlChannel
+
+logger = logging.getLogger(__name__)
+
+# Замеры ресурсов хранит основной бот; запрашиваем их через общий канал команд
+control_channel = ControlChannel(CONTROL_DB_FILE)
+SPARK_BARS = "▁▂▃▄▅▆▇█"
+SPARK_WIDTH = 24
+
+STORAGE_LABELS = {
+    "analytics.db": "🗄 analytics.db",
+    "analytics.db-wal": "📝 analytics.db-wal",
+    "logos": "🖼 Логотипы"
+}
+
+
+def health_keyboard() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🔄 Обновить", callback_data="health")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="main_menu")]
+    ])
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("Б", "КБ", "МБ"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "Б" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} ГБ"
+
+
+def sparkline(values: list) -> str:
+    """Мини-график по последним значениям"""
+    values = values[-SPARK_WIDTH:]
+    low, high = min(values), max(values)
+    if high == low:
+        return SPARK_BARS[0] * len(values)
+    scale = (len(SPARK_BARS) - 1) / (high - low)
+    return "".join(SPARK_BARS[round((value - low) * scale)] for value in values)
+
+
+def format_growth(first: dict, current: dict) -> str:
+    """Прирост RSS за окно буфера и в пересчете на час"""
+    hours = (current['ts'] - first['ts']) / 3600
+    delta = current['rss'] - first['rss']
+    sign = "+" if delta >= 0 else "-"
+    text = f"{sign}{format_bytes(abs(delta))} за {hours * 60:.0f} мин"
+    if hours >= 0.25:
+        text += f" ({sign}{format_bytes(abs(delta) / hours)}/ч)"
+    return text
+
+
+def format_health(result: dict) -> str:
+    """Текст экрана состояния по ответу основного бота"""
+    current = result['current']
+    samples = result['samples'] + [current]
+
+    text = (
+        f"🩺 <b>Состояние основного бота</b>\n"
+        f"🕒 {datetime.fromtimestamp(current['ts']).strftime('%d.%m %H:%M:%S')}\n\n"
+        f"💾 <b>Процесс:</b>\n"
+        f"   • Память (RSS): {format_bytes(current['rss'])}\n"
+        f"   • CPU за {result['interval']:.0f} с: {current['cpu_percent']:.1f}%\n"
+        f"   • Потоки: {current['threads']}\n"
+        f"   • Файловые дескрипторы: {current['fds']}\n"
+        f"   • Задачи asyncio: {current['tasks']}\n\n"
+        f"📁 <b>Файлы данных:</b>\n"
+    )
+    for name, size in current['storage'].items():
+        text += f"   • {STORAGE_LABELS.get(name, name)}: {format_bytes(size)}\n"
+
+    if len(samples) > 1:
+        text += (
+            f"\n📈 <b>Память за {len(samples)} замеров (каждые {result['interval']:.0f} с):</b>\n"
+            f"<code>{sparkline([sample['rss'] for sample in samples])}</code>\n"
+            f"   • Прирост: {format_growth(samples[0], current)}\n"
+            f"   • Задачи: {min(s['tasks'] for s in samples)}–{max(s['tasks'] for s in samples)}, "
+            f"дескрипторы: {min(s['fds'] for s in samples)}–{max(s['fds'] for s in samples)}"
+        )
+    else:
+        text += "\nℹ️ История замеров пока пуста - бот только что запущен"
+    return text
+
+
+async def show_health(callback: CallbackQuery):
+    """Показать состояние основного бота (запрос через канал служебных команд)"""
+    if not is_admin(callback.from_user.id):
+        return
+
+    await callback.answer("⏳ Запрашиваю данные у основного бота...")
+    try:
+        request_id = control_channel.submit("main_bot", "resources")
+        request = await control_channel.wait_result(request_id, timeout=10, interval=0.5)
+
+        if request is None:
+            text = "⚠️ <b>Основной бот не ответил</b>\n\nПроверьте, что он запущен"
+        elif request['status'] == 'failed':
+            text = f"❌ <b>Ошибка получения данных:</b> {escape_html(request['error'])}"
+        else:
+            text = format_health(request['result'])
+
+        await safe_edit_message(callback.message, text, reply_markup=health_keyboard())
+
+    except Exception as e:
+        logger.error(f"Ошибка в show_health: {e}")
+        await callback.message.answer("❌ Ошибка загрузки состояния бота")
+
+
+def register_health_handlers(dp):
+    """Регистрирует обработчики экрана состояния"""
+    dp.callback_query.register(show_health, F.data == "health")
@@ -5,41 +5,148 @@ import os
 import logging
 from datetime import datetime
 from aiogram import F
-from aiogram.types import CallbackQuery, FSInputFile
+from aiogram.types import CallbackQuery, FSInputFile, Message, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 
 from admin_bot.config.auth import is_admin
 from admin_bot.config.constants import IMAGES_DIR
-from admin_bot.states.edit_states import EditStates, PaymentMethodsStates
-from admin_bot.keyboards.main_keyboards import offers_keyboard
+from admin_bot.states.edit_states import EditStates, PaymentMethodsStates, OfferListStates
+from admin_bot.keyboards.main_keyboards import main_keyboard, offers_page_keyboard
 from admin_bot.keyboards.offer_keyboards import edit_keyboard, back_to_offer_keyboard
 from admin_bot.keyboards.payment_keyboards import get_payment_methods_keyboard
 from admin_bot.utils.offer_manager import load_offers, save_offers, update_offer_timestamp
+from admin_bot.utils.offer_index import get_offer_index, DEFAULT_FILTERS, STATUS_FILTERS, COUNTRY_FILTERS, \
+    ZERO_FILTERS
 from admin_bot.utils.formatters import format_offer_info, format_payment_methods, escape_html
 from admin_bot.utils.message_utils import safe_edit_message, safe_send_photo
 
 logger = logging.getLogger(__name__)
 
 
-async def list_offers(callback: CallbackQuery):
-    """Показать список всех офферов"""
+async def get_list_filters(state: FSMContext) -> dict:
+    """Фильтры списка офферов из FSM (сбрасываются вместе с состоянием)"""
+    data = await state.get_data()
+    return {**DEFAULT_FILTERS, **data.get('offer_list', {})}
+
+
+def render_offer_list(filters: dict, after: str = None, before: str = None):
+    """Текст и клавиатура одной страницы списка - собирается только видимая страница"""
+    entries, prev_cursor, next_cursor, total = get_offer_index().page(filters, after=after, before=before)
+
+    text = f"📋 <b>Офферы ({total})</b>"
+    if filters['query']:
+        text += f"\n🔍 Поиск: <code>{escape_html(filters['query'])}</code>"
+    if not entries:
+        text += "\n\nНичего не найдено"
+
+    return text, offers_page_keyboard(entries, filters, prev_cursor, next_cursor)
+
+
+async def list_offers(callback: CallbackQuery, state: FSMContext):
+    """Показать первую страницу списка офферов"""
     if not is_admin(callback.from_user.id):
         return
 
     try:
-        offers = load_offers()
-        if not offers.get("microloans"):
+        if not load_offers().get("microloans"):
             await safe_edit_message(callback.message, "📋 Список пуст", reply_markup=main_keyboard())
             return
 
-        text = f"📋 <b>Офферы ({len(offers['microloans'])})</b>"
-        await safe_edit_message(callback.message, text, reply_markup=offers_keyboard(offers))
+        text, keyboard = render_offer_list(await get_list_filters(state))
+        await safe_edit_message(callback.message, text, reply_markup=keyboard)
 
     except Exception as e:
         logger.error(f"Ошибка в list_offers: {e}")
         await callback.answer("❌ Ошибка загрузки офферов")
 
 
+async def offers_page(callback: CallbackQuery, state: FSMContext):
+    """Переход на соседнюю страницу по курсору (ID крайнего оффера страницы)"""
+    if not is_admin(callback.from_user.id):
+        return
+
+    try:
+        filters = await get_list_filters(state)
+        if callback.data.startswith("offers_next_"):
+            text, keyboard = render_offer_list(filters, after=callback.data.replace("offers_next_", "", 1))
+        else:
+            text, keyboard = render_offer_list(filters, before=callback.data.replace("offers_prev_", "", 1))
+
+        await safe_edit_message(callback.message, text, reply_markup=keyboard)
+        await callback.answer()
+
+    except Exception as e:
+        logger.error(f"Ошибка в offers_page: {e}")
+        await callback.answer("❌ Ошибка загрузки офферов")
+
+
+async def offers_filter(callback: CallbackQuery, state: FSMContext):
+    """Переключение фильтра по кругу и возврат на первую страницу"""
+    if not is_admin(callback.from_user.id):
+        return
+
+    name = callback.data.replace("offers_filter_", "")
+    values = {"status": STATUS_FILTERS, "country": COUNTRY_FILTERS, "zero": ZERO_FILTERS}.get(name)
+    if not values:
+        await callback.answer("❌ Неизвестный фильтр")
+        return
+
+    filters = await get_list_filters(state)
+    current = filters[name] if filters[name] in values else values[0]
+    filters[name] = values[(values.index(current) + 1) % len(values)]
+    await state.update_data(offer_list=filters)
+
+    text, keyboard = render_offer_list(filters)
+    await safe_edit_message(callback.message, text, reply_markup=keyboard)
+    await callback.answer()
+
+
+async def offers_search_start(callback: CallbackQuery, state: FSMContext):
+    """Запрос строки поиска по названию или ID"""
+    if not is_admin(callback.from_user.id):
+        return
+
+    await state.set_state(OfferListStates.search)
+    await safe_edit_message(
+        callback.message,
+        "🔍 <b>Поиск оффера</b>\n\nВведите начало или часть названия (или ID):",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 К списку", callback_data="list_offers")]
+        ])
+    )
+    await callback.answer()
+
+
+async def offers_search_query(message: Message, state: FSMContext):
+    """Применение поискового запроса к списку"""
+    if not is_admin(message.from_user.id):
+        return
+
+    filters = await get_list_filters(state)
+    filters['query'] = (message.text or "").strip()[:64]
+
+    # Выходим из режима ввода, сохраняя фильтры списка
+    await state.set_state(None)
+    await state.update_data(offer_list=filters)
+
+    text, keyboard = render_offer_list(filters)
+    await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+
+
+async def offers_search_reset(callback: CallbackQuery, state: FSMContext):
+    """Сброс поискового запроса"""
+    if not is_admin(callback.from_user.id):
+        return
+
+    filters = await get_list_filters(state)
+    filters['query'] = ""
+    await state.update_data(offer_list=filters)
+
+    text, keyboard = render_offer_list(filters)
+    await safe_edit_message(callback.message, text, reply_markup=keyboard)
+    await callback.answer()
+
+
 async def view_offer(callback: CallbackQuery):
     """Просмотр детальной информации об оффере"""
     if not is_admin(callback.from_user.id):
@@ -125,6 +232,11 @@ async def payment_method_back(callback: CallbackQuery, state: FSMContext):
 def register_list_handlers(dp):
     """Регистрирует обработчики списка офферов"""
     dp.callback_query.register(list_offers, F.data == "list_offers")
+    dp.callback_query.register(offers_page, F.data.startswith("offers_next_") | F.data.startswith("offers_prev_"))
+    dp.callback_query.register(offers_filter, F.data.startswith("offers_filter_"))
+    dp.callback_query.register(offers_search_start, F.data == "offers_search")
+    dp.callback_query.register(offers_search_reset, F.data == "offers_search_reset")
+    dp.message.register(offers_search_query, OfferListStates.search, F.text)
     dp.callback_query.register(view_offer, F.data.startswith("edit_"))
     dp.callback_query.register(back_to_offer, F.data.startswith("back_to_offer_"))
     dp.callback_query.register(payment_method_back, F.data == "payment_back", PaymentMethodsStates.selecting)
\ No newline at end of file
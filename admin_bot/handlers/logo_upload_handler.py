@@ -1,7 +1,8 @@
 """
 Обработчики для загрузки и управления логотипами
 """
-import os
+import io
+import asyncio
 import logging
 from datetime import datetime
 from typing import Dict
@@ -10,14 +11,14 @@ from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 
 from admin_bot.config.auth import is_admin
-from admin_bot.config.constants import IMAGES_DIR
 from admin_bot.states.edit_states import EditStates
 from admin_bot.states.add_offer_states import AddOfferStates
 from admin_bot.keyboards.offer_keyboards import edit_keyboard
 from admin_bot.keyboards.main_keyboards import main_keyboard
-from admin_bot.utils.offer_manager import load_offers, save_offers, generate_offer_id, update_offer_timestamp
+from admin_bot.utils.offer_manager import get_offer, upsert_offer, generate_offer_id, update_offer_timestamp
 from admin_bot.utils.formatters import escape_html, format_payment_methods
 from admin_bot.utils.message_utils import safe_edit_message
+from admin_bot.utils.logo_store import store_logo
 
 logger = logging.getLogger(__name__)
 
@@ -57,27 +58,19 @@ async def handle_edit_logo_upload(message: Message, state: FSMContext, bot):
         return
 
     try:
-        offers = load_offers()
-        offer = offers.get("microloans", {}).get(offer_id)
+        offer = get_offer(offer_id)
         if not offer:
             await message.answer("❌ Оффер не найден")
             await state.clear()
             return
 
-        # Удаляем старый логотип если есть
-        if offer.get('logo'):
-            old_logo_path = os.path.join(IMAGES_DIR, offer['logo'])
-            if os.path.exists(old_logo_path):
-                os.remove(old_logo_path)
-
-        # Сохраняем новый логотип
-        logo_filename = await save_logo_file(message, bot, offer_id)
+        # Старый файл не удаляем: он может быть общим с другим оффером, его уберет сборка мусора
+        logo_filename = await save_logo_file(message, bot)
 
         # Обновляем оффер
         offer['logo'] = logo_filename
         offer = update_offer_timestamp(offer)
-        offers["microloans"][offer_id] = offer
-        save_offers(offers)
+        upsert_offer(offer_id, offer)
 
         await message.answer(
             f"✅ <b>Логотип обновлен!</b>\n\n📁 <b>Файл:</b> {escape_html(logo_filename)}",
@@ -99,7 +92,7 @@ async def handle_add_offer_logo(message: Message, state: FSMContext, bot):
         offer_id = generate_offer_id()
 
         # Сохраняем логотип
-        logo_filename = await save_logo_file(message, bot, offer_id)
+        logo_filename = await save_logo_file(message, bot)
 
         # Создаем оффер с загруженным логотипом
         await create_offer_with_data(data, offer_id, logo_filename, message, state)
@@ -110,25 +103,14 @@ async def handle_add_offer_logo(message: Message, state: FSMContext, bot):
         await state.clear()
 
 
-async def save_logo_file(message: Message, bot, offer_id: str) -> str:
-    """Сохраняет файл логотипа и возвращает имя файла"""
+async def save_logo_file(message: Message, bot) -> str:
+    """Сохраняет нормализованный логотип в хранилище и возвращает имя файла"""
     photo = message.photo[-1]  # Берем фото наивысшего качества
-    file_info = await bot.get_file(photo.file_id)
-
-    # Определяем расширение файла
-    file_extension = 'jpg'  # По умолчанию
-    if file_info.file_path and '.' in file_info.file_path:
-        file_extension = file_info.file_path.split('.')[-1]
-
-    # Создаем уникальное имя файла
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    logo_filename = f"{offer_id}_{timestamp}.{file_extension}"
-    logo_path = os.path.join(IMAGES_DIR, logo_filename)
-
-    # Скачиваем и сохраняем файл
-    await bot.download_file(file_info.file_path, logo_path)
+    buffer = io.BytesIO()
+    await bot.download(photo, destination=buffer)
 
-    return logo_filename
+    # Pillow работает синхронно - не блокируем цикл событий
+    return await asyncio.to_thread(store_logo, buffer.getvalue())
 
 
 async def create_offer_with_data(data: Dict, offer_id: str, logo_filename: str, message: Message, state: FSMContext):
@@ -170,9 +152,7 @@ async def create_offer_with_data(data: Dict, offer_id: str, logo_filename: str,
     }
 
     # Сохраняем оффер
-    offers = load_offers()
-    offers["microloans"][offer_id] = offer
-    save_offers(offers)
+    upsert_offer(offer_id, offer)
 
     # Подготавливаем информацию для уведомления
     metrics = data["metrics"]
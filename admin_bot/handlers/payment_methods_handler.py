@@ -12,7 +12,7 @@ from admin_bot.config.constants import PAYMENT_METHODS
 from admin_bot.states.edit_states import PaymentMethodsStates
 from admin_bot.keyboards.offer_keyboards import edit_keyboard
 from admin_bot.keyboards.payment_keyboards import get_payment_methods_keyboard
-from admin_bot.utils.offer_manager import load_offers, save_offers, update_offer_timestamp
+from admin_bot.utils.offer_manager import get_offer, upsert_offer, update_offer_timestamp
 from admin_bot.utils.formatters import format_offer_info, format_payment_methods
 from admin_bot.utils.message_utils import safe_edit_message
 
@@ -37,14 +37,12 @@ async def handle_payment_method_selection(callback: CallbackQuery, state: FSMCon
     elif action == "done":
         # Сохранение выбранных способов
         offer_id = data.get('offer_id')
-        offers = load_offers()
-        offer = offers.get("microloans", {}).get(offer_id)
+        offer = get_offer(offer_id)
 
         if offer:
             offer['payment_methods'] = current_methods
             offer = update_offer_timestamp(offer)
-            offers["microloans"][offer_id] = offer
-            save_offers(offers)
+            upsert_offer(offer_id, offer)
 
             await callback.answer("✅ Способы получения обновлены!")
             await state.clear()
@@ -14,8 +14,12 @@ from admin_bot.handlers.edit_value_handler import register_edit_value_handlers
 from admin_bot.handlers.toggle_handler import register_toggle_handlers
 from admin_bot.handlers.delete_handler import register_delete_handlers
 from admin_bot.handlers.stats_handler import register_stats_handlers
+from admin_bot.handlers.analytics_handler import register_analytics_handlers
+from admin_bot.handlers.health_handler import register_health_handlers
 from admin_bot.handlers.add_offer_handler import register_add_offer_handlers
 from admin_bot.handlers.add_payment_methods_handler import register_add_payment_methods_handlers
+from admin_bot.handlers.bulk_handler import register_bulk_handlers
+from admin_bot.handlers.utility_commands import register_diagnostics_handlers
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +61,10 @@ async def register_all_handlers(dp, bot: Bot):
         # 8. Обработчики статистики
         register_stats_handlers(dp)
         logger.info("✅ Зарегистрированы обработчики статистики")
+        register_analytics_handlers(dp)
+        logger.info("✅ Зарегистрированы обработчики аналитики трафика")
+        register_health_handlers(dp)
+        logger.info("✅ Зарегистрированы обработчики экрана состояния")
 
         # 9. Обработчики добавления новых офферов
         register_add_offer_handlers(dp)
@@ -66,10 +74,18 @@ async def register_all_handlers(dp, bot: Bot):
         register_add_payment_methods_handlers(dp)
         logger.info("✅ Зарегистрированы обработчики способов оплаты для новых офферов")
 
-        # 11. Обработчик загрузки логотипов (требует bot instance)
+        # 11. Обработчики массового импорта и экспорта
+        register_bulk_handlers(dp)
+        logger.info("✅ Зарегистрированы обработчики импорта и экспорта")
+
+        # 12. Обработчик загрузки логотипов (требует bot instance)
         await register_logo_handlers_with_bot(dp, bot)
         logger.info("✅ Зарегистрированы обработчики загрузки логотипов")
 
+        # 13. Диагностика основного бота (/profile, /memory)
+        register_diagnostics_handlers(dp)
+        logger.info("✅ Зарегистрированы команды диагностики")
+
         logger.info("🚀 Все обработчики админского бота успешно зарегистрированы!")
 
     except Exception as e:
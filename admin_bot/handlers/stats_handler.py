@@ -7,108 +7,64 @@ from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardBut
 
 from admin_bot.config.auth import is_admin
 from admin_bot.config.constants import PAYMENT_METHODS
-from admin_bot.utils.offer_manager import load_offers
+from admin_bot.utils.catalog_stats import CatalogStats, get_stats_text
 from admin_bot.utils.formatters import escape_html
 from admin_bot.utils.message_utils import safe_edit_message
 
 logger = logging.getLogger(__name__)
 
 
+def format_stats(stats: CatalogStats) -> str:
+    """Текст экрана статистики по агрегату каталога"""
+    if stats.top_cr:
+        top_text = "\n".join(
+            f"{i}. {escape_html(name)}: {cr}%"
+            for i, (name, cr) in enumerate(stats.top_cr, 1)
+        )
+    else:
+        top_text = "Нет данных"
+
+    # Статистика способов получения
+    if stats.payment_methods:
+        payment_stats_text = "\n".join(
+            f"{PAYMENT_METHODS[method_id]['emoji']} "
+            f"{PAYMENT_METHODS[method_id]['name'].replace(PAYMENT_METHODS[method_id]['emoji'] + ' ', '')}: {count}"
+            for method_id, count in sorted(stats.payment_methods.items(), key=lambda x: x[1], reverse=True)
+        )
+    else:
+        payment_stats_text = "Нет данных"
+
+    return (
+        f"📊 <b>Статистика системы</b>\n\n"
+        f"📋 <b>Офферы:</b>\n"
+        f"   • Всего: {stats.total}\n"
+        f"   • Активных: {stats.active}\n"
+        f"   • Неактивных: {stats.inactive}\n\n"
+        f"🌍 <b>География:</b>\n"
+        f"   • 🇷🇺 Только Россия: {stats.countries['russia']}\n"
+        f"   • 🇰🇿 Только Казахстан: {stats.countries['kazakhstan']}\n"
+        f"   • 🌍 Обе страны: {stats.countries['both']}\n\n"
+        f"📈 <b>Средние метрики:</b>\n"
+        f"   • CR: {stats.average('cr'):.1f}%\n"
+        f"   • AR: {stats.average('ar'):.1f}%\n"
+        f"   • EPC: {stats.average('epc'):.1f} ₽\n"
+        f"   • EPL: {stats.average('epl'):.1f} ₽\n\n"
+        f"🏆 <b>ТОП по CR:</b>\n{top_text}\n\n"
+        f"🎯 <b>Дополнительно:</b>\n"
+        f"   • 0% предложений: {stats.zero_percent}\n"
+        f"   • С логотипами: {stats.with_logo}\n\n"
+        f"💳 <b>Способы получения:</b>\n{payment_stats_text}"
+    )
+
+
 async def show_stats(callback: CallbackQuery):
     """Показать статистику системы"""
     if not is_admin(callback.from_user.id):
         return
 
     try:
-        offers = load_offers()
-        microloans = offers.get("microloans", {})
-
-        # Базовая статистика
-        total_offers = len(microloans)
-        active_offers = sum(1 for offer in microloans.values()
-                            if offer.get('status', {}).get('is_active', True))
-        inactive_offers = total_offers - active_offers
-
-        # Средние метрики
-        if total_offers > 0:
-            avg_cr = sum(offer.get('metrics', {}).get('cr', 0) for offer in microloans.values()) / total_offers
-            avg_ar = sum(offer.get('metrics', {}).get('ar', 0) for offer in microloans.values()) / total_offers
-            avg_epc = sum(offer.get('metrics', {}).get('epc', 0) for offer in microloans.values()) / total_offers
-            avg_epl = sum(offer.get('metrics', {}).get('epl', 0) for offer in microloans.values()) / total_offers
-        else:
-            avg_cr = avg_ar = avg_epc = avg_epl = 0
-
-        # ТОП офферы по CR
-        top_offers = sorted(
-            [(offer_id, offer) for offer_id, offer in microloans.items()],
-            key=lambda x: x[1].get('metrics', {}).get('cr', 0),
-            reverse=True
-        )[:3]
-
-        if top_offers:
-            top_text = "\n".join(
-                f"{i}. {escape_html(offer['name'])}: {offer.get('metrics', {}).get('cr', 0)}%"
-                for i, (_, offer) in enumerate(top_offers, 1)
-            )
-        else:
-            top_text = "Нет данных"
-
-        # Статистика способов получения
-        payment_stats = {}
-        for offer in microloans.values():
-            for method in offer.get('payment_methods', []):
-                if method in PAYMENT_METHODS:
-                    payment_stats[method] = payment_stats.get(method, 0) + 1
-
-        if payment_stats:
-            payment_stats_text = "\n".join(
-                f"{PAYMENT_METHODS[method_id]['emoji']} "
-                f"{PAYMENT_METHODS[method_id]['name'].replace(PAYMENT_METHODS[method_id]['emoji'] + ' ', '')}: {count}"
-                for method_id, count in sorted(payment_stats.items(), key=lambda x: x[1], reverse=True)
-            )
-        else:
-            payment_stats_text = "Нет данных"
-
-        # Статистика стран
-        country_stats = {"russia": 0, "kazakhstan": 0, "both": 0}
-        for offer in microloans.values():
-            countries = offer.get('geography', {}).get('countries', [])
-            if 'russia' in countries and 'kazakhstan' in countries:
-                country_stats["both"] += 1
-            elif 'russia' in countries:
-                country_stats["russia"] += 1
-            elif 'kazakhstan' in countries:
-                country_stats["kazakhstan"] += 1
-
-        # Статистика 0% предложений
-        zero_percent_count = sum(1 for offer in microloans.values()
-                                 if offer.get('zero_percent', False))
-
-        # Статистика логотипов
-        with_logo_count = sum(1 for offer in microloans.values()
-                              if offer.get('logo'))
-
-        text = (
-            f"📊 <b>Статистика системы</b>\n\n"
-            f"📋 <b>Офферы:</b>\n"
-            f"   • Всего: {total_offers}\n"
-            f"   • Активных: {active_offers}\n"
-            f"   • Неактивных: {inactive_offers}\n\n"
-            f"🌍 <b>География:</b>\n"
-            f"   • 🇷🇺 Только Россия: {country_stats['russia']}\n"
-            f"   • 🇰🇿 Только Казахстан: {country_stats['kazakhstan']}\n"
-            f"   • 🌍 Обе страны: {country_stats['both']}\n\n"
-            f"📈 <b>Средние метрики:</b>\n"
-            f"   • CR: {avg_cr:.1f}%\n"
-            f"   • AR: {avg_ar:.1f}%\n"
-            f"   • EPC: {avg_epc:.1f} ₽\n"
-            f"   • EPL: {avg_epl:.1f} ₽\n\n"
-            f"🏆 <b>ТОП по CR:</b>\n{top_text}\n\n"
-            f"🎯 <b>Дополнительно:</b>\n"
-            f"   • 0% предложений: {zero_percent_count}\n"
-            f"   • С логотипами: {with_logo_count}\n\n"
-            f"💳 <b>Способы получения:</b>\n{payment_stats_text}"
-        )
+        # Агрегат и текст пересчитываются только при смене версии каталога
+        text = get_stats_text(format_stats)
 
         back_keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text="🔙 Назад", callback_data="main_menu")]
@@ -7,7 +7,7 @@ from aiogram import F
 from aiogram.types import CallbackQuery
 
 from admin_bot.config.auth import is_admin
-from admin_bot.utils.offer_manager import load_offers, save_offers, update_offer_timestamp
+from admin_bot.utils.offer_manager import get_offer, upsert_offer, update_offer_timestamp
 from admin_bot.handlers.list_handlers import view_offer
 
 logger = logging.getLogger(__name__)
@@ -19,8 +19,7 @@ async def toggle_offer(callback: CallbackQuery):
         return
 
     offer_id = callback.data.replace("toggle_", "")
-    offers = load_offers()
-    offer = offers.get("microloans", {}).get(offer_id)
+    offer = get_offer(offer_id)
 
     if not offer:
         await callback.answer("❌ Оффер не найден")
@@ -45,8 +44,7 @@ async def toggle_offer(callback: CallbackQuery):
                 offer['priority']['final_score'] = 10
 
         # Сохраняем изменения
-        offers["microloans"][offer_id] = offer
-        save_offers(offers)
+        upsert_offer(offer_id, offer)
 
         # Уведомляем и обновляем интерфейс
         status_text = "✅ Включен" if new_status else "❌ Отключен"
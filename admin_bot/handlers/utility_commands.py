@@ -1,20 +1,29 @@
 """
 Утилитарные команды для диагностики и миграции системы
 """
+import copy
 import logging
+import os
 from datetime import datetime
 from aiogram import F
-from aiogram.types import Message
-from aiogram.filters import Command
+from aiogram.types import FSInputFile, Message
+from aiogram.filters import Command, CommandObject
 
 from admin_bot.config.auth import is_admin
-from admin_bot.config.constants import PAYMENT_METHODS
+from admin_bot.config.constants import CONTROL_DB_FILE, PAYMENT_METHODS
 from admin_bot.keyboards.main_keyboards import main_keyboard
 from admin_bot.utils.offer_manager import load_offers, save_offers
 from admin_bot.utils.formatters import escape_html
+from shared.control_channel import ControlChannel
 
 logger = logging.getLogger(__name__)
 
+# Команды основному боту (профилирование, снимки памяти) через общий канал
+control_channel = ControlChannel(CONTROL_DB_FILE)
+MAX_PROFILE_SECONDS = 300
+MAX_MEMORY_SECONDS = 3600
+MAX_MEMORY_SNAPSHOTS = 10
+
 
 async def check_all_offers(message: Message):
     """Команда /check_offers - проверка состояния всех офферов"""
@@ -73,7 +82,8 @@ async def fix_inactive_offers(message: Message):
         await message.answer("❌ Нет доступа")
         return
 
-    offers = load_offers()
+    # Копия: кэш каталога меняется только через save_offers
+    offers = copy.deepcopy(load_offers())
     fixed_count = 0
 
     for offer_id, offer in offers.get("microloans", {}).items():
@@ -103,7 +113,8 @@ async def migrate_offers_structure(message: Message):
         await message.answer("❌ Нет доступа")
         return
 
-    offers = load_offers()
+    # Копия: кэш каталога меняется только через save_offers
+    offers = copy.deepcopy(load_offers())
     migrated_count = 0
 
     for offer_id, offer in offers.get("microloans", {}).items():
@@ -147,6 +158,117 @@ async def migrate_offers_structure(message: Message):
         )
 
 
+async def profile_main_bot(message: Message, command: CommandObject):
+    """Команда /profile [секунды] - сэмплирующий профайлер основного бота без перезапуска"""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Нет доступа")
+        return
+
+    try:
+        seconds = int(command.args) if command.args else 30
+    except ValueError:
+        seconds = 0
+    if not 1 <= seconds <= MAX_PROFILE_SECONDS:
+        await message.answer(f"❌ Укажите длительность от 1 до {MAX_PROFILE_SECONDS} секунд: /profile 30")
+        return
+
+    request_id = control_channel.submit("main_bot", "profile", {"seconds": seconds})
+    await message.answer(
+        f"🔥 <b>Профилирование основного бота: {seconds} с</b>\n\nСтеки обработчиков собираются, ждите отчет...",
+        parse_mode="HTML"
+    )
+
+    # Основной бот забирает команды раз в секунду; запас на запуск и запись файла
+    request = await control_channel.wait_result(request_id, timeout=seconds + 30)
+    if request is None:
+        await message.answer("⚠️ Основной бот не ответил - он запущен?")
+        return
+    if request['status'] == 'failed':
+        await message.answer(f"❌ <b>Ошибка профилирования:</b> {escape_html(request['error'])}", parse_mode="HTML")
+        return
+
+    result = request['result']
+    text = (
+        f"🔥 <b>Профиль готов</b>\n\n"
+        f"⏱ Длительность: {result['duration']} с\n"
+        f"📊 Сэмплов: {result['samples']}, занят цикл: {result['busy_percent']}%\n"
+    )
+    if result['handlers']:
+        text += "\n<b>Обработчики по сэмплам:</b>\n"
+        for handler, samples in result['handlers']:
+            text += f"• <code>{escape_html(handler)}</code>: {samples}\n"
+
+    if result['path'] and os.path.exists(result['path']):
+        text += "\nФайл collapsed-стеков: flamegraph.pl или speedscope.app"
+        await message.answer_document(FSInputFile(result['path']), caption=text, parse_mode="HTML")
+    else:
+        text += "\nЦикл событий простаивал - стеков для флеймграфа нет"
+        await message.answer(text, parse_mode="HTML")
+
+
+def format_kib(size: int) -> str:
+    return f"{size / 1024:+.1f} KiB" if abs(size) < 1024 * 1024 else f"{size / 1024 / 1024:+.2f} MiB"
+
+
+async def memory_diff_main_bot(message: Message, command: CommandObject):
+    """Команда /memory [секунды] [снимков] - прирост памяти основного бота по местам выделений"""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Нет доступа")
+        return
+
+    try:
+        parts = (command.args or "").split()
+        seconds = int(parts[0]) if parts else 300
+        snapshots = int(parts[1]) if len(parts) > 1 else 3
+    except ValueError:
+        seconds = snapshots = 0
+    if not 10 <= seconds <= MAX_MEMORY_SECONDS or not 2 <= snapshots <= MAX_MEMORY_SNAPSHOTS:
+        await message.answer(
+            f"❌ Длительность от 10 до {MAX_MEMORY_SECONDS} секунд, снимков от 2 до {MAX_MEMORY_SNAPSHOTS}: "
+            f"/memory 600 4"
+        )
+        return
+
+    request_id = control_channel.submit("main_bot", "memory", {"seconds": seconds, "snapshots": snapshots})
+    await message.answer(
+        f"🧠 <b>Снимки памяти основного бота: {snapshots} за {seconds} с</b>\n\n"
+        f"Трассировка выделений включена на время замера, ждите отчет...",
+        parse_mode="HTML"
+    )
+
+    # Запас на сравнение снимков и запись отчета
+    request = await control_channel.wait_result(request_id, timeout=seconds + 120, interval=2.0)
+    if request is None:
+        await message.answer("⚠️ Основной бот не ответил - он запущен?")
+        return
+    if request['status'] == 'failed':
+        await message.answer(f"❌ <b>Ошибка снимка памяти:</b> {escape_html(request['error'])}", parse_mode="HTML")
+        return
+
+    result = request['result']
+    growth = ", ".join(format_kib(size) for size in result['traced_growth'][1:])
+    text = (
+        f"🧠 <b>Память за {result['duration']} с</b>\n\n"
+        f"📈 Прирост отслеживаемой памяти по снимкам: {growth}\n"
+    )
+    if result['sites']:
+        text += "\n<b>Места выделений по приросту</b> (🔺 - рост между всеми снимками):\n"
+        for site in result['sites'][:10]:
+            marker = "🔺" if site['steady'] else "•"
+            text += (f"{marker} <code>{escape_html(site['site'])}</code>: "
+                     f"{format_kib(site['size_diff'])}, {site['count_diff']:+d} блоков\n")
+    else:
+        text += "\nПрироста памяти нет\n"
+
+    text += "\n<b>Объекты (до → после):</b>\n"
+    for name, (before, after) in result['objects'].items():
+        text += f"• {escape_html(name)}: {before} → {after} ({after - before:+d})\n"
+
+    await message.answer(text, parse_mode="HTML")
+    if result['path'] and os.path.exists(result['path']):
+        await message.answer_document(FSInputFile(result['path']), caption="Полный отчет со стеками")
+
+
 async def unknown_message(message: Message):
     """Обработчик неизвестных сообщений"""
     if not is_admin(message.from_user.id):
@@ -164,4 +286,10 @@ def register_utility_handlers(dp):
     dp.message.register(check_all_offers, Command("check_offers"))
     dp.message.register(fix_inactive_offers, Command("fix_inactive_offers"))
     dp.message.register(migrate_offers_structure, Command("migrate_offers"))
-    dp.message.register(unknown_message)  # Должен быть последним
\ No newline at end of file
+    dp.message.register(unknown_message)  # Должен быть последним
+
+
+def register_diagnostics_handlers(dp):
+    """Регистрирует команды диагностики основного бота (/profile, /memory)"""
+    dp.message.register(profile_main_bot, Command("profile"))
+    dp.message.register(memory_diff_main_bot, Command("memory"))
@@ -1,7 +1,7 @@
 """
 Главные клавиатуры админского бота
 """
-from typing import Dict
+from typing import Dict, List, Optional
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from ..utils.formatters import escape_html, format_currency_icon
@@ -13,35 +13,51 @@ def main_keyboard() -> InlineKeyboardMarkup:
         [InlineKeyboardButton(text="➕ Добавить оффер", callback_data="add_offer")],
         [InlineKeyboardButton(text="📋 Список офферов", callback_data="list_offers")],
         [InlineKeyboardButton(text="📊 Статистика", callback_data="stats")],
+        [InlineKeyboardButton(text="📈 Аналитика трафика", callback_data="analytics_24h")],
+        [InlineKeyboardButton(text="🩺 Состояние бота", callback_data="health")],
         [InlineKeyboardButton(text="🔄 Перезапустить бота", callback_data="restart_bot")]
     ])
 
 
-def offers_keyboard(offers: Dict) -> InlineKeyboardMarkup:
-    """Клавиатура со списком офферов для управления"""
-    buttons = []
-    sorted_offers = sorted(
-        offers.get('microloans', {}).items(),
-        key=lambda x: (
-            x[1].get('priority', {}).get('manual_boost', 0),
-            x[1].get('metrics', {}).get('cr', 0)
-        ),
-        reverse=True
-    )
-
-    for offer_id, offer in sorted_offers:
-        status = "✅" if offer.get('status', {}).get('is_active', True) else "❌"
-        priority = offer.get('priority', {}).get('manual_boost', 5)
-        cr = offer.get('metrics', {}).get('cr', 0)
+def offers_page_keyboard(entries: List, filters: Dict, prev_cursor: Optional[str],
+                         next_cursor: Optional[str]) -> InlineKeyboardMarkup:
+    """Клавиатура одной страницы списка офферов с фильтрами и навигацией"""
+    status_labels = {"all": "Все", "active": "✅ Активные", "inactive": "❌ Выключенные"}
+    country_labels = {"all": "Все", "russia": "🇷🇺 Россия", "kazakhstan": "🇰🇿 Казахстан"}
+    zero_labels = {"all": "Все", "zero": "Только 0%"}
+
+    buttons = [
+        [
+            InlineKeyboardButton(text=f"Статус: {status_labels[filters['status']]}",
+                                 callback_data="offers_filter_status"),
+            InlineKeyboardButton(text=f"Страна: {country_labels[filters['country']]}",
+                                 callback_data="offers_filter_country")
+        ],
+        [
+            InlineKeyboardButton(text=f"0%: {zero_labels[filters['zero']]}", callback_data="offers_filter_zero"),
+            InlineKeyboardButton(text="✖️ Сбросить поиск" if filters['query'] else "🔍 Поиск",
+                                 callback_data="offers_search_reset" if filters['query'] else "offers_search")
+        ]
+    ]
+
+    for entry in entries:
+        status = "✅" if entry.is_active else "❌"
 
         # Определяем валюту на основе стран
-        countries = offer.get('geography', {}).get('countries', [])
-        currency_icon = format_currency_icon(countries)
+        currency_icon = format_currency_icon(list(entry.countries))
 
         # Экранируем имя оффера для безопасного отображения
-        safe_name = escape_html(offer.get('name', 'Без названия'))[:25]  # Ограничиваем для места валюты
-        text = f"{status} {safe_name} {currency_icon} (P:{priority}, CR:{cr}%)"
-        buttons.append([InlineKeyboardButton(text=text, callback_data=f"edit_{offer_id}")])
+        safe_name = escape_html(entry.name)[:25]  # Ограничиваем для места валюты
+        text = f"{status} {safe_name} {currency_icon} (P:{entry.manual_boost}, CR:{entry.cr}%)"
+        buttons.append([InlineKeyboardButton(text=text, callback_data=f"edit_{entry.offer_id}")])
+
+    navigation = []
+    if prev_cursor:
+        navigation.append(InlineKeyboardButton(text="⬅️ Назад", callback_data=f"offers_prev_{prev_cursor}"))
+    if next_cursor:
+        navigation.append(InlineKeyboardButton(text="Вперед ➡️", callback_data=f"offers_next_{next_cursor}"))
+    if navigation:
+        buttons.append(navigation)
 
     buttons.append([InlineKeyboardButton(text="🔙 Назад", callback_data="main_menu")])
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
\ No newline at end of file
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -0,0 +1,10 @@
+"""
+FSM состояния для массового импорта офферов
+"""
+from aiogram.fsm.state import State, StatesGroup
+
+
+class BulkImportStates(StatesGroup):
+    """Состояния для импорта офферов и метрик из файла"""
+    waiting_file = State()          # Ожидание CSV/JSON документа
+    waiting_metrics = State()       # Ожидание выгрузки статистики CPA-сети
@@ -11,4 +11,8 @@ class EditStates(StatesGroup):
 
 class PaymentMethodsStates(StatesGroup):
     """Состояния для выбора способов получения средств"""
-    selecting = State()             # Процесс выбора способов оплаты
\ No newline at end of file
+    selecting = State()             # Процесс выбора способов оплаты
+
+class OfferListStates(StatesGroup):
+    """Состояния для списка офферов"""
+    search = State()                # Ожидание поискового запроса
@@ -0,0 +1,323 @@
+"""
+Массовый импорт и экспорт офферов (CSV/JSON) с пакетной валидацией
+"""
+import csv
+import io
+import json
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config.constants import PAYMENT_METHODS
+from .formatters import escape_html
+from .validators import parse_metrics, validate_age_range, validate_amount_range, validate_loan_terms, \
+    validate_priority, validate_url
+
+# Колонки плоского формата (CSV и JSON-список строк)
+COLUMNS = [
+    "id", "name", "countries", "amounts", "age", "loan_terms", "zero_percent", "description",
+    "russia_link", "kazakhstan_link", "metrics", "priority", "payment_methods", "is_active", "logo"
+]
+
+COUNTRY_ALIASES = {
+    "russia": "russia", "ru": "russia", "рф": "russia", "россия": "russia",
+    "kazakhstan": "kazakhstan", "kz": "kazakhstan", "кз": "kazakhstan", "казахстан": "kazakhstan"
+}
+
+TRUE_VALUES = {"1", "true", "yes", "да", "+", "y"}
+FALSE_VALUES = {"0", "false", "no", "нет", "-", "n", ""}
+
+MAX_REPORTED_ERRORS = 30
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(item) for item in value)
+    return str(value).strip()
+
+
+def flatten_offer(offer_id: str, offer: Dict) -> Dict[str, str]:
+    """Оффер каталога в плоскую строку формата импорта"""
+    geography = offer.get('geography', {})
+    limits = offer.get('limits', {})
+    terms = offer.get('loan_terms', {})
+    metrics = offer.get('metrics', {})
+
+    def span(values: Dict, low: str, high: str) -> str:
+        if values.get(low) is None or values.get(high) is None:
+            return ""
+        return f"{values[low]}-{values[high]}"
+
+    return {
+        "id": offer_id,
+        "name": _cell(offer.get('name')),
+        "countries": _cell(geography.get('countries', [])),
+        "amounts": span(limits, 'min_amount', 'max_amount'),
+        "age": span(limits, 'min_age', 'max_age'),
+        "loan_terms": span(terms, 'min_days', 'max_days'),
+        "zero_percent": _cell(bool(offer.get('zero_percent', False))),
+        "description": _cell(offer.get('description')),
+        "russia_link": _cell(geography.get('russia_link')),
+        "kazakhstan_link": _cell(geography.get('kazakhstan_link')),
+        "metrics": " ".join(str(metrics.get(name, 0)) for name in ("cr", "ar", "epc", "epl")),
+        "priority": _cell(offer.get('priority', {}).get('manual_boost')),
+        "payment_methods": _cell(offer.get('payment_methods', [])),
+        "is_active": _cell(bool(offer.get('status', {}).get('is_active', True))),
+        "logo": _cell(offer.get('logo'))
+    }
+
+
+def parse_document(filename: str, content: bytes) -> List[Tuple[int, Dict[str, str]]]:
+    """Разбор загруженного файла в строки (номер строки, значения колонок)"""
+    text = content.decode('utf-8-sig')
+    name = (filename or "").lower()
+
+    if name.endswith('.json') or text.lstrip().startswith(('{', '[')):
+        data = json.loads(text)
+        # Формат экспорта {"microloans": {...}} или список офферов/плоских строк
+        if isinstance(data, dict):
+            items = [dict(offer, id=offer.get('id', offer_id)) for offer_id, offer in data.get('microloans', {}).items()]
+        elif isinstance(data, list):
+            items = data
+        else:
+            raise ValueError("JSON должен быть списком офферов или объектом с ключом microloans")
+
+        rows = []
+        for number, item in enumerate(items, start=1):
+            if not isinstance(item, dict):
+                raise ValueError(f"Элемент {number} не является объектом")
+            is_nested = any(isinstance(item.get(key), dict) for key in ('geography', 'limits', 'metrics'))
+            row = flatten_offer(item.get('id', ''), item) if is_nested else {k: _cell(v) for k, v in item.items()}
+            if not item.get('id'):
+                row['id'] = ""
+            rows.append((number, row))
+        return rows
+
+    # По заголовку определяем только разделитель: кавычки в нем не встречаются, и Sniffer
+    # выключал бы doublequote - "" внутри поля при каждом экспорте-импорте удваивалось бы
+    header = text.split('\n', 1)[0]
+    delimiter = next((candidate for candidate in ('\t', ';') if candidate in header), ',')
+    reader = csv.DictReader(io.StringIO(text), dialect=csv.excel, delimiter=delimiter)
+    missing = {"name", "countries"} - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"Нет обязательных колонок: {', '.join(sorted(missing))}")
+
+    # Номер строки файла: заголовок - строка 1
+    return [(reader.line_num, {key.strip(): _cell(value) for key, value in row.items() if key})
+            for row in reader]
+
+
+def _parse_bool(value: str, default: bool) -> Optional[bool]:
+    value = value.strip().lower()
+    if not value:
+        return default
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    return None
+
+
+def _validate_row(row: Dict[str, str], existing: Optional[Dict] = None) -> Tuple[Dict, List[str]]:
+    """Проверка одной строки теми же правилами, что и пошаговый диалог"""
+    errors = []
+    fields = {}
+
+    if existing:
+        # Обновление: пустая ячейка - текущее значение оффера, проверяется теми же правилами
+        current = flatten_offer(existing.get('id', ''), existing)
+        row = {column: row.get(column, '').strip() or current[column] for column in COLUMNS}
+
+    fields['name'] = row.get('name', '').strip()
+    if not fields['name']:
+        errors.append("пустое название")
+
+    countries = []
+    for token in re.split(r'[,;\s/]+', row.get('countries', '').lower()):
+        if not token:
+            continue
+        country = COUNTRY_ALIASES.get(token)
+        if country is None:
+            errors.append(f"неизвестная страна «{token}»")
+        elif country not in countries:
+            countries.append(country)
+    if not countries and not any(e.startswith("неизвестная страна") for e in errors):
+        errors.append("не указаны страны")
+    fields['countries'] = countries
+
+    for column, validator, message in (
+        ('amounts', validate_amount_range, "суммы: формат 1000-30000 (от 1 000 до 1 000 000)"),
+        ('age', validate_age_range, "возраст: формат 18-70 (от 18 до 99)"),
+    ):
+        success, values = validator(row.get(column, ''))
+        if success:
+            fields.update(values)
+        else:
+            errors.append(message)
+
+    if row.get('loan_terms', '').strip():
+        success, values = validate_loan_terms(row['loan_terms'])
+        if success:
+            fields.update(values)
+        else:
+            errors.append("сроки: формат 7-30 (от 1 до 365 дней)")
+
+    for column, default in (('zero_percent', False), ('is_active', True)):
+        value = _parse_bool(row.get(column, ''), default)
+        if value is None:
+            errors.append(f"{column}: ожидается да/нет")
+        fields[column] = value
+
+    fields['description'] = row.get('description', '').strip()
+
+    for country in ('russia', 'kazakhstan'):
+        link = row.get(f'{country}_link', '').strip()
+        if link and not validate_url(link):
+            errors.append(f"{country}_link: некорректная ссылка")
+        elif not link and country in countries:
+            errors.append(f"{country}_link: нужна ссылка для выбранной страны")
+        fields[f'{country}_link'] = link or None
+
+    success, metrics = parse_metrics(row.get('metrics', ''))
+    if success:
+        fields['metrics'] = metrics
+    else:
+        errors.append("метрики: формат «CR AR EPC EPL»")
+
+    success, priority = validate_priority(row.get('priority', ''))
+    if success:
+        fields['priority'] = priority
+    elif row.get('priority', '').strip() == "0" and fields['is_active'] is False:
+        # Выключенные офферы хранятся с нулевым приоритетом (см. toggle_offer)
+        fields['priority'] = 0
+    else:
+        errors.append("приоритет: число от 1 до 10")
+
+    methods_text = row.get('payment_methods', '').strip().lower()
+    if methods_text in ("all", "все"):
+        methods = list(PAYMENT_METHODS.keys())
+    else:
+        methods = [method for method in re.split(r'[,;\s]+', methods_text) if method]
+        unknown = [method for method in methods if method not in PAYMENT_METHODS]
+        if unknown:
+            errors.append(f"неизвестные способы получения: {', '.join(unknown)}")
+    fields['payment_methods'] = list(dict.fromkeys(methods))
+
+    fields['logo'] = row.get('logo', '').strip() or None
+    return fields, errors
+
+
+def _build_offer(offer_id: str, fields: Dict, existing: Optional[Dict]) -> Dict:
+    """Оффер в формате каталога (как create_offer_with_data)"""
+    now = datetime.now().isoformat()
+    existing = existing or {}
+    status = dict(existing.get('status', {})) if existing else {"created_at": now}
+    status.update({"is_active": fields['is_active'], "updated_at": now})
+
+    priority = dict(existing.get('priority', {}))
+    if priority.get('manual_boost') != fields['priority'] or 'final_score' not in priority:
+        priority = {"manual_boost": fields['priority'], "final_score": fields['priority'] * 10}
+
+    offer = {
+        "id": offer_id,
+        "name": fields['name'],
+        # Логотип не загружается файлом: сохраняем текущий, если в строке не указан
+        "logo": fields['logo'] or existing.get('logo'),
+        "geography": {
+            "countries": fields['countries'],
+            "russia_link": fields['russia_link'],
+            "kazakhstan_link": fields['kazakhstan_link']
+        },
+        "limits": {
+            "min_amount": fields['min_amount'],
+            "max_amount": fields['max_amount'],
+            "min_age": fields['min_age'],
+            "max_age": fields['max_age']
+        },
+        "zero_percent": fields['zero_percent'],
+        "description": fields['description'],
+        "payment_methods": fields['payment_methods'],
+        "metrics": fields['metrics'],
+        "priority": priority,
+        "status": status
+    }
+
+    # Пустые колонки не добавляют полей, которых у существующего оффера не было
+    if 'min_days' in fields:
+        offer['loan_terms'] = {"min_days": fields['min_days'], "max_days": fields['max_days']}
+    elif not existing or 'loan_terms' in existing:
+        offer['loan_terms'] = existing.get('loan_terms', {"min_days": 5, "max_days": 30})
+    if existing and 'payment_methods' not in existing and not fields['payment_methods']:
+        del offer['payment_methods']
+    return offer
+
+
+def validate_rows(rows: Iterable[Tuple[int, Dict[str, str]]], existing: Dict[str, Dict],
+                  new_id) -> Tuple[Dict[str, Dict], List[Tuple[int, str]], int]:
+    """Валидация всех строк за один проход: (принятые офферы, ошибки по строкам, число новых)"""
+    accepted: Dict[str, Dict] = {}
+    errors: List[Tuple[int, str]] = []
+    created = 0
+
+    seen_ids = set()
+
+    for number, row in rows:
+        offer_id = row.get('id', '').strip()
+        fields, row_errors = _validate_row(row, existing.get(offer_id))
+
+        if offer_id in seen_ids:
+            row_errors.append(f"ID {offer_id} повторяется в файле")
+        elif offer_id:
+            seen_ids.add(offer_id)
+
+        if row_errors:
+            errors.append((number, "; ".join(row_errors)))
+            continue
+
+        # ID из файла попадает в callback_data - чужие ID не сохраняем, новый оффер получает свой
+        if offer_id not in existing:
+            created += 1
+            offer_id = new_id()
+
+        accepted[offer_id] = _build_offer(offer_id, fields, existing.get(offer_id))
+
+    return accepted, errors, created
+
+
+def format_import_report(accepted: int, created: int, errors: List[Tuple[int, str]]) -> str:
+    """Отчет об импорте для админа"""
+    lines = [
+        "📥 <b>Импорт офферов</b>\n",
+        f"✅ Принято: {accepted} (новых: {created}, обновлено: {accepted - created})",
+        f"❌ Строк с ошибками: {len(errors)}"
+    ]
+
+    if errors:
+        lines.append("")
+        for number, message in errors[:MAX_REPORTED_ERRORS]:
+            # В сообщениях значения из файла - экранируем
+            lines.append(f"• Строка {number}: {escape_html(message)}")
+        if len(errors) > MAX_REPORTED_ERRORS:
+            lines.append(f"... и еще {len(errors) - MAX_REPORTED_ERRORS}")
+
+    return "\n".join(lines)
+
+
+def write_export(microloans: Dict[str, Dict], file, fmt: str):
+    """Потоковая запись каталога в файл: по одному офферу за раз"""
+    if fmt == "json":
+        file.write('{\n  "microloans": {')
+        for number, (offer_id, offer) in enumerate(microloans.items()):
+            fragment = json.dumps(offer, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+            file.write(f'{"," if number else ""}\n    {json.dumps(offer_id)}: {fragment}')
+        file.write('\n  }\n}\n')
+        return
+
+    writer = csv.DictWriter(file, fieldnames=COLUMNS)
+    writer.writeheader()
+    for offer_id, offer in microloans.items():
+        writer.writerow(flatten_offer(offer_id, offer))
@@ -0,0 +1,96 @@
+"""
+Агрегированная статистика каталога для экрана /stats
+"""
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..config.constants import PAYMENT_METHODS
+from .offer_manager import get_catalog_version, load_offers
+
+TOP_OFFERS_COUNT = 3
+
+
+@dataclass
+class CatalogStats:
+    """Счетчики каталога, собранные за один проход по офферам"""
+    version: Optional[int] = None
+    total: int = 0
+    active: int = 0
+    metric_sums: Dict[str, float] = field(default_factory=lambda: {"cr": 0, "ar": 0, "epc": 0, "epl": 0})
+    top_cr: List[Tuple[str, float]] = field(default_factory=list)
+    payment_methods: Dict[str, int] = field(default_factory=dict)
+    countries: Dict[str, int] = field(default_factory=lambda: {"russia": 0, "kazakhstan": 0, "both": 0})
+    zero_percent: int = 0
+    with_logo: int = 0
+
+    @classmethod
+    def build(cls, microloans: Dict[str, Dict], version) -> "CatalogStats":
+        stats = cls(version=version)
+
+        for offer in microloans.values():
+            stats.total += 1
+            if offer.get('status', {}).get('is_active', True):
+                stats.active += 1
+
+            metrics = offer.get('metrics', {})
+            for name in stats.metric_sums:
+                stats.metric_sums[name] += metrics.get(name, 0)
+
+            for method in offer.get('payment_methods', []):
+                if method in PAYMENT_METHODS:
+                    stats.payment_methods[method] = stats.payment_methods.get(method, 0) + 1
+
+            countries = offer.get('geography', {}).get('countries', [])
+            if 'russia' in countries and 'kazakhstan' in countries:
+                stats.countries["both"] += 1
+            elif 'russia' in countries:
+                stats.countries["russia"] += 1
+            elif 'kazakhstan' in countries:
+                stats.countries["kazakhstan"] += 1
+
+            if offer.get('zero_percent', False):
+                stats.zero_percent += 1
+            if offer.get('logo'):
+                stats.with_logo += 1
+
+        # Тот же порядок, что и у sorted(..., reverse=True)[:3]
+        stats.top_cr = [
+            (offer.get('name', 'Без названия'), offer.get('metrics', {}).get('cr', 0))
+            for offer in heapq.nlargest(TOP_OFFERS_COUNT, microloans.values(),
+                                        key=lambda offer: offer.get('metrics', {}).get('cr', 0))
+        ]
+        return stats
+
+    @property
+    def inactive(self) -> int:
+        return self.total - self.active
+
+    def average(self, name: str) -> float:
+        return self.metric_sums[name] / self.total if self.total else 0
+
+
+_stats: Optional[CatalogStats] = None
+_stats_text: Optional[str] = None
+
+
+def get_catalog_stats() -> CatalogStats:
+    """Статистика текущей версии каталога; пересчитывается только при изменениях"""
+    global _stats, _stats_text
+
+    microloans = load_offers().get('microloans', {})
+    version = get_catalog_version()
+    if _stats is None or version is None or _stats.version != version:
+        _stats = CatalogStats.build(microloans, version)
+        _stats_text = None
+    return _stats
+
+
+def get_stats_text(render) -> str:
+    """Текст экрана статистики, отрисованный render(stats) один раз на версию каталога"""
+    global _stats_text
+
+    stats = get_catalog_stats()
+    if _stats_text is None or stats.version is None:
+        _stats_text = render(stats)
+    return _stats_text
@@ -0,0 +1,128 @@
+"""
+Хранилище логотипов: нормализация через Pillow, имена по хэшу содержимого, сборка мусора
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Iterable, Tuple
+
+from PIL import Image, ImageOps
+
+from ..config.constants import IMAGES_DIR
+from .offer_manager import get_offer_logos
+
+logger = logging.getLogger(__name__)
+
+# Логотип приводится к квадрату карточки: Telegram все равно показывает фото не крупнее
+LOGO_SIZE = (512, 512)
+LOGO_BACKGROUND = (255, 255, 255)
+JPEG_QUALITY = 85
+
+# Файл моложе этого возраста не удаляется: оффер с ним может быть еще не сохранен
+GC_MIN_AGE = 3600
+GC_INTERVAL = 6 * 3600
+
+# Имя -> время последней выдачи store_logo. Защищает от сборки мусора уже существующий файл,
+# не трогая mtime: по нему основной бот проверяет кэш file_id и загрузил бы логотип заново
+_recently_stored: Dict[str, float] = {}
+
+
+def normalize_logo(data: bytes) -> bytes:
+    """Приведение изображения к LOGO_SIZE на белом фоне, JPEG"""
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        # Прозрачность заливаем фоном: JPEG без альфа-канала
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, LOGO_BACKGROUND)
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        else:
+            image = image.convert("RGB")
+
+        image = ImageOps.pad(image, LOGO_SIZE, method=Image.LANCZOS, color=LOGO_BACKGROUND)
+
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        return output.getvalue()
+
+
+def store_logo(data: bytes) -> str:
+    """Сохраняет нормализованный логотип и возвращает имя файла; одинаковые логотипы - один файл"""
+    normalized = normalize_logo(data)
+    logo_filename = f"{hashlib.sha256(normalized).hexdigest()[:20]}.jpg"
+    logo_path = os.path.join(IMAGES_DIR, logo_filename)
+
+    _recently_stored[logo_filename] = time.time()
+    if os.path.exists(logo_path):
+        return logo_filename
+
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=IMAGES_DIR, prefix=".logo.", suffix=".tmp")
+    try:
+        if hasattr(os, 'fchmod'):
+            os.fchmod(fd, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(normalized)
+        os.replace(tmp_path, logo_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    logger.info(f"Сохранен логотип {logo_filename}: {len(data)} -> {len(normalized)} байт")
+    return logo_filename
+
+
+def collect_garbage(referenced: Iterable[str], min_age: float = GC_MIN_AGE) -> Tuple[int, int]:
+    """Удаляет файлы логотипов, на которые не ссылается ни один оффер: (файлов, байт)"""
+    referenced = {name for name in referenced if name}
+    now = time.time()
+    removed = freed = 0
+
+    for name, stored_at in list(_recently_stored.items()):
+        if now - stored_at < min_age:
+            referenced.add(name)
+        else:
+            _recently_stored.pop(name, None)
+
+    try:
+        entries = list(os.scandir(IMAGES_DIR))
+    except FileNotFoundError:
+        return 0, 0
+
+    for entry in entries:
+        if not entry.is_file() or entry.name in referenced:
+            continue
+        try:
+            stat = entry.stat()
+            if now - stat.st_mtime < min_age:
+                continue
+            os.remove(entry.path)
+            removed += 1
+            freed += stat.st_size
+        except OSError as e:
+            logger.warning(f"Не удалось удалить логотип {entry.name}: {e}")
+
+    if removed:
+        logger.info(f"Сборка мусора логотипов: удалено {removed} файлов, {freed // 1024} КБ")
+    return removed, freed
+
+
+async def run_logo_gc(interval: float = GC_INTERVAL):
+    """Периодическая сборка мусора логотипов для фоновой задачи админского бота"""
+    while True:
+        try:
+            # Каталог не прочитан - пропускаем проход: иначе все логотипы выглядели бы ничьими
+            referenced = get_offer_logos()
+            if referenced:
+                await asyncio.to_thread(collect_garbage, referenced)
+            else:
+                logger.warning("Сборка мусора логотипов пропущена: каталог пуст")
+        except Exception as e:
+            logger.error(f"Ошибка сборки мусора логотипов, проход пропущен: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,158 @@
+"""
+Разбор выгрузки статистики CPA-сети и сопоставление с офферами каталога
+"""
+import csv
+import io
+import re
+from typing import Dict, List, Tuple
+
+from .formatters import escape_html
+from .validators import parse_metrics
+
+METRIC_NAMES = ("cr", "ar", "epc", "epl")
+
+# Колонки CSV, по которым строка выгрузки сопоставляется с оффером
+KEY_COLUMNS = ("id", "offer_id", "offer", "name", "оффер", "название")
+
+MAX_REPORTED_PROBLEMS = 30
+
+_LABEL_RE = re.compile(r'\b(?:CR|AR|EPC|EPL)\b', re.IGNORECASE)
+_TRAILING_NUMBERS_RE = re.compile(r'^(.*?)[\s;:|]+(\d+[.,]?\d*)\s+(\d+[.,]?\d*)\s+(\d+[.,]?\d*)\s+(\d+[.,]?\d*)$')
+
+
+def _normalize_name(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _header(name: str) -> str:
+    """«CR, %» -> «cr», «Offer ID» -> «offer_id»"""
+    return re.sub(r'[^a-zа-яё_]', '', name.strip().lower().replace(' ', '_')).strip('_')
+
+
+def _number(value: str) -> float:
+    return float(value.strip().replace('%', '').replace(' ', '').replace(',', '.'))
+
+
+def _delimiter(header: str) -> str:
+    # Заголовки выгрузок вида «CR, %» ломают автоопределение: ; и табуляция важнее запятой
+    for delimiter in ('\t', ';'):
+        if delimiter in header:
+            return delimiter
+    return ','
+
+
+def _parse_csv(text: str) -> List[Tuple[int, str, Dict]]:
+    reader = csv.DictReader(io.StringIO(text), delimiter=_delimiter(text.split('\n', 1)[0]))
+
+    columns = {_header(name): name for name in reader.fieldnames or [] if name}
+    key_columns = [columns[name] for name in KEY_COLUMNS if name in columns]
+    if not key_columns:
+        raise ValueError(f"Нет колонки с ID или названием оффера ({', '.join(KEY_COLUMNS)})")
+    missing = [name for name in METRIC_NAMES if name not in columns]
+    if missing:
+        raise ValueError(f"Нет колонок метрик: {', '.join(missing)}")
+
+    rows = []
+    for row in reader:
+        try:
+            metrics = {name: _number(row.get(columns[name]) or '') for name in METRIC_NAMES}
+        except ValueError:
+            metrics = None
+        # Первая заполненная ключевая колонка: ID точнее названия
+        key = next((row[column].strip() for column in key_columns if (row.get(column) or '').strip()), '')
+        rows.append((reader.line_num, key, metrics))
+    return rows
+
+
+def _parse_text(text: str) -> List[Tuple[int, str, Dict]]:
+    """Строки «Название CR: 55.4% AR: 4.5% EPC: 110.89 EPL: 200.76» или «Название 55.4 4.5 110.89 200.76»"""
+    rows = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        label = _LABEL_RE.search(line)
+        if label:
+            key, (success, metrics) = line[:label.start()], parse_metrics(line[label.start():])
+        else:
+            match = _TRAILING_NUMBERS_RE.match(line)
+            if match:
+                key, success = match.group(1), True
+                metrics = dict(zip(METRIC_NAMES, map(_number, match.groups()[1:])))
+            else:
+                key, success, metrics = line, False, None
+
+        rows.append((number, key.strip(" \t:;|-—"), metrics if success else None))
+    return rows
+
+
+def parse_metrics_feed(filename: str, content: str) -> List[Tuple[int, str, Dict]]:
+    """Строки выгрузки: (номер строки, ID или название оффера, метрики или None при ошибке)"""
+    # CSV - по расширению или по строке заголовка, где метрики идут отдельными колонками
+    first_line = content.split('\n', 1)[0]
+    header = {_header(cell) for cell in first_line.split(_delimiter(first_line))}
+    if (filename or "").lower().endswith('.csv') or set(METRIC_NAMES) <= header:
+        return _parse_csv(content)
+    return _parse_text(content)
+
+
+def match_metrics(rows: List[Tuple[int, str, Dict]],
+                  microloans: Dict[str, Dict]) -> Tuple[Dict[str, Dict], List[Tuple[int, str]]]:
+    """Сопоставление строк с офферами по ID или названию: (метрики по ID оффера, проблемы по строкам)"""
+    by_id = {offer_id.lower(): offer_id for offer_id in microloans}
+    by_name: Dict[str, List[str]] = {}
+    for offer_id, offer in microloans.items():
+        by_name.setdefault(_normalize_name(offer.get('name', '')), []).append(offer_id)
+
+    updates: Dict[str, Dict] = {}
+    problems: List[Tuple[int, str]] = []
+
+    for number, key, metrics in rows:
+        if not key:
+            problems.append((number, "не указан оффер"))
+            continue
+        if metrics is None:
+            problems.append((number, f"«{key}»: метрики не распознаны"))
+            continue
+
+        offer_id = by_id.get(key.lower())
+        if offer_id is None:
+            candidates = by_name.get(_normalize_name(key), [])
+            if len(candidates) > 1:
+                problems.append((number, f"«{key}»: несколько офферов с таким названием, укажите ID"))
+                continue
+            offer_id = candidates[0] if candidates else None
+
+        if offer_id is None:
+            problems.append((number, f"«{key}»: оффер не найден"))
+        elif offer_id in updates:
+            problems.append((number, f"«{key}»: оффер {offer_id} уже обновлен строкой выше"))
+        else:
+            updates[offer_id] = metrics
+
+    return updates, problems
+
+
+def format_metrics_report(updates: Dict[str, Dict], microloans: Dict[str, Dict],
+                          problems: List[Tuple[int, str]]) -> str:
+    """Отчет о загрузке метрик для админа"""
+    lines = [
+        "📊 <b>Обновление метрик</b>\n",
+        f"✅ Обновлено офферов: {len(updates)}",
+        f"❌ Строк с проблемами: {len(problems)}"
+    ]
+
+    if problems:
+        lines.append("")
+        for number, message in problems[:MAX_REPORTED_PROBLEMS]:
+            # Ключ строки взят из выгрузки как есть - экранируем
+            lines.append(f"• Строка {number}: {escape_html(message)}")
+        if len(problems) > MAX_REPORTED_PROBLEMS:
+            lines.append(f"... и еще {len(problems) - MAX_REPORTED_PROBLEMS}")
+
+    not_in_feed = len(set(microloans) - set(updates))
+    if updates and not_in_feed:
+        lines.append(f"\nℹ️ Без изменений (нет в выгрузке): {not_in_feed}")
+
+    return "\n".join(lines)
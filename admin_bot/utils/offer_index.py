@@ -0,0 +1,153 @@
+"""
+Индекс списка офферов для постраничного вывода, фильтров и поиска по названию
+"""
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .offer_manager import get_catalog_version, load_offers
+
+PAGE_SIZE = 10
+
+# Значения фильтров по кругу: первое - «без фильтра»
+STATUS_FILTERS = ("all", "active", "inactive")
+COUNTRY_FILTERS = ("all", "russia", "kazakhstan")
+ZERO_FILTERS = ("all", "zero")
+
+DEFAULT_FILTERS = {"status": "all", "country": "all", "zero": "all", "query": ""}
+
+
+@dataclass(frozen=True)
+class OfferListEntry:
+    """Строка списка офферов: только поля, нужные для кнопки и фильтров"""
+    offer_id: str
+    name: str
+    is_active: bool
+    countries: FrozenSet[str]
+    zero_percent: bool
+    manual_boost: int
+    cr: float
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class OfferListIndex:
+    """Упорядоченный список офферов с индексами по названию для одной версии каталога"""
+
+    def __init__(self, microloans: Dict[str, Dict], version):
+        self.version = version
+
+        entries = [
+            OfferListEntry(
+                offer_id=offer_id,
+                name=offer.get('name', 'Без названия'),
+                is_active=offer.get('status', {}).get('is_active', True),
+                countries=frozenset(offer.get('geography', {}).get('countries', [])),
+                zero_percent=bool(offer.get('zero_percent', False)),
+                manual_boost=offer.get('priority', {}).get('manual_boost', 5),
+                cr=offer.get('metrics', {}).get('cr', 0)
+            )
+            for offer_id, offer in microloans.items()
+        ]
+
+        # Порядок как в прежнем списке: приоритет, затем CR
+        sort_keys = {
+            offer_id: (offer.get('priority', {}).get('manual_boost', 0), offer.get('metrics', {}).get('cr', 0))
+            for offer_id, offer in microloans.items()
+        }
+        entries.sort(key=lambda entry: sort_keys[entry.offer_id], reverse=True)
+
+        self.entries: List[OfferListEntry] = entries
+        self.rank: Dict[str, int] = {entry.offer_id: rank for rank, entry in enumerate(entries)}
+
+        # Префиксный поиск по названию и ID - бинарный поиск по отсортированным ключам
+        keys = [(entry.name.lower(), rank) for rank, entry in enumerate(entries)]
+        keys += [(entry.offer_id.lower(), rank) for rank, entry in enumerate(entries)]
+        self._prefix_keys: List[Tuple[str, int]] = sorted(keys)
+
+        # Поиск подстроки - по триграммам с проверкой кандидатов
+        self._trigram_postings: Dict[str, Set[int]] = {}
+        for key, rank in keys:
+            for trigram in _trigrams(key):
+                self._trigram_postings.setdefault(trigram, set()).add(rank)
+
+        self._match_cache: Dict[Tuple, List[int]] = {}
+
+    def _search(self, query: str) -> Set[int]:
+        """Ранги офферов, у которых название или ID содержит query"""
+        if len(query) < 3:
+            # Короткий запрос - только по началу названия/ID
+            start = bisect_left(self._prefix_keys, (query, -1))
+            ranks = set()
+            for key, rank in self._prefix_keys[start:]:
+                if not key.startswith(query):
+                    break
+                ranks.add(rank)
+            return ranks
+
+        postings = [self._trigram_postings.get(trigram, set()) for trigram in _trigrams(query)]
+        candidates = set.intersection(*sorted(postings, key=len))
+        return {
+            rank for rank in candidates
+            if query in self.entries[rank].name.lower() or query in self.entries[rank].offer_id.lower()
+        }
+
+    def matches(self, filters: Dict) -> List[int]:
+        """Ранги офферов под фильтры в порядке списка (кэшируется на версию каталога)"""
+        key = (filters.get('status'), filters.get('country'), filters.get('zero'), filters.get('query', ''))
+        cached = self._match_cache.get(key)
+        if cached is not None:
+            return cached
+
+        status, country, zero, query = key
+        found = self._search(query.lower()) if query else None
+
+        ranks = []
+        for rank, entry in enumerate(self.entries):
+            if found is not None and rank not in found:
+                continue
+            if (status == "active" and not entry.is_active) or (status == "inactive" and entry.is_active):
+                continue
+            if country in ("russia", "kazakhstan") and country not in entry.countries:
+                continue
+            if zero == "zero" and not entry.zero_percent:
+                continue
+            ranks.append(rank)
+
+        self._match_cache[key] = ranks
+        return ranks
+
+    def page(self, filters: Dict, after: Optional[str] = None,
+             before: Optional[str] = None) -> Tuple[List[OfferListEntry], Optional[str], Optional[str], int]:
+        """Страница после/до курсора: (офферы, курсор «назад», курсор «вперед», всего найдено)"""
+        ranks = self.matches(filters)
+
+        # Позиция курсора в отфильтрованном списке; удаленный оффер - с начала списка
+        start = 0
+        if after is not None and after in self.rank:
+            start = bisect_left(ranks, self.rank[after] + 1)
+        elif before is not None and before in self.rank:
+            start = max(bisect_left(ranks, self.rank[before]) - PAGE_SIZE, 0)
+
+        page_ranks = ranks[start:start + PAGE_SIZE]
+        entries = [self.entries[rank] for rank in page_ranks]
+
+        prev_cursor = entries[0].offer_id if entries and start > 0 else None
+        next_cursor = entries[-1].offer_id if entries and start + PAGE_SIZE < len(ranks) else None
+        return entries, prev_cursor, next_cursor, len(ranks)
+
+
+_index: Optional[OfferListIndex] = None
+
+
+def get_offer_index() -> OfferListIndex:
+    """Индекс для текущей версии каталога; перестраивается только при изменениях"""
+    global _index
+
+    microloans = load_offers().get('microloans', {})
+    version = get_catalog_version()
+    if _index is None or version is None or _index.version != version:
+        _index = OfferListIndex(microloans, version)
+    return _index
@@ -1,52 +1,158 @@
 """
 Утилиты для работы с офферами в админском боте
 """
-import json
-import os
-from typing import Dict
+import copy
+import logging
+from typing import Dict, List, Optional
 from datetime import datetime
 
-from ..config.constants import OFFERS_FILE
+from shared.offer_repository import OfferRepository
+from ..config.constants import OFFERS_FILE, OFFERS_DB_FILE
+
+logger = logging.getLogger(__name__)
+
+OFFER_ID_PREFIX = "offer_"
+
+
+class _CatalogCache:
+    """Каталог в памяти, проверяемый по версии каталога в БД"""
+
+    def __init__(self, repository: OfferRepository):
+        self.repository = repository
+        self.ready = False
+        self.version = None
+        self.data: Dict = {"microloans": {}}
+        self.next_id_num = 1
+
+    def refresh(self):
+        """Перечитываем каталог, только если его версия изменилась"""
+        if not self.ready:
+            self.repository.init_catalog(OFFERS_FILE)
+            self.ready = True
+
+        if self.repository.get_version() == self.version:
+            return
+
+        self.version, microloans = self.repository.load_catalog()
+        self.data = {"microloans": microloans}
+        # Счетчик ID только растет: удаленные ID не выдаются повторно в рамках процесса
+        self.next_id_num = max(self.next_id_num, _max_id_num(microloans) + 1)
+
+    def applied(self, version: int, offer_id: str, offer: Optional[Dict]):
+        """Применение собственной записи к кэшу без перечитывания всего каталога"""
+        microloans = self.data['microloans']
+        if offer is None:
+            microloans.pop(offer_id, None)
+        else:
+            microloans[offer_id] = copy.deepcopy(offer)
+
+        # Если между нашими записями каталог менял кто-то еще - перечитаем при следующем чтении
+        self.version = version if self.version == version - 1 else None
+
+
+_catalog = _CatalogCache(OfferRepository(OFFERS_DB_FILE))
+
+
+def _max_id_num(microloans: Dict) -> int:
+    max_num = 0
+    for offer_id in microloans:
+        if offer_id.startswith(OFFER_ID_PREFIX):
+            try:
+                max_num = max(max_num, int(offer_id.split('_')[1]))
+            except (ValueError, IndexError):
+                continue
+    return max_num
 
 
 def load_offers() -> Dict:
-    """Загружает офферы из JSON файла"""
-    if not os.path.exists(OFFERS_FILE):
-        return {"microloans": {}}
+    """Каталог из памяти (только чтение!); для правок - get_offer + upsert_offer"""
     try:
-        with open(OFFERS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        _catalog.refresh()
     except Exception as e:
-        print(f"Ошибка загрузки офферов: {e}")
+        logger.error(f"Ошибка загрузки офферов: {e}")
         return {"microloans": {}}
+    return _catalog.data
+
+
+def get_offer_logos() -> List[Optional[str]]:
+    """Логотипы всех офферов (по одному на оффер); ошибка чтения каталога не скрывается, в отличие от load_offers"""
+    _catalog.refresh()
+    return [offer.get('logo') for offer in _catalog.data['microloans'].values()]
+
+
+def get_catalog_version() -> Optional[int]:
+    """Версия каталога, загруженного в память последним load_offers()"""
+    return _catalog.version
+
+
+def get_offer(offer_id: str) -> Optional[Dict]:
+    """Копия оффера для редактирования"""
+    offer = load_offers().get("microloans", {}).get(offer_id)
+    return copy.deepcopy(offer) if offer is not None else None
 
 
 def save_offers(data: Dict) -> bool:
-    """Сохраняет офферы в JSON файл"""
+    """Сохраняет весь каталог (массовые операции); для одного оффера - upsert_offer/delete_offer"""
     try:
-        with open(OFFERS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        _catalog.repository.replace_catalog(data.get("microloans", {}))
+        _catalog.version = None
         return True
     except Exception as e:
-        print(f"Ошибка сохранения офферов: {e}")
+        logger.error(f"Ошибка сохранения офферов: {e}")
         return False
 
 
-def generate_offer_id() -> str:
-    """Генерирует новый уникальный ID для оффера"""
-    offers = load_offers()
-    existing_ids = list(offers.get('microloans', {}).keys())
-    max_num = 0
+def upsert_offer(offer_id: str, offer: Dict) -> bool:
+    """Сохраняет один оффер"""
+    try:
+        version = _catalog.repository.upsert_offer(offer_id, offer)
+        _catalog.applied(version, offer_id, offer)
+        return True
+    except Exception as e:
+        logger.error(f"Ошибка сохранения оффера {offer_id}: {e}")
+        return False
 
-    for offer_id in existing_ids:
-        if offer_id.startswith('offer_'):
-            try:
-                num = int(offer_id.split('_')[1])
-                max_num = max(max_num, num)
-            except (ValueError, IndexError):
-                continue
 
-    return f"offer_{max_num + 1:03d}"
+def upsert_offers(offers: Dict[str, Dict]) -> bool:
+    """Сохраняет пачку офферов одной транзакцией (все или ничего)"""
+    try:
+        _catalog.repository.upsert_offers(offers)
+        _catalog.version = None
+        return True
+    except Exception as e:
+        logger.error(f"Ошибка пакетного сохранения офферов: {e}")
+        return False
+
+
+def update_offers_metrics(metrics: Dict[str, Dict]) -> bool:
+    """Обновляет CPA метрики пачки офферов одной транзакцией"""
+    try:
+        _catalog.repository.update_metrics(metrics, datetime.utcnow().isoformat() + 'Z')
+        _catalog.version = None
+        return True
+    except Exception as e:
+        logger.error(f"Ошибка обновления метрик: {e}")
+        return False
+
+
+def delete_offer(offer_id: str) -> bool:
+    """Удаляет один оффер из каталога"""
+    try:
+        if not _catalog.repository.delete_offer(offer_id):
+            return False
+        _catalog.version = None
+        return True
+    except Exception as e:
+        logger.error(f"Ошибка удаления оффера {offer_id}: {e}")
+        return False
+
+
+def generate_offer_id() -> str:
+    """Генерирует новый уникальный ID для оффера"""
+    load_offers()
+    offer_id = f"{OFFER_ID_PREFIX}{_catalog.next_id_num:03d}"
+    _catalog.next_id_num += 1
+    return offer_id
 
 
 def update_offer_timestamp(offer: Dict) -> Dict:
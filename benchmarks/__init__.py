@@ -0,0 +1 @@
+"""Микробенчмарки горячих путей: python -m benchmarks.run --save benchmarks/baselines/local.json"""
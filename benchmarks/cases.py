@@ -0,0 +1,180 @@
+import itertools
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from aiogram import Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.types import Chat, Message
+
+from admin_bot.keyboards.main_keyboards import offers_page_keyboard
+from admin_bot.utils.formatters import format_offer_info
+from admin_bot.utils.offer_index import DEFAULT_FILTERS, OfferListIndex
+from admin_bot.utils.validators import parse_metrics
+from benchmarks.catalog import build_repository, make_catalog
+from main_bot.states.loan_flow import LoanFlow
+from main_bot.utils.funnel import FunnelTracker, FunnelTrackingStorage
+from main_bot.utils.logo_cache import LogoFileIdCache
+from main_bot.utils.offer_cards import OfferCardRenderer
+from main_bot.utils.offer_display import OfferDisplay
+from main_bot.utils.update_replay import STUB_TOKEN, StubSession
+from shared.offer_manager import OfferManager
+from shared.offer_repository import OfferRepository
+
+# Каталог для замеров, не зависящих от его размера
+DEFAULT_SIZE = 100
+
+CRITERIA = [
+    {"country": "russia", "age": 30, "amount": 10000},
+    {"country": "kazakhstan", "age": 22, "amount": 50000},
+    {"country": "russia", "age": 45, "amount": 5000, "zero_percent_only": True}
+]
+
+METRICS_INPUTS = [
+    "55.4 4.5 110.89 200.76",
+    "CR: 55.4% AR: 4.5% EPC: 110.89 EPL: 200.76",
+    "cr 12% ar 3.1% epc 45 epl 900",
+    "нет метрик"
+]
+
+
+@dataclass
+class BenchCase:
+    """Замер: setup(размер каталога) готовит данные и возвращает вызов без аргументов (sync или async)"""
+    name: str
+    setup: Callable[[int], Callable[[], Any]]
+    scaled: bool
+    is_async: bool
+
+
+CASES: Dict[str, BenchCase] = {}
+
+
+def bench(name: str, scaled: bool = False, is_async: bool = False):
+    """Регистрация замера; scaled - прогоняется на всех размерах каталога"""
+    def decorator(setup):
+        CASES[name] = BenchCase(name, setup, scaled, is_async)
+        return setup
+    return decorator
+
+
+def empty_manager(db_file: str) -> OfferManager:
+    """OfferManager над пустой БД - для расчетов без обращения к каталогу"""
+    return OfferManager(offers_file="", repository=OfferRepository(db_file))
+
+
+@bench("get_filtered_offers", scaled=True)
+def setup_filtered_offers(size: int):
+    # Фильтрация и ранжирование идут индексированным запросом к SQLite, поэтому нужна настоящая БД
+    manager = OfferManager(offers_file="", repository=build_repository(f"data/offers_{size}.db", size))
+    criteria = itertools.cycle(CRITERIA)
+    return lambda: manager.get_filtered_offers(next(criteria))
+
+
+@bench("calculate_priority", scaled=True)
+def setup_calculate_priority(size: int):
+    manager = empty_manager("data/offers_empty.db")
+    offers = list(make_catalog(size).values())
+    criteria = itertools.cycle(CRITERIA)
+
+    def rank():
+        user_criteria = next(criteria)
+        return sorted(offers, key=lambda offer: manager.calculate_priority(offer, user_criteria), reverse=True)
+    return rank
+
+
+@bench("offer_cards_rebuild", scaled=True)
+def setup_cards_rebuild(size: int):
+    renderer = OfferCardRenderer()
+    catalog = make_catalog(size)
+    versions = itertools.count(1)
+    return lambda: renderer.rebuild(catalog, next(versions))
+
+
+@bench("show_single_offer", is_async=True)
+def setup_show_single_offer(size: int):
+    catalog = make_catalog(size)
+    manager = empty_manager("data/offers_empty.db")
+    manager.offers_data = {"microloans": catalog}
+    display = OfferDisplay(manager, LogoFileIdCache("data/logo_file_ids.json"))
+
+    bot = Bot(STUB_TOKEN, session=StubSession())
+    chat = Chat(id=1001, type="private")
+    message = Message(message_id=1, date=datetime.now(), chat=chat).as_(bot)
+    state = FSMContext(storage=FunnelTrackingStorage(FunnelTracker(db_file="data/analytics.db")),
+                       key=StorageKey(bot_id=42, chat_id=chat.id, user_id=chat.id))
+    offers = list(catalog.values())
+    positions = itertools.cycle(range(len(offers)))
+
+    async def show():
+        index = next(positions)
+        await state.update_data(country="russia", amount=15000, term=14)
+        await display.show_single_offer(message, state, offers[index], index, len(offers))
+    return show
+
+
+@bench("offers_page_keyboard", scaled=True)
+def setup_offers_page(size: int):
+    index = OfferListIndex(make_catalog(size), version=1)
+    filters = [
+        DEFAULT_FILTERS,
+        {**DEFAULT_FILTERS, "status": "active", "country": "kazakhstan"},
+        {**DEFAULT_FILTERS, "zero": "zero", "query": "займ"}
+    ]
+    pages = itertools.cycle(filters)
+
+    def render():
+        page_filters = next(pages)
+        entries, prev_cursor, next_cursor, _ = index.page(page_filters)
+        return offers_page_keyboard(entries, page_filters, prev_cursor, next_cursor)
+    return render
+
+
+@bench("offer_list_index_build", scaled=True)
+def setup_index_build(size: int):
+    catalog = make_catalog(size)
+    return lambda: OfferListIndex(catalog, version=1)
+
+
+@bench("format_offer_info")
+def setup_format_offer_info(size: int):
+    offers = itertools.cycle(make_catalog(size).items())
+
+    def render():
+        offer_id, offer = next(offers)
+        return format_offer_info(offer, offer_id)
+    return render
+
+
+@bench("parse_metrics")
+def setup_parse_metrics(size: int):
+    inputs = itertools.cycle(METRICS_INPUTS)
+    return lambda: parse_metrics(next(inputs))
+
+
+@bench("fsm_transition", scaled=True, is_async=True)
+def setup_fsm_transition(size: int):
+    # Размер - число пользователей с активным состоянием в хранилище
+    storage = FunnelTrackingStorage(FunnelTracker(db_file="data/analytics.db"))
+    states = [state.state for state in LoanFlow.__all_states__]
+    keys = [StorageKey(bot_id=42, chat_id=user_id, user_id=user_id) for user_id in range(1, size + 1)]
+    for key in keys:
+        storage.storage[key].state = states[0]
+    steps = itertools.cycle(itertools.product(keys[:DEFAULT_SIZE], states))
+
+    async def transition():
+        key, state = next(steps)
+        await storage.set_state(key, state)
+        await storage.update_data(key, {"last_offer_message_id": 1})
+        return await storage.get_data(key)
+    return transition
+
+
+def selected_cases(names: Optional[list] = None) -> Dict[str, BenchCase]:
+    if not names:
+        return CASES
+    unknown = set(names) - set(CASES)
+    if unknown:
+        raise ValueError(f"Неизвестные замеры: {', '.join(sorted(unknown))}")
+    return {name: CASES[name] for name in names}
@@ -0,0 +1,63 @@
+import functools
+import random
+from typing import Dict
+
+from shared.offer_repository import OfferRepository
+
+PAYMENT_METHOD_IDS = ["bank_card", "bank_account", "yandex_money", "qiwi", "contact", "cash"]
+NAME_WORDS = ["Быстро", "Деньги", "Займ", "Экспресс", "Кредит", "Плюс", "Онлайн", "Тенге", "Смарт", "Мани"]
+
+
+def make_offer(number: int, rng: random.Random) -> Dict:
+    """Оффер в формате каталога со случайными, но правдоподобными полями"""
+    countries = rng.choice([["russia"], ["russia"], ["kazakhstan"], ["russia", "kazakhstan"]])
+    min_amount = rng.choice([1000, 2000, 3000, 5000])
+    min_age = rng.choice([18, 18, 20, 21])
+    return {
+        "id": f"offer_{number:06d}",
+        "name": f"{' '.join(rng.sample(NAME_WORDS, 2))} {number}",
+        "logo": None,
+        "geography": {
+            "countries": countries,
+            "russia_link": f"https://example.com/ru/{number}?ref={{user_id}}" if "russia" in countries else None,
+            "kazakhstan_link": f"https://example.com/kz/{number}?ref={{user_id}}" if "kazakhstan" in countries else None
+        },
+        "limits": {
+            "min_amount": min_amount,
+            "max_amount": min_amount * rng.choice([10, 20, 30, 50]),
+            "min_age": min_age,
+            "max_age": rng.choice([65, 70, 75])
+        },
+        "loan_terms": {"min_days": rng.choice([5, 7, 10]), "max_days": rng.choice([30, 60, 180])},
+        "payment_methods": rng.sample(PAYMENT_METHOD_IDS, rng.randint(1, len(PAYMENT_METHOD_IDS))),
+        "zero_percent": rng.random() < 0.3,
+        "description": "Деньги на карту за 5 минут, без справок и поручителей <b>до 30 дней</b>",
+        "metrics": {
+            "cr": round(rng.uniform(1, 60), 1),
+            "ar": round(rng.uniform(1, 40), 1),
+            "epc": round(rng.uniform(10, 400), 2),
+            "epl": round(rng.uniform(100, 2000), 2)
+        },
+        "priority": {"manual_boost": rng.randint(0, 10), "final_score": 0},
+        "status": {
+            "is_active": rng.random() < 0.85,
+            "created_at": "2025-08-05T14:00:00.000000",
+            "updated_at": "2025-08-05T14:00:00.000000"
+        }
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def make_catalog(size: int, seed: int = 42) -> Dict[str, Dict]:
+    """Синтетический каталог заданного размера; одинаковый для одного seed (общий для всех замеров)"""
+    rng = random.Random(seed)
+    offers = (make_offer(number, rng) for number in range(1, size + 1))
+    return {offer["id"]: offer for offer in offers}
+
+
+def build_repository(db_file: str, size: int) -> OfferRepository:
+    """БД каталога с синтетическими офферами (без миграции из JSON)"""
+    repository = OfferRepository(db_file)
+    repository.init_catalog(json_file="")
+    repository.upsert_offers(make_catalog(size))
+    return repository
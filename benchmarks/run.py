@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+# Замедление относительно базовой линии, начиная с которого замер помечается
+DEFAULT_THRESHOLD = 0.2
+
+
+def measure(func: Callable[[], Any], is_async: bool, repeat: int = 5, min_time: float = 0.2) -> Dict[str, Any]:
+    """Время одного вызова: серия подбирается так, чтобы длиться не меньше min_time / repeat"""
+    loop = asyncio.new_event_loop() if is_async else None
+
+    def run_batch(number: int) -> float:
+        if is_async:
+            async def batch():
+                started = time.perf_counter()
+                for _ in range(number):
+                    await func()
+                return time.perf_counter() - started
+            return loop.run_until_complete(batch())
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - started
+
+    try:
+        # Прогрев и подбор размера серии
+        number = 1
+        while True:
+            elapsed = run_batch(number)
+            if elapsed >= min_time / repeat or number >= 1_000_000:
+                break
+            number *= 2 if elapsed * 10 >= min_time / repeat else 10
+
+        timings = [run_batch(number) / number for _ in range(repeat)]
+    finally:
+        if loop is not None:
+            loop.close()
+
+    return {
+        "min_us": round(min(timings) * 1e6, 3),
+        "median_us": round(statistics.median(timings) * 1e6, 3),
+        "number": number,
+        "repeat": repeat
+    }
+
+
+def run_cases(names: Optional[List[str]], sizes: List[int], repeat: int, min_time: float) -> Dict[str, Dict]:
+    """Прогон замеров; ключ результата - имя замера и размер каталога: get_filtered_offers[1000]"""
+    from benchmarks.cases import DEFAULT_SIZE, selected_cases
+
+    results = {}
+    for case in selected_cases(names).values():
+        for size in (sizes if case.scaled else [DEFAULT_SIZE]):
+            key = f"{case.name}[{size}]" if case.scaled else case.name
+            started = time.perf_counter()
+            func = case.setup(size)
+            setup_seconds = time.perf_counter() - started
+
+            results[key] = measure(func, case.is_async, repeat, min_time)
+            print(f"{key:<40} {format_time(results[key]['min_us']):>12}   "
+                  f"(медиана {format_time(results[key]['median_us'])}, подготовка {setup_seconds:.1f} с)",
+                  file=sys.stderr)
+    return results
+
+
+def format_time(microseconds: float) -> str:
+    if microseconds >= 1e6:
+        return f"{microseconds / 1e6:.2f} s"
+    if microseconds >= 1e3:
+        return f"{microseconds / 1e3:.2f} ms"
+    return f"{microseconds:.2f} us"
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[Dict[str, Any]]:
+    """Сравнение с базовой линией по минимальному времени - оно меньше всего зависит от шума"""
+    rows = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            rows.append({"case": key, "status": "new", "current_us": result["min_us"]})
+            continue
+        ratio = result["min_us"] / base["min_us"] if base["min_us"] else 1.0
+        if ratio > 1 + threshold:
+            status = "slower"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({"case": key, "status": status, "baseline_us": base["min_us"],
+                     "current_us": result["min_us"], "ratio": round(ratio, 3)})
+    return rows
+
+
+def environment() -> Dict[str, Any]:
+    """Окружение замера: сравнивать имеет смысл только результаты с одной машины"""
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Микробенчмарки ранжирования, отрисовки офферов и работы с состоянием",
+        epilog="пример: python -m benchmarks.run --compare benchmarks/baselines/local.json"
+    )
+    parser.add_argument("--only", help="замеры через запятую (по умолчанию все)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="размеры каталога через запятую")
+    parser.add_argument("--repeat", type=int, default=5, help="число серий на замер")
+    parser.add_argument("--min-time", type=float, default=0.2, help="минимальная суммарная длительность серий, с")
+    parser.add_argument("--save", help="записать результаты как базовую линию (JSON)")
+    parser.add_argument("--compare", help="сравнить с базовой линией и вернуть код 1 при замедлении")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="допустимое замедление, доля")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.only.split(",")] if args.only else None
+    sizes = [int(size) for size in args.sizes.split(",")]
+    save_path = os.path.abspath(args.save) if args.save else None
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    # Модули ботов работают с относительным каталогом data/ - замеры идут во временном каталоге
+    workdir = tempfile.mkdtemp(prefix="benchmarks_")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        results = run_cases(names, sizes, args.repeat, args.min_time)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"environment": environment(), "results": results}
+    if save_path:
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        with open(save_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Базовая линия записана: {save_path}", file=sys.stderr)
+
+    if not compare_path:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    with open(compare_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline["results"], args.threshold)
+    print(json.dumps({"environment": report["environment"], "baseline_environment": baseline["environment"],
+                      "threshold": args.threshold, "comparison": rows}, ensure_ascii=False, indent=2))
+
+    slower = [row["case"] for row in rows if row["status"] == "slower"]
+    if slower:
+        print(f"Замедление больше {args.threshold:.0%}: {', '.join(slower)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
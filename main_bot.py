@@ -3,14 +3,30 @@ import logging
 import os
 
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from dotenv import load_dotenv
 
 from main_bot.handlers.start_handler import StartHandler
 from main_bot.handlers.loan_handlers import LoanHandlers
 from main_bot.handlers.callback_handlers import CallbackHandlers
-from main_bot.config.settings import setup_logging
-from shared.database import init_database
+from main_bot.config.settings import DB_FILE, LOGOS_DIR, setup_logging
+from main_bot.keyboards.screens import screens
+from main_bot.middlewares.concurrency import ChatEventIsolation, ConcurrencyLimitMiddleware
+from main_bot.middlewares.respond_first import RespondFirstMiddleware
+from main_bot.middlewares.update_recorder import UpdateRecorder
+from main_bot.utils.background_tasks import BackgroundTasks
+from main_bot.utils.bot_identity import BotIdentity
+from main_bot.utils.catalog_watcher import CatalogWatcher
+from main_bot.utils.diagnostics import DiagnosticsCommands
+from main_bot.utils.funnel import FunnelTracker, FunnelTrackingStorage
+from main_bot.utils.logo_cache import LogoFileIdCache
+from main_bot.utils.offer_display import OfferDisplay
+from shared.control_channel import ControlChannel, ControlListener
+from shared.database import init_database, warm_up_database
+from shared.loop_monitor import LoopLagMonitor
+from shared.resource_monitor import ResourceMonitor
+from shared.metrics import REGISTRY, MetricsServer, collect_catalog, collect_fsm_keys
+from shared.metrics_middleware import setup_metrics_middlewares
+from shared.offer_manager import OfferManager
 
 # Загружаем переменные окружения
 load_dotenv()
@@ -21,6 +37,13 @@ logger = logging.getLogger(__name__)
 
 # Конфигурация бота из переменных окружения
 BOT_TOKEN = os.getenv("MAIN_BOT_TOKEN")
+# Локальный эндпоинт /metrics (порт 0 - отключен)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("MAIN_BOT_METRICS_PORT", "9101"))
+# Запись обезличенных апдейтов для воспроизведения (main_bot.utils.update_replay)
+RECORD_UPDATES = os.getenv("RECORD_UPDATES", "0") == "1"
+# Предел одновременно обрабатываемых апдейтов (апдейты одного чата всегда идут по очереди)
+MAX_CONCURRENT_UPDATES = int(os.getenv("MAX_CONCURRENT_UPDATES", "64"))
 
 if not BOT_TOKEN or BOT_TOKEN == "YOUR_MAIN_BOT_TOKEN_HERE":
     logger.error("❌ Токен основного бота не найден в .env файле!")
@@ -33,15 +56,75 @@ class LoanBot:
 
     def __init__(self, token: str):
         self.bot = Bot(token=token)
-        self.dp = Dispatcher(storage=MemoryStorage())
+        # Воронка подбора: каждый set_state проходит через трекер переходов
+        self.funnel = FunnelTracker()
+        # Апдейты одного пользователя - последовательно: двойное нажатие не гоняет данные FSM
+        self.isolation = ChatEventIsolation()
+        self.concurrency = ConcurrencyLimitMiddleware(MAX_CONCURRENT_UPDATES)
+        self.dp = Dispatcher(storage=FunnelTrackingStorage(self.funnel), events_isolation=self.isolation)
+
+        # Фоновые задачи аналитики и профиля после ответа пользователю
+        self.background = BackgroundTasks()
+
+        # Статичные клавиатуры и тексты собираются один раз при старте
+        screens.build()
+
+        # Общие для всех обработчиков кэши: данные бота, каталог, file_id логотипов
+        self.identity = BotIdentity(self.bot)
+        self.offer_manager = OfferManager()
+        self.logo_cache = LogoFileIdCache()
+        self.offer_display = OfferDisplay(self.offer_manager, self.logo_cache)
+        # Изменения каталога из админки подтягиваются в фоне, без перечитывания всего каталога
+        self.catalog_watcher = CatalogWatcher(self.offer_manager)
 
         # Инициализация обработчиков
-        self.start_handler = StartHandler(self.bot)
-        self.loan_handlers = LoanHandlers(self.bot)
-        self.callback_handlers = CallbackHandlers(self.bot)
-
+        self.start_handler = StartHandler(self.bot, self.background, self.identity)
+        self.loan_handlers = LoanHandlers(self.bot, self.offer_manager)
+        self.callback_handlers = CallbackHandlers(self.bot, self.background, self.identity,
+                                                  self.offer_manager, self.offer_display)
+
+        # Метрики: /metrics на локальном порту
+        self.metrics_server = MetricsServer(METRICS_PORT, METRICS_HOST)
+        # Замер задержки цикла событий и стек блокирующего обработчика
+        self.loop_monitor = LoopLagMonitor()
+        REGISTRY.add_collector(collect_catalog(lambda: self.offer_manager.version,
+                                               lambda: self.offer_manager.offers_data.get('microloans', {})))
+        REGISTRY.add_collector(collect_fsm_keys(self.dp.storage))
+        REGISTRY.add_collector(self.funnel.collect)
+        REGISTRY.add_collector(self.isolation.collect)
+        REGISTRY.add_collector(self.concurrency.collect)
+        # Память, CPU, дескрипторы процесса и размеры файлов данных - для экрана состояния в админке
+        self.resources = ResourceMonitor(
+            files={"analytics.db": DB_FILE, "analytics.db-wal": f"{DB_FILE}-wal"},
+            directories={"logos": LOGOS_DIR}
+        )
+        REGISTRY.add_collector(self.resources.collect)
+
+        # Служебные команды из админки (профилирование, ресурсы, снимки памяти) через общий канал в data/control.db
+        self.control_listener = ControlListener(ControlChannel(), "main_bot")
+        self.diagnostics = DiagnosticsCommands(self.control_listener, self.resources, self.dp.storage)
+
+        self.recorder = UpdateRecorder("data/captures", salt=os.getenv("RECORD_SALT")) if RECORD_UPDATES else None
+
+        self.register_middlewares()
         self.register_handlers()
 
+    def register_middlewares(self):
+        """Регистрация middleware диспетчера"""
+        if self.recorder:
+            # Запись до блокировки чата в FSMContextMiddleware: в записи время прихода апдейта,
+            # а не время, когда подошла его очередь - иначе воспроизведение растягивает пачки нажатий
+            self.dp.update.outer_middleware.unregister(self.dp.fsm)
+            self.dp.update.outer_middleware(self.recorder)
+            self.dp.update.outer_middleware(self.dp.fsm)
+        # Счетчики апдейтов, латентность обработчиков и запросов к Bot API
+        setup_metrics_middlewares(self.dp, self.bot)
+        # После блокировки чата (FSMContextMiddleware): ожидающий своей очереди апдейт не занимает слот
+        self.dp.update.outer_middleware(self.concurrency)
+
+        # Мгновенный ответ на коллбеки до медленной работы с БД
+        self.dp.callback_query.middleware(RespondFirstMiddleware())
+
     def register_handlers(self):
         """Регистрация всех обработчиков"""
         self.start_handler.register_handlers(self.dp)
@@ -52,6 +135,16 @@ class LoanBot:
         """Настройка меню команд бота"""
         await self.start_handler.setup_bot_commands()
 
+    async def warm_up(self):
+        """Прогрев кэшей до первого апдейта, чтобы первые пользователи не ждали"""
+        await self.identity.load()
+        self.offer_display.sync()
+        self.logo_cache.load()
+        await warm_up_database()
+
+        logger.info(f"🔥 Прогрев завершен: каталог v{self.offer_manager.version}, "
+                    f"офферов {len(self.offer_manager.offers_data.get('microloans', {}))}")
+
     async def start_polling(self):
         """Запуск бота"""
         logger.info("🚀 Запуск основного бота для поиска микрозаймов")
@@ -59,6 +152,17 @@ class LoanBot:
         # Инициализация БД
         await init_database()
 
+        # Прогрев: данные бота, карточки офферов, file_id логотипов, БД
+        await self.warm_up()
+
+        # Отслеживание изменений каталога из админского бота
+        self.catalog_watcher.start()
+        await self.metrics_server.start()
+        self.loop_monitor.start()
+        self.control_listener.start()
+        self.funnel.start()
+        self.resources.start()
+
         # Настройка команд
         await self.setup_bot_commands()
 
@@ -79,6 +183,15 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Критическая ошибка бота: {e}")
     finally:
+        await bot.catalog_watcher.stop()
+        await bot.metrics_server.stop()
+        await bot.loop_monitor.stop()
+        await bot.control_listener.stop()
+        await bot.funnel.stop()
+        await bot.resources.stop()
+        if bot.recorder:
+            bot.recorder.close()
+        await bot.background.shutdown()
         await bot.bot.session.close()
         logger.info("🔄 Сессия бота закрыта")
 
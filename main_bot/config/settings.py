@@ -1,13 +1,25 @@
 import logging
 
+from shared.logging_setup import setup_queue_logging
+
 # Пути к файлам данных
 OFFERS_FILE = "data/offers.json"
+OFFERS_DB_FILE = "data/offers.db"
 DB_FILE = "data/analytics.db"
+LOGOS_DIR = "data/images/logos"
+LOGO_FILE_IDS_FILE = "data/logo_file_ids.json"
+CONTROL_DB_FILE = "data/control.db"
+PROFILES_DIR = "data/profiles"
+
+# Доля INFO-записей, попадающих в лог, для самых частых логгеров (записи на каждое действие пользователя)
+LOG_SAMPLE_RATES = {
+    "aiogram.event": 0.1,
+    "main_bot.utils.analytics.events": 0.1,
+    "main_bot.handlers.callback_handlers.events": 0.1,
+    "shared.user_profile_manager.events": 0.1
+}
 
 
 def setup_logging():
-    """Настройка логирования"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
\ No newline at end of file
+    """Настройка логирования: JSON-строки через очередь, вывод в отдельном потоке"""
+    setup_queue_logging(logging.INFO, sample_rates=LOG_SAMPLE_RATES)
\ No newline at end of file
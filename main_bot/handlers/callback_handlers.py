@@ -6,56 +6,72 @@ from aiogram.fsm.context import FSMContext
 
 from main_bot.states.loan_flow import LoanFlow
 from main_bot.keyboards.inline_keyboards import get_popular_offers_keyboard
+from main_bot.keyboards.screens import screens
 from main_bot.utils.analytics import AnalyticsTracker
+from main_bot.utils.background_tasks import BackgroundTasks
+from main_bot.utils.bot_identity import BotIdentity
 from main_bot.utils.offer_display import OfferDisplay
 from shared.offer_manager import OfferManager
 from shared.user_profile_manager import UserProfileManager
 
 logger = logging.getLogger(__name__)
+# Частые события каждого взаимодействия: в лог попадает выборка (LOG_SAMPLE_RATES)
+event_logger = logging.getLogger(f"{__name__}.events")
 
 
 class CallbackHandlers:
     """Обработчики всех коллбеков для максимальной конверсии"""
 
-    def __init__(self, bot: Bot):
+    def __init__(self, bot: Bot, background: BackgroundTasks, identity: BotIdentity,
+                 offer_manager: OfferManager, offer_display: OfferDisplay):
         self.bot = bot
-        self.offer_manager = OfferManager()
+        self.background = background
+        self.identity = identity
+        self.offer_manager = offer_manager
         self.analytics = AnalyticsTracker()
         self.profile_manager = UserProfileManager()
-        self.offer_display = OfferDisplay()
+        self.offer_display = offer_display
 
     def register_handlers(self, dp):
         """Регистрация обработчиков коллбеков"""
+        # Обработчики с флагом respond_first получают уже отвеченный коллбек
+        respond_first = {"respond_first": True}
+
         # Популярные предложения
         dp.callback_query.register(self.popular_offer_callback, F.data.startswith("popular_"))
-        dp.callback_query.register(self.back_to_popular_callback, F.data == "back_to_popular")
+        dp.callback_query.register(self.back_to_popular_callback, F.data == "back_to_popular",
+                                   flags=respond_first)
 
         # Быстрый поиск
-        dp.callback_query.register(self.quick_search_callback, F.data.startswith("quick_search_"))
+        dp.callback_query.register(self.quick_search_callback, F.data.startswith("quick_search_"),
+                                   flags={"respond_first": {"text": "Ускоряем поиск для вас!"}})
 
         # FSM флоу выбора параметров
+        # Страна и возраст отвечают сами: текст ответа зависит от ветки (редактирование профиля или флоу)
         dp.callback_query.register(self.country_callback, F.data.startswith("country_"))
         dp.callback_query.register(self.age_callback, F.data.startswith("age_"))
-        dp.callback_query.register(self.amount_callback, F.data.startswith("amount_"))
-        dp.callback_query.register(self.term_callback, F.data.startswith("term_"))
-        dp.callback_query.register(self.payment_callback, F.data.startswith("payment_"))
-        dp.callback_query.register(self.zero_percent_callback, F.data.startswith("zero_"))
+        dp.callback_query.register(self.amount_callback, F.data.startswith("amount_"), flags=respond_first)
+        dp.callback_query.register(self.term_callback, F.data.startswith("term_"), flags=respond_first)
+        dp.callback_query.register(self.payment_callback, F.data.startswith("payment_"), flags=respond_first)
+        dp.callback_query.register(self.zero_percent_callback, F.data.startswith("zero_"), flags=respond_first)
 
         # Просмотр офферов
         dp.callback_query.register(self.get_loan_callback, F.data.startswith("get_loan_"))
-        dp.callback_query.register(self.next_offer_callback, F.data == "next_offer")
-        dp.callback_query.register(self.prev_offer_callback, F.data == "prev_offer")
+        dp.callback_query.register(self.next_offer_callback, F.data == "next_offer", flags=respond_first)
+        dp.callback_query.register(self.prev_offer_callback, F.data == "prev_offer", flags=respond_first)
         dp.callback_query.register(self.back_to_offers_callback, F.data == "back_to_offers")
-        dp.callback_query.register(self.change_params_callback, F.data == "change_params")
+        dp.callback_query.register(self.change_params_callback, F.data == "change_params",
+                                   flags={"respond_first": {"text": "Изменяем условия поиска!"}})
 
         # Дополнительные коллбеки
-        dp.callback_query.register(self.share_bot_from_offer_callback, F.data == "share_bot")
+        dp.callback_query.register(self.share_bot_from_offer_callback, F.data == "share_bot", flags=respond_first)
 
         # Настройки профиля
-        dp.callback_query.register(self.change_profile_settings_callback, F.data == "change_profile_settings")
-        dp.callback_query.register(self.edit_country_callback, F.data == "edit_country")
-        dp.callback_query.register(self.edit_age_callback, F.data == "edit_age")
-        dp.callback_query.register(self.back_to_main_callback, F.data == "back_to_main")
+        dp.callback_query.register(self.change_profile_settings_callback, F.data == "change_profile_settings",
+                                   flags=respond_first)
+        dp.callback_query.register(self.edit_country_callback, F.data == "edit_country", flags=respond_first)
+        dp.callback_query.register(self.edit_age_callback, F.data == "edit_age", flags=respond_first)
+        dp.callback_query.register(self.back_to_main_callback, F.data == "back_to_main", flags=respond_first)
 
     async def edit_message_with_keyboard(self, message, text: str,
                                          inline_keyboard: InlineKeyboardMarkup = None, parse_mode: str = "HTML"):
@@ -71,18 +87,8 @@ class CallbackHandlers:
 
     async def back_to_popular_callback(self, callback: CallbackQuery, state: FSMContext):
         """Возврат к популярным предложениям"""
-        popular_text = (
-            "🔥 <b>ПОПУЛЯРНЫЕ ПРЕДЛОЖЕНИЯ</b>\n\n"
-            "💰 <b>Топ займы с максимальным одобрением!</b>\n"
-            "⚡ Деньги на карту за 5 минут\n"
-            "✅ Одобряем 95% заявок\n"
-            "🆓 0% для новых клиентов\n\n"
-            "🎯 <b>Выберите что вас интересует:</b>"
-        )
-
         keyboard = get_popular_offers_keyboard()
-        await callback.message.edit_text(popular_text, reply_markup=keyboard, parse_mode="HTML")
-        await callback.answer()
+        await callback.message.edit_text(screens.text("popular"), reply_markup=keyboard, parse_mode="HTML")
 
     async def popular_offer_callback(self, callback: CallbackQuery, state: FSMContext):
         """Обработчик популярных предложений с предустановленными критериями"""
@@ -135,7 +141,7 @@ class CallbackHandlers:
         # Удаляем сообщение с популярными предложениями
         try:
             await callback.message.delete()
-            logger.info(f"Удалено сообщение с популярными предложениями: {callback.message.message_id}")
+            event_logger.info(f"Удалено сообщение с популярными предложениями: {callback.message.message_id}")
         except Exception as e:
             logger.error(f"Не удалось удалить сообщение с популярными: {e}")
 
@@ -145,16 +151,17 @@ class CallbackHandlers:
             current_offer_index=0
         )
 
+        await callback.answer(f"Найдено {len(offers)} популярных предложений!")
+
         # Трекинг показанного оффера
         if session_id:
-            await self.analytics.track_offers_shown(session_id, [offers[0]['id']])
+            self.background.spawn(self.analytics.track_offers_shown(session_id, [offers[0]['id']]),
+                                  name="track_offers_shown")
 
         # Показываем первый оффер
         await self.show_single_offer(callback.message, state, offers[0], 0, len(offers))
         await state.set_state(LoanFlow.viewing_offers)
 
-        await callback.answer(f"Найдено {len(offers)} популярных предложений!")
-
     async def quick_search_callback(self, callback: CallbackQuery, state: FSMContext):
         """Быстрый поиск для возвращающихся пользователей"""
         parts = callback.data.split("_")
@@ -162,29 +169,32 @@ class CallbackHandlers:
         age = int(parts[3])
 
         await state.update_data(country=country, age=age)
-        await self.profile_manager.increment_sessions(callback.from_user.id)
+        self.background.spawn(self.profile_manager.increment_sessions(callback.from_user.id),
+                              name="increment_sessions")
 
         # Переходим сразу к выбору суммы
-        text = "💰 <b>Выберите СУММУ займа</b>"
+        text = screens.text("choose_amount")
         keyboard = self._get_amount_keyboard(country)
 
         await self.edit_message_with_keyboard(callback.message, text, keyboard)
         await state.set_state(LoanFlow.choosing_amount)
-        await callback.answer("Ускоряем поиск для вас!")
 
     async def country_callback(self, callback: CallbackQuery, state: FSMContext):
         """Выбор страны"""
         country = callback.data.split("_")[1]
         await state.update_data(country=country)
 
-        await self.profile_manager.update_profile_preferences(
-            callback.from_user.id,
-            country=country
+        self.background.spawn(
+            self.profile_manager.update_profile_preferences(callback.from_user.id, country=country),
+            name="update_profile_preferences"
         )
 
         # Проверяем, откуда пришел пользователь
         user_data = await state.get_data()
-        if user_data.get('user_profile'):
+        is_profile_edit = bool(user_data.get('user_profile'))
+        await callback.answer("Страна обновлена!" if is_profile_edit else None)
+
+        if is_profile_edit:
             # Это редактирование профиля
             success_text = (
                 f"✅ <b>Страна обновлена!</b>\n\n"
@@ -192,43 +202,34 @@ class CallbackHandlers:
                 "Настройки сохранены в вашем профиле."
             )
 
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="⚙️ К настройкам профиля", callback_data="change_profile_settings")],
-                [InlineKeyboardButton(text="🏠 В главное меню", callback_data="back_to_main")]
-            ])
+            keyboard = screens.keyboard("profile_updated")
 
             await self.edit_message_with_keyboard(callback.message, success_text, keyboard)
-            await callback.answer("Страна обновлена!")
             return
 
         # Обычный флоу - продолжаем к выбору возраста
-        country_name = "🇷🇺 России" if country == "russia" else "🇰🇿 Казахстане"
-        text = f"Отлично! Подбираем займы в {country_name}\n\n👤 Укажите ваш возраст:"
-
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="18-25 лет", callback_data="age_22")],
-            [InlineKeyboardButton(text="26-35 лет", callback_data="age_30")],
-            [InlineKeyboardButton(text="36-50 лет", callback_data="age_43")],
-            [InlineKeyboardButton(text="51+ лет", callback_data="age_60")]
-        ])
+        text = screens.text("choose_age", country=country)
+        keyboard = screens.keyboard("age")
 
         await self.edit_message_with_keyboard(callback.message, text, keyboard)
         await state.set_state(LoanFlow.choosing_age)
-        await callback.answer()
 
     async def age_callback(self, callback: CallbackQuery, state: FSMContext):
         """Выбор возраста"""
         age = int(callback.data.split("_")[1])
         await state.update_data(age=age)
 
-        await self.profile_manager.update_profile_preferences(
-            callback.from_user.id,
-            age=age
+        self.background.spawn(
+            self.profile_manager.update_profile_preferences(callback.from_user.id, age=age),
+            name="update_profile_preferences"
         )
 
         # Проверяем, откуда пришел пользователь
         user_data = await state.get_data()
-        if user_data.get('user_profile') and not user_data.get('session_id'):
+        is_profile_edit = bool(user_data.get('user_profile') and not user_data.get('session_id'))
+        await callback.answer("Возраст обновлен!" if is_profile_edit else None)
+
+        if is_profile_edit:
             # Это редактирование профиля
             success_text = (
                 f"✅ <b>Возраст обновлен!</b>\n\n"
@@ -236,13 +237,9 @@ class CallbackHandlers:
                 "Настройки сохранены в вашем профиле."
             )
 
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="⚙️ К настройкам профиля", callback_data="change_profile_settings")],
-                [InlineKeyboardButton(text="🏠 В главное меню", callback_data="back_to_main")]
-            ])
+            keyboard = screens.keyboard("profile_updated")
 
             await self.edit_message_with_keyboard(callback.message, success_text, keyboard)
-            await callback.answer("Возраст обновлен!")
             return
 
         # Обычный флоу - создаем сессию и продолжаем
@@ -253,12 +250,11 @@ class CallbackHandlers:
         )
         await state.update_data(session_id=session_id)
 
-        text = "💰 <b>Выберите СУММУ займа</b>"
+        text = screens.text("choose_amount")
         keyboard = self._get_amount_keyboard(user_data.get('country'))
 
         await self.edit_message_with_keyboard(callback.message, text, keyboard)
         await state.set_state(LoanFlow.choosing_amount)
-        await callback.answer()
 
     async def amount_callback(self, callback: CallbackQuery, state: FSMContext):
         """Выбор суммы займа"""
@@ -269,63 +265,36 @@ class CallbackHandlers:
         user_data = await state.get_data()
         session_id = user_data.get('session_id')
         if session_id:
-            await self.analytics.track_session_parameters(session_id, amount)
+            self.background.spawn(self.analytics.track_session_parameters(session_id, amount),
+                                  name="track_session_parameters")
 
-        text = "📅 <b>Выбери СРОК займа</b>"
-
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [
-                InlineKeyboardButton(text="7 дней", callback_data="term_7"),
-                InlineKeyboardButton(text="14 дней", callback_data="term_14")
-            ],
-            [
-                InlineKeyboardButton(text="21 день", callback_data="term_21"),
-                InlineKeyboardButton(text="30 дней", callback_data="term_30")
-            ]
-        ])
+        text = screens.text("choose_term")
+        keyboard = screens.keyboard("term")
 
         await self.edit_message_with_keyboard(callback.message, text, keyboard)
         await state.set_state(LoanFlow.choosing_term)
-        await callback.answer()
 
     async def term_callback(self, callback: CallbackQuery, state: FSMContext):
         """Выбор срока займа"""
         term = int(callback.data.split("_")[1])
         await state.update_data(term=term)
 
-        text = (
-            "💳 <b>Как хотите получить деньги?</b>\n\n"
-            "Выберите удобный способ получения займа:"
-        )
-
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="💳 На банковскую карту", callback_data="payment_card")],
-            [InlineKeyboardButton(text="📱 QIWI кошелек", callback_data="payment_qiwi")],
-            [InlineKeyboardButton(text="🟡 Яндекс.Деньги", callback_data="payment_yandex")],
-            [InlineKeyboardButton(text="🏦 На счет в банке", callback_data="payment_bank")],
-            [InlineKeyboardButton(text="💵 Наличные", callback_data="payment_cash")],
-            [InlineKeyboardButton(text="📞 Через систему контакт", callback_data="payment_contact")]
-        ])
+        text = screens.text("choose_payment")
+        keyboard = screens.keyboard("payment")
 
         await self.edit_message_with_keyboard(callback.message, text, keyboard)
         await state.set_state(LoanFlow.choosing_payment)
-        await callback.answer()
 
     async def payment_callback(self, callback: CallbackQuery, state: FSMContext):
         """Выбор способа получения"""
         payment_method = callback.data.split("_")[1]
         await state.update_data(payment_method=payment_method)
 
-        text = "💳 <b>Выбери ПРОЦЕНТ займа</b>"
-
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="✅ Только 0%", callback_data="zero_true")],
-            [InlineKeyboardButton(text="💰 Любые варианты", callback_data="zero_false")]
-        ])
+        text = screens.text("choose_zero")
+        keyboard = screens.keyboard("zero")
 
         await self.edit_message_with_keyboard(callback.message, text, keyboard)
         await state.set_state(LoanFlow.choosing_zero_percent)
-        await callback.answer()
 
     async def zero_percent_callback(self, callback: CallbackQuery, state: FSMContext):
         """Выбор 0% или любые варианты с показом результатов"""
@@ -339,22 +308,16 @@ class CallbackHandlers:
         offers = self.offer_manager.get_filtered_offers(user_data)
 
         if not offers:
-            text = (
-                "😔 К сожалению, по вашим критериям нет доступных предложений.\n\n"
-                "Попробуйте изменить параметры поиска:"
-            )
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="🔄 Изменить параметры", callback_data="change_params")]
-            ])
+            text = screens.text("no_offers")
+            keyboard = screens.keyboard("no_offers")
 
             await self.edit_message_with_keyboard(callback.message, text, keyboard)
-            await callback.answer()
             return
 
         # Удаляем сообщение "Выбери ПРОЦЕНТ займа" перед показом офферов
         try:
             await callback.message.delete()
-            logger.info(f"Удалено сообщение с выбором процента: {callback.message.message_id}")
+            event_logger.info(f"Удалено сообщение с выбором процента: {callback.message.message_id}")
         except Exception as e:
             logger.error(f"Не удалось удалить сообщение с выбором процента: {e}")
 
@@ -367,12 +330,12 @@ class CallbackHandlers:
         # Трекинг показанных офферов
         session_id = user_data.get('session_id')
         if session_id:
-            await self.analytics.track_offers_shown(session_id, [offers[0]['id']])
+            self.background.spawn(self.analytics.track_offers_shown(session_id, [offers[0]['id']]),
+                                  name="track_offers_shown")
 
         # Показываем первый оффер
         await self.show_single_offer(callback.message, state, offers[0], 0, len(offers))
         await state.set_state(LoanFlow.viewing_offers)
-        await callback.answer()
 
     async def show_single_offer(self, message, state: FSMContext, offer: Dict, index: int, total: int):
         """Показ одного оффера с логотипом"""
@@ -410,41 +373,32 @@ class CallbackHandlers:
         user_id = callback.from_user.id
         personalized_link = partner_link.replace('{user_id}', str(user_id))
 
+        # Отвечаем сразу после проверок в памяти, запись в БД идет в фоне
+        await callback.answer("Переходим к оформлению займа!")
+
         # Трекинг клика по ссылке - ГЛАВНАЯ МЕТРИКА!
         session_id = user_data.get('session_id')
-        await self.analytics.track_link_click(user_id, session_id, offer_id, country)
+        self.background.spawn(self.analytics.track_link_click(user_id, session_id, offer_id, country),
+                              name="track_link_click")
 
         # Увеличиваем счетчик кликов в профиле
-        await self.profile_manager.increment_clicks(callback.from_user.id)
+        self.background.spawn(self.profile_manager.increment_clicks(user_id), name="increment_clicks")
 
         # Создаем кнопку с прямой ссылкой
         try:
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="🚀 ПОЛУЧИТЬ ДЕНЬГИ СЕЙЧАС!", url=personalized_link)],
-                [InlineKeyboardButton(text="🔙 Посмотреть другие варианты", callback_data="back_to_offers")],
-                [InlineKeyboardButton(text="🚀 Поделиться ботом", callback_data="share_bot")]
-            ])
-
-            # Простое сообщение об успешном выборе
-            currency = "₸" if country == "kazakhstan" else "₽"
-
-            success_text = (
-                f"✅ <b>Отличный выбор!</b>\n\n"
-                f"🏦 {selected_offer.get('name')}\n"
-                f"💰 {user_data.get('amount', 0):,}{currency} на {user_data.get('term', 0)} дней\n\n"
-                f"👆 <b>Нажмите кнопку для оформления займа</b>"
-            )
+            # Экран перехода берется из готовой карточки оффера
+            card = self.offer_display.get_card(selected_offer, country)
+            keyboard = card.success_keyboard(personalized_link)
+            success_text = card.success_text(user_data.get('amount', 0), user_data.get('term', 0))
 
             await self.edit_message_with_keyboard(callback.message, success_text, keyboard)
 
             # Логируем клик
             logger.info(f"КЛИК ПО ССЫЛКЕ: user_id={user_id}, offer_id={offer_id}, country={country}")
 
-            await callback.answer("Переходим к оформлению займа!")
-
         except Exception as e:
             logger.error(f"Ошибка создания ссылки: {e}")
-            await callback.answer("Ошибка перехода", show_alert=True)
+            await callback.message.answer("❌ Ошибка перехода, попробуйте еще раз")
 
     async def next_offer_callback(self, callback: CallbackQuery, state: FSMContext):
         """Показать следующий оффер"""
@@ -459,10 +413,10 @@ class CallbackHandlers:
         # Трекинг просмотра нового оффера
         session_id = user_data.get('session_id')
         if session_id:
-            await self.analytics.track_offers_shown(session_id, [offers[new_index]['id']])
+            self.background.spawn(self.analytics.track_offers_shown(session_id, [offers[new_index]['id']]),
+                                  name="track_offers_shown")
 
         await self.show_single_offer(callback.message, state, offers[new_index], new_index, len(offers))
-        await callback.answer()
 
     async def prev_offer_callback(self, callback: CallbackQuery, state: FSMContext):
         """Показать предыдущий оффер"""
@@ -475,7 +429,6 @@ class CallbackHandlers:
         await state.update_data(current_offer_index=new_index)
 
         await self.show_single_offer(callback.message, state, offers[new_index], new_index, len(offers))
-        await callback.answer()
 
     async def back_to_offers_callback(self, callback: CallbackQuery, state: FSMContext):
         """Возврат к просмотру офферов"""
@@ -499,14 +452,14 @@ class CallbackHandlers:
         if last_message_id:
             try:
                 await callback.message.bot.delete_message(callback.message.chat.id, last_message_id)
-                logger.info(f"Удалено предыдущее сообщение с офером: {last_message_id}")
+                event_logger.info(f"Удалено предыдущее сообщение с офером: {last_message_id}")
             except Exception as e:
                 logger.error(f"Не удалось удалить предыдущее сообщение с офером: {e}")
 
         # Удаляем текущее сообщение с оффером
         try:
             await callback.message.delete()
-            logger.info(f"Удалено текущее сообщение с офером: {callback.message.message_id}")
+            event_logger.info(f"Удалено текущее сообщение с офером: {callback.message.message_id}")
         except Exception as e:
             logger.error(f"Не удалось удалить текущее сообщение с офером: {e}")
 
@@ -536,7 +489,7 @@ class CallbackHandlers:
             await state.update_data(session_id=session_id)
 
             # Сразу переходим к выбору суммы
-            text = "🔄 <b>Изменяем условия займа</b>\n\n💰 <b>Выберите СУММУ займа</b>"
+            text = f"🔄 <b>Изменяем условия займа</b>\n\n{screens.text('choose_amount')}"
             keyboard = self._get_amount_keyboard(profile.country)
             await state.set_state(LoanFlow.choosing_amount)
 
@@ -550,10 +503,7 @@ class CallbackHandlers:
                 "🆓 0% для новых клиентов"
             )
 
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="🇷🇺 Россия", callback_data="country_russia")],
-                [InlineKeyboardButton(text="🇰🇿 Казахстан", callback_data="country_kazakhstan")]
-            ])
+            keyboard = screens.keyboard("country")
 
             await state.set_state(LoanFlow.choosing_country)
             text = welcome_text
@@ -566,8 +516,6 @@ class CallbackHandlers:
             parse_mode="HTML"
         )
 
-        await callback.answer("Изменяем условия поиска!")
-
     async def change_profile_settings_callback(self, callback: CallbackQuery, state: FSMContext):
         """Изменение настроек профиля"""
         user_data = await state.get_data()
@@ -581,42 +529,23 @@ class CallbackHandlers:
             "Что хотите изменить?"
         )
 
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="🌍 Изменить страну", callback_data="edit_country")],
-            [InlineKeyboardButton(text="🎂 Изменить возраст", callback_data="edit_age")],
-            [InlineKeyboardButton(text="🔙 Вернуться назад", callback_data="back_to_main")]
-        ])
+        keyboard = screens.keyboard("profile_settings")
 
         await self.edit_message_with_keyboard(callback.message, settings_text, keyboard)
-        await callback.answer()
 
     async def edit_country_callback(self, callback: CallbackQuery, state: FSMContext):
         """Редактирование страны в профиле"""
-        text = "🌍 <b>Выберите вашу страну:</b>"
-
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="🇷🇺 Россия", callback_data="country_russia")],
-            [InlineKeyboardButton(text="🇰🇿 Казахстан", callback_data="country_kazakhstan")],
-            [InlineKeyboardButton(text="🔙 Назад к настройкам", callback_data="change_profile_settings")]
-        ])
+        text = screens.text("edit_country")
+        keyboard = screens.keyboard("edit_country")
 
         await self.edit_message_with_keyboard(callback.message, text, keyboard)
-        await callback.answer()
 
     async def edit_age_callback(self, callback: CallbackQuery, state: FSMContext):
         """Редактирование возраста в профиле"""
-        text = "🎂 <b>Выберите ваш возраст:</b>"
-
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="18-25 лет", callback_data="age_22")],
-            [InlineKeyboardButton(text="26-35 лет", callback_data="age_30")],
-            [InlineKeyboardButton(text="36-50 лет", callback_data="age_43")],
-            [InlineKeyboardButton(text="51+ лет", callback_data="age_60")],
-            [InlineKeyboardButton(text="🔙 Назад к настройкам", callback_data="change_profile_settings")]
-        ])
+        text = screens.text("edit_age")
+        keyboard = screens.keyboard("edit_age")
 
         await self.edit_message_with_keyboard(callback.message, text, keyboard)
-        await callback.answer()
 
     async def back_to_main_callback(self, callback: CallbackQuery, state: FSMContext):
         """Возврат к главному меню"""
@@ -629,38 +558,15 @@ class CallbackHandlers:
         await state.update_data(user_profile=profile.__dict__)
 
         if profile.country and profile.age:
-            country_name = "🇷🇺 России" if profile.country == "russia" else "🇰🇿 Казахстане"
-
-            welcome_text = (
-                f"👋 <b>С возвращением, {profile.first_name}!</b>\n\n"
-                f"📍 Ваши настройки:\n"
-                f"🌍 Страна: {country_name}\n"
-                f"👤 Возраст: {profile.age} лет\n\n"
-                f"💰 Найти займы с этими настройками?"
+            welcome_text = screens.text(
+                "welcome_returning", first_name=profile.first_name, country=profile.country, age=profile.age
             )
-
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="💰 ДА, НАЙТИ ЗАЙМЫ!",
-                                      callback_data=f"quick_search_{profile.country}_{profile.age}")],
-                [InlineKeyboardButton(text="⚙️ Изменить настройки", callback_data="change_profile_settings")]
-            ])
+            keyboard = screens.quick_search_keyboard(profile.country, profile.age)
         else:
-            welcome_text = (
-                "🚀 <b>Найдем выгодный займ за 30 секунд!</b>\n\n"
-                "💰 Займы до 500,000₸ / 50,000₽ на карту за 5 минут\n"
-                "✅ Одобряем даже с плохой КИ\n"
-                "🆓 0% для новых клиентов\n"
-                "⚡ Без справок и поручителей\n\n"
-                "Сначала настроим ваш профиль:"
-            )
-
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="🇷🇺 Россия", callback_data="country_russia")],
-                [InlineKeyboardButton(text="🇰🇿 Казахстан", callback_data="country_kazakhstan")]
-            ])
+            welcome_text = screens.text("welcome_new")
+            keyboard = screens.keyboard("country")
 
         await self.edit_message_with_keyboard(callback.message, welcome_text, keyboard)
-        await callback.answer()
 
     # Вспомогательные методы
     def _get_popular_offer_criteria(self, offer_type: str, profile) -> dict:
@@ -754,41 +660,11 @@ class CallbackHandlers:
 
     def _get_amount_keyboard(self, country: str) -> InlineKeyboardMarkup:
         """Получение клавиатуры выбора суммы в зависимости от страны"""
-        if country == "kazakhstan":
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [
-                    InlineKeyboardButton(text="50,000₸ и менее", callback_data="amount_50000"),
-                    InlineKeyboardButton(text="100,000₸", callback_data="amount_100000")
-                ],
-                [
-                    InlineKeyboardButton(text="150,000₸", callback_data="amount_150000"),
-                    InlineKeyboardButton(text="250,000₸", callback_data="amount_250000")
-                ],
-                [
-                    InlineKeyboardButton(text="500,000₸ и более", callback_data="amount_500000")
-                ]
-            ])
-        else:
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [
-                    InlineKeyboardButton(text="5,000₽ и менее", callback_data="amount_5000"),
-                    InlineKeyboardButton(text="10,000₽", callback_data="amount_10000")
-                ],
-                [
-                    InlineKeyboardButton(text="15,000₽", callback_data="amount_15000"),
-                    InlineKeyboardButton(text="25,000₽", callback_data="amount_25000")
-                ],
-                [
-                    InlineKeyboardButton(text="50,000₽ и более", callback_data="amount_50000")
-                ]
-            ])
-
-        return keyboard
+        return screens.keyboard("amount", "kazakhstan" if country == "kazakhstan" else "russia")
 
     async def share_bot_from_offer_callback(self, callback: CallbackQuery, state: FSMContext):
         """Callback для поделиться ботом из контекста оффера"""
-        bot_username = (await self.bot.get_me()).username
-        share_url = f"https://t.me/{bot_username}"
+        share_url = await self.identity.share_url()
 
         share_text = (
             "🚀 <b>Поделитесь ботом с друзьями!</b>\n\n"
@@ -807,5 +683,4 @@ class CallbackHandlers:
             [InlineKeyboardButton(text="🔙 Назад к предложениям", callback_data="back_to_offers")]
         ])
 
-        await self.edit_message_with_keyboard(callback.message, share_text, keyboard)
-        await callback.answer()
\ No newline at end of file
+        await self.edit_message_with_keyboard(callback.message, share_text, keyboard)
\ No newline at end of file
@@ -1,10 +1,11 @@
 import logging
 from aiogram import Bot, F
-from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 
 from main_bot.states.loan_flow import LoanFlow
 from main_bot.keyboards.inline_keyboards import get_popular_offers_keyboard
+from main_bot.keyboards.screens import screens
 from main_bot.utils.analytics import AnalyticsTracker
 from shared.offer_manager import OfferManager
 from shared.user_profile_manager import UserProfileManager
@@ -15,9 +16,9 @@ logger = logging.getLogger(__name__)
 class LoanHandlers:
     """Обработчики поиска займов"""
 
-    def __init__(self, bot: Bot):
+    def __init__(self, bot: Bot, offer_manager: OfferManager):
         self.bot = bot
-        self.offer_manager = OfferManager()
+        self.offer_manager = offer_manager
         self.analytics = AnalyticsTracker()
         self.profile_manager = UserProfileManager()
 
@@ -28,13 +29,8 @@ class LoanHandlers:
 
     async def handle_popular_offers_button(self, message: Message):
         """Обработчик кнопки популярных предложений - МАКСИМАЛЬНАЯ КОНВЕРСИЯ"""
-        popular_text = (
-            "🔥 <b>ПОПУЛЯРНЫЕ ЗАЙМЫ</b>\n\n"
-            "Выберите подходящий вариант для быстрого получения денег:"
-        )
-
         keyboard = get_popular_offers_keyboard()
-        await message.answer(popular_text, reply_markup=keyboard, parse_mode="HTML")
+        await message.answer(screens.text("popular_short"), reply_markup=keyboard, parse_mode="HTML")
 
     async def handle_find_loan_button(self, message: Message, state: FSMContext):
         """Обработчик кнопки поиска займа"""
@@ -50,37 +46,15 @@ class LoanHandlers:
         # Проверяем, есть ли сохраненные данные профиля
         if profile.country and profile.age:
             # ВОЗВРАЩАЮЩИЙСЯ ПОЛЬЗОВАТЕЛЬ - быстрый поиск
-            country_name = "🇷🇺 России" if profile.country == "russia" else "🇰🇿 Казахстане"
-
-            welcome_text = (
-                f"💰 <b>Найдем займ с вашими настройками!</b>\n\n"
-                f"📍 Ваши настройки:\n"
-                f"🌍 Страна: {country_name}\n"
-                f"👤 Возраст: {profile.age} лет\n\n"
-                f"💰 Найти займы с этими настройками?"
+            welcome_text = screens.text(
+                "find_loan_returning", first_name=profile.first_name, country=profile.country, age=profile.age
             )
-
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="💰 ДА, НАЙТИ ЗАЙМЫ!",
-                                      callback_data=f"quick_search_{profile.country}_{profile.age}")],
-                [InlineKeyboardButton(text="⚙️ Изменить настройки", callback_data="change_profile_settings")]
-            ])
+            keyboard = screens.quick_search_keyboard(profile.country, profile.age)
 
         else:
             # НОВЫЙ ПОЛЬЗОВАТЕЛЬ - настройка профиля
-            welcome_text = (
-                "🚀 <b>Найдем выгодный займ за 30 секунд!</b>\n\n"
-                "💰 Займы до 500,000₸ / 50,000₽ на карту за 5 минут\n"
-                "✅ Одобряем даже с плохой КИ\n"
-                "🆓 0% для новых клиентов\n"
-                "⚡ Без справок и поручителей\n\n"
-                "Сначала настроим ваш профиль:"
-            )
-
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="🇷🇺 Россия", callback_data="country_russia")],
-                [InlineKeyboardButton(text="🇰🇿 Казахстан", callback_data="country_kazakhstan")]
-            ])
+            welcome_text = screens.text("welcome_new")
+            keyboard = screens.keyboard("country")
 
             await state.set_state(LoanFlow.choosing_country)
 
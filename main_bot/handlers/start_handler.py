@@ -6,7 +6,10 @@ from aiogram.fsm.context import FSMContext
 
 from main_bot.states.loan_flow import LoanFlow
 from main_bot.keyboards.reply_keyboards import get_main_keyboard
+from main_bot.keyboards.screens import screens
 from main_bot.utils.analytics import AnalyticsTracker
+from main_bot.utils.background_tasks import BackgroundTasks
+from main_bot.utils.bot_identity import BotIdentity
 from shared.user_profile_manager import UserProfileManager
 
 logger = logging.getLogger(__name__)
@@ -15,8 +18,10 @@ logger = logging.getLogger(__name__)
 class StartHandler:
     """Обработчик команд запуска и настроек"""
 
-    def __init__(self, bot: Bot):
+    def __init__(self, bot: Bot, background: BackgroundTasks, identity: BotIdentity):
         self.bot = bot
+        self.background = background
+        self.identity = identity
         self.analytics = AnalyticsTracker()
         self.profile_manager = UserProfileManager()
 
@@ -41,15 +46,20 @@ class StartHandler:
         dp.message.register(self.handle_settings_button, F.text == "⚙️ Настройки профиля")
         dp.message.register(self.handle_share_button, F.text == "🚀 Поделиться ботом")
 
+        # Обработчики с флагом respond_first получают уже отвеченный коллбек
+        respond_first = {"respond_first": True}
+
         # Коллбеки для настроек профиля
-        dp.callback_query.register(self.confirm_clear_profile_callback, F.data == "confirm_clear_profile")
+        dp.callback_query.register(self.confirm_clear_profile_callback, F.data == "confirm_clear_profile",
+                                   flags=respond_first)
         dp.callback_query.register(self.execute_clear_profile_callback, F.data == "execute_clear_profile")
-        dp.callback_query.register(self.share_bot_callback, F.data == "share_bot")
-        dp.callback_query.register(self.back_to_main_callback, F.data == "back_to_main")
+        dp.callback_query.register(self.share_bot_callback, F.data == "share_bot", flags=respond_first)
+        dp.callback_query.register(self.back_to_main_callback, F.data == "back_to_main", flags=respond_first)
 
         # Базовые коллбеки для начального флоу (если CallbackHandlers не подхватил)
-        dp.callback_query.register(self.country_callback, F.data.startswith("country_"))
-        dp.callback_query.register(self.age_callback, F.data.startswith("age_"))
+        dp.callback_query.register(self.country_callback, F.data.startswith("country_"), flags=respond_first)
+        dp.callback_query.register(self.age_callback, F.data.startswith("age_"),
+                                   flags={"respond_first": {"text": "Профиль настроен!"}})
 
     async def cmd_start(self, message: Message, state: FSMContext):
         """Команда /start - максимальная конверсия с первой секунды"""
@@ -75,37 +85,15 @@ class StartHandler:
         # Проверяем, есть ли сохраненные предпочтения
         if profile.country and profile.age:
             # ВОЗВРАЩАЮЩИЙСЯ ПОЛЬЗОВАТЕЛЬ с сохраненными настройками
-            country_name = "🇷🇺 России" if profile.country == "russia" else "🇰🇿 Казахстане"
-
-            welcome_text = (
-                f"👋 <b>С возвращением, {profile.first_name}!</b>\n\n"
-                f"📍 Ваши настройки:\n"
-                f"🌍 Страна: {country_name}\n"
-                f"👤 Возраст: {profile.age} лет\n\n"
-                f"💰 Найти займы с этими настройками?"
+            welcome_text = screens.text(
+                "welcome_returning", first_name=profile.first_name, country=profile.country, age=profile.age
             )
-
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="💰 ДА, НАЙТИ ЗАЙМЫ!",
-                                      callback_data=f"quick_search_{profile.country}_{profile.age}")],
-                [InlineKeyboardButton(text="⚙️ Изменить настройки", callback_data="change_profile_settings")]
-            ])
+            keyboard = screens.quick_search_keyboard(profile.country, profile.age)
 
         else:
             # НОВЫЙ ПОЛЬЗОВАТЕЛЬ
-            welcome_text = (
-                f"🎉 <b>Добро пожаловать, {message.from_user.first_name or 'друг'}!</b>\n\n"
-                "💰 Найдём вам <b>займ до 500 000 ₽</b> за 5 минут!\n\n"
-                "✅ Без отказов и справок\n"
-                "✅ Плохая КИ? Не проблема!\n"
-                "✅ Деньги на карту или наличными\n\n"
-                "Сначала настроим ваш профиль:"
-            )
-
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="🇷🇺 Россия", callback_data="country_russia")],
-                [InlineKeyboardButton(text="🇰🇿 Казахстан", callback_data="country_kazakhstan")]
-            ])
+            welcome_text = screens.text("welcome_start", first_name=message.from_user.first_name or 'друг')
+            keyboard = screens.keyboard("country")
 
             await state.set_state(LoanFlow.choosing_country)
 
@@ -212,7 +200,6 @@ class StartHandler:
     async def back_to_main_callback(self, callback: CallbackQuery):
         """Возврат к главному меню"""
         await callback.message.delete()
-        await callback.answer()
 
     async def confirm_clear_profile_callback(self, callback: CallbackQuery, state: FSMContext):
         """Подтверждение очистки профиля через inline кнопку"""
@@ -233,7 +220,6 @@ class StartHandler:
         ])
 
         await callback.message.edit_text(confirm_text, reply_markup=keyboard, parse_mode="HTML")
-        await callback.answer()
 
     async def execute_clear_profile_callback(self, callback: CallbackQuery, state: FSMContext):
         """Выполнение очистки профиля после подтверждения"""
@@ -258,8 +244,7 @@ class StartHandler:
 
     async def share_bot_callback(self, callback: CallbackQuery):
         """Callback для кнопки поделиться ботом"""
-        bot_username = (await self.bot.get_me()).username
-        share_url = f"https://t.me/{bot_username}"
+        share_url = await self.identity.share_url()
 
         share_text = (
             "🚀 <b>Поделитесь ботом с друзьями!</b>\n\n"
@@ -279,42 +264,33 @@ class StartHandler:
         ])
 
         await callback.message.edit_text(share_text, reply_markup=keyboard, parse_mode="HTML")
-        await callback.answer()
 
     async def country_callback(self, callback: CallbackQuery, state: FSMContext):
         """Базовый обработчик выбора страны для начального флоу"""
         country = callback.data.split("_")[1]
         await state.update_data(country=country)
 
-        # Сохраняем в профиле
-        await self.profile_manager.update_profile_preferences(
-            callback.from_user.id,
-            country=country
+        # Сохраняем в профиле в фоне
+        self.background.spawn(
+            self.profile_manager.update_profile_preferences(callback.from_user.id, country=country),
+            name="update_profile_preferences"
         )
 
-        country_name = "🇷🇺 России" if country == "russia" else "🇰🇿 Казахстане"
-        text = f"Отлично! Подбираем займы в {country_name}\n\n👤 Укажите ваш возраст:"
-
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="18-25 лет", callback_data="age_22")],
-            [InlineKeyboardButton(text="26-35 лет", callback_data="age_30")],
-            [InlineKeyboardButton(text="36-50 лет", callback_data="age_43")],
-            [InlineKeyboardButton(text="51+ лет", callback_data="age_60")]
-        ])
+        text = screens.text("choose_age", country=country)
+        keyboard = screens.keyboard("age")
 
         await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
         await state.set_state(LoanFlow.choosing_age)
-        await callback.answer()
 
     async def age_callback(self, callback: CallbackQuery, state: FSMContext):
         """Базовый обработчик выбора возраста для начального флоу"""
         age = int(callback.data.split("_")[1])
         await state.update_data(age=age)
 
-        # Сохраняем в профиле
-        await self.profile_manager.update_profile_preferences(
-            callback.from_user.id,
-            age=age
+        # Сохраняем в профиле в фоне
+        self.background.spawn(
+            self.profile_manager.update_profile_preferences(callback.from_user.id, age=age),
+            name="update_profile_preferences"
         )
 
         # После выбора возраста переходим к основному функционалу
@@ -331,5 +307,4 @@ class StartHandler:
             [InlineKeyboardButton(text="🔥 Популярные предложения", callback_data="back_to_popular")]
         ])
 
-        await callback.message.edit_text(success_text, reply_markup=keyboard, parse_mode="HTML")
-        await callback.answer("Профиль настроен!")
\ No newline at end of file
+        await callback.message.edit_text(success_text, reply_markup=keyboard, parse_mode="HTML")
\ No newline at end of file
@@ -1,30 +1,16 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from main_bot.keyboards.screens import screens
+
 
 def get_popular_offers_keyboard():
     """Клавиатура популярных предложений для максимальной конверсии"""
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🆓 ЗАЙМЫ 0% (БЕЗ ПЕРЕПЛАТ)", callback_data="popular_zero_percent")],
-        [InlineKeyboardButton(text="💳 НА КАРТУ ЗА 5 МИНУТ", callback_data="popular_instant")],
-        [InlineKeyboardButton(text="💵 НАЛИЧНЫМИ В РУКИ", callback_data="popular_cash")],
-        [InlineKeyboardButton(text="🚀 БОЛЬШИЕ СУММЫ (до 500К)", callback_data="popular_big_amount")],
-        [InlineKeyboardButton(text="⚡ БЕЗ СПРАВОК И ПОРУЧИТЕЛЕЙ", callback_data="popular_no_docs")],
-        [InlineKeyboardButton(text="🛡️ ПЛОХАЯ КИ? НЕ ПРОБЛЕМА!", callback_data="popular_bad_credit")],
-        [
-            InlineKeyboardButton(text="🇷🇺 Для России", callback_data="popular_russia"),
-            InlineKeyboardButton(text="🇰🇿 Для Казахстана", callback_data="popular_kazakhstan")
-        ]
-    ])
-    return keyboard
+    return screens.keyboard("popular")
 
 
 def get_country_keyboard():
     """Клавиатура выбора страны"""
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🇷🇺 Россия", callback_data="country_russia")],
-        [InlineKeyboardButton(text="🇰🇿 Казахстан", callback_data="country_kazakhstan")]
-    ])
-    return keyboard
+    return screens.keyboard("country")
 
 
 def get_age_keyboard():
@@ -1,19 +1,8 @@
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from aiogram.types import ReplyKeyboardMarkup
 
+from main_bot.keyboards.screens import screens
 
-def get_main_keyboard():
-    """Создает постоянную клавиатуру для максимальной конверсии"""
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [
-                KeyboardButton(text="🔥 Популярные предложения"),
-                KeyboardButton(text="💰 Найти займ")
-            ],
-            [KeyboardButton(text="⚙️ Настройки профиля")],
-            [KeyboardButton(text="🚀 Поделиться ботом")]
-        ],
-        resize_keyboard=True,
-        persistent=True,
-        one_time_keyboard=False
-    )
-    return keyboard
\ No newline at end of file
+
+def get_main_keyboard() -> ReplyKeyboardMarkup:
+    """Постоянная клавиатура для максимальной конверсии (собрана при старте)"""
+    return screens.keyboard("main_reply")
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""Реестр заранее собранных клавиатур и шаблонов текстов основного бота"""
+from typing import Dict, Optional, Tuple
+
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
+
+DEFAULT_LOCALE = "ru"
+COUNTRIES = ("russia", "kazakhstan")
+
+# Возрастные группы: (текст кнопки, возраст в callback)
+AGE_GROUPS = (("18-25 лет", 22), ("26-35 лет", 30), ("36-50 лет", 43), ("51+ лет", 60))
+
+# Суммы займа по странам: ряды кнопок (текст, сумма)
+AMOUNT_ROWS = {
+    "kazakhstan": (
+        (("50,000₸ и менее", 50000), ("100,000₸", 100000)),
+        (("150,000₸", 150000), ("250,000₸", 250000)),
+        (("500,000₸ и более", 500000),),
+    ),
+    "russia": (
+        (("5,000₽ и менее", 5000), ("10,000₽", 10000)),
+        (("15,000₽", 15000), ("25,000₽", 25000)),
+        (("50,000₽ и более", 50000),),
+    ),
+}
+
+COUNTRY_IN = {"russia": "🇷🇺 России", "kazakhstan": "🇰🇿 Казахстане"}
+COUNTRY_NAME = {"russia": "🇷🇺 Россия", "kazakhstan": "🇰🇿 Казахстан"}
+
+# Шаблоны текстов по локалям, слоты заполняются через str.format
+TEXTS = {
+    "ru": {
+        "popular": (
+            "🔥 <b>ПОПУЛЯРНЫЕ ПРЕДЛОЖЕНИЯ</b>\n\n"
+            "💰 <b>Топ займы с максимальным одобрением!</b>\n"
+            "⚡ Деньги на карту за 5 минут\n"
+            "✅ Одобряем 95% заявок\n"
+            "🆓 0% для новых клиентов\n\n"
+            "🎯 <b>Выберите что вас интересует:</b>"
+        ),
+        "popular_short": (
+            "🔥 <b>ПОПУЛЯРНЫЕ ЗАЙМЫ</b>\n\n"
+            "Выберите подходящий вариант для быстрого получения денег:"
+        ),
+        "welcome_returning": (
+            "👋 <b>С возвращением, {first_name}!</b>\n\n"
+            "📍 Ваши настройки:\n"
+            "🌍 Страна: {country_in}\n"
+            "👤 Возраст: {age} лет\n\n"
+            "💰 Найти займы с этими настройками?"
+        ),
+        "find_loan_returning": (
+            "💰 <b>Найдем займ с вашими настройками!</b>\n\n"
+            "📍 Ваши настройки:\n"
+            "🌍 Страна: {country_in}\n"
+            "👤 Возраст: {age} лет\n\n"
+            "💰 Найти займы с этими настройками?"
+        ),
+        "welcome_start": (
+            "🎉 <b>Добро пожаловать, {first_name}!</b>\n\n"
+            "💰 Найдём вам <b>займ до 500 000 ₽</b> за 5 минут!\n\n"
+            "✅ Без отказов и справок\n"
+            "✅ Плохая КИ? Не проблема!\n"
+            "✅ Деньги на карту или наличными\n\n"
+            "Сначала настроим ваш профиль:"
+        ),
+        "welcome_new": (
+            "🚀 <b>Найдем выгодный займ за 30 секунд!</b>\n\n"
+            "💰 Займы до 500,000₸ / 50,000₽ на карту за 5 минут\n"
+            "✅ Одобряем даже с плохой КИ\n"
+            "🆓 0% для новых клиентов\n"
+            "⚡ Без справок и поручителей\n\n"
+            "Сначала настроим ваш профиль:"
+        ),
+        "choose_age": "Отлично! Подбираем займы в {country_in}\n\n👤 Укажите ваш возраст:",
+        "edit_age": "🎂 <b>Выберите ваш возраст:</b>",
+        "edit_country": "🌍 <b>Выберите вашу страну:</b>",
+        "choose_amount": "💰 <b>Выберите СУММУ займа</b>",
+        "choose_term": "📅 <b>Выбери СРОК займа</b>",
+        "choose_payment": (
+            "💳 <b>Как хотите получить деньги?</b>\n\n"
+            "Выберите удобный способ получения займа:"
+        ),
+        "choose_zero": "💳 <b>Выбери ПРОЦЕНТ займа</b>",
+        "no_offers": (
+            "😔 К сожалению, по вашим критериям нет доступных предложений.\n\n"
+            "Попробуйте изменить параметры поиска:"
+        ),
+    }
+}
+
+
+def _inline(rows) -> InlineKeyboardMarkup:
+    """Сборка inline клавиатуры из рядов (текст, callback_data)"""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text=text, callback_data=data) for text, data in row]
+        for row in rows
+    ])
+
+
+class ScreenRegistry:
+    """Неизменяемые клавиатуры и шаблоны текстов, собранные один раз при старте"""
+
+    def __init__(self):
+        self._keyboards: Dict[Tuple[str, Optional[str], str], object] = {}
+        self._quick_search: Dict[Tuple[str, int, str], InlineKeyboardMarkup] = {}
+
+    def build(self):
+        """Сборка всех статичных клавиатур для каждой страны и локали"""
+        if self._keyboards:
+            return
+
+        for locale in TEXTS:
+            self._add("popular", None, locale, _inline([
+                [("🆓 ЗАЙМЫ 0% (БЕЗ ПЕРЕПЛАТ)", "popular_zero_percent")],
+                [("💳 НА КАРТУ ЗА 5 МИНУТ", "popular_instant")],
+                [("💵 НАЛИЧНЫМИ В РУКИ", "popular_cash")],
+                [("🚀 БОЛЬШИЕ СУММЫ (до 500К)", "popular_big_amount")],
+                [("⚡ БЕЗ СПРАВОК И ПОРУЧИТЕЛЕЙ", "popular_no_docs")],
+                [("🛡️ ПЛОХАЯ КИ? НЕ ПРОБЛЕМА!", "popular_bad_credit")],
+                [("🇷🇺 Для России", "popular_russia"), ("🇰🇿 Для Казахстана", "popular_kazakhstan")],
+            ]))
+
+            countries = [[(COUNTRY_NAME[country], f"country_{country}")] for country in COUNTRIES]
+            self._add("country", None, locale, _inline(countries))
+            self._add("edit_country", None, locale, _inline(
+                countries + [[("🔙 Назад к настройкам", "change_profile_settings")]]
+            ))
+
+            ages = [[(text, f"age_{age}")] for text, age in AGE_GROUPS]
+            self._add("age", None, locale, _inline(ages))
+            self._add("edit_age", None, locale, _inline(
+                ages + [[("🔙 Назад к настройкам", "change_profile_settings")]]
+            ))
+
+            for country in COUNTRIES:
+                self._add("amount", country, locale, _inline(
+                    [[(text, f"amount_{amount}") for text, amount in row] for row in AMOUNT_ROWS[country]]
+                ))
+
+            self._add("term", None, locale, _inline([
+                [("7 дней", "term_7"), ("14 дней", "term_14")],
+                [("21 день", "term_21"), ("30 дней", "term_30")],
+            ]))
+            self._add("payment", None, locale, _inline([
+                [("💳 На банковскую карту", "payment_card")],
+                [("📱 QIWI кошелек", "payment_qiwi")],
+                [("🟡 Яндекс.Деньги", "payment_yandex")],
+                [("🏦 На счет в банке", "payment_bank")],
+                [("💵 Наличные", "payment_cash")],
+                [("📞 Через систему контакт", "payment_contact")],
+            ]))
+            self._add("zero", None, locale, _inline([
+                [("✅ Только 0%", "zero_true")],
+                [("💰 Любые варианты", "zero_false")],
+            ]))
+            self._add("no_offers", None, locale, _inline([
+                [("🔄 Изменить параметры", "change_params")],
+            ]))
+            self._add("profile_updated", None, locale, _inline([
+                [("⚙️ К настройкам профиля", "change_profile_settings")],
+                [("🏠 В главное меню", "back_to_main")],
+            ]))
+            self._add("profile_settings", None, locale, _inline([
+                [("🌍 Изменить страну", "edit_country")],
+                [("🎂 Изменить возраст", "edit_age")],
+                [("🔙 Вернуться назад", "back_to_main")],
+            ]))
+            self._add("main_reply", None, locale, ReplyKeyboardMarkup(
+                keyboard=[
+                    [KeyboardButton(text="🔥 Популярные предложения"), KeyboardButton(text="💰 Найти займ")],
+                    [KeyboardButton(text="⚙️ Настройки профиля")],
+                    [KeyboardButton(text="🚀 Поделиться ботом")]
+                ],
+                resize_keyboard=True,
+                persistent=True,
+                one_time_keyboard=False
+            ))
+
+            for country in COUNTRIES:
+                for _, age in AGE_GROUPS:
+                    self.quick_search_keyboard(country, age, locale)
+
+    def _add(self, name: str, country: Optional[str], locale: str, markup):
+        self._keyboards[(name, country, locale)] = markup
+
+    def keyboard(self, name: str, country: Optional[str] = None, locale: str = DEFAULT_LOCALE):
+        """Готовая клавиатура по имени (и стране для зависящих от валюты)"""
+        if not self._keyboards:
+            self.build()
+
+        if country is not None and country not in COUNTRIES:
+            country = "russia"
+
+        return self._keyboards[(name, country, locale)]
+
+    def quick_search_keyboard(self, country: str, age: int, locale: str = DEFAULT_LOCALE) -> InlineKeyboardMarkup:
+        """Клавиатура возвращающегося пользователя, кэшируется по стране и возрасту"""
+        key = (country, age, locale)
+        keyboard = self._quick_search.get(key)
+
+        if keyboard is None:
+            keyboard = _inline([
+                [("💰 ДА, НАЙТИ ЗАЙМЫ!", f"quick_search_{country}_{age}")],
+                [("⚙️ Изменить настройки", "change_profile_settings")],
+            ])
+            self._quick_search[key] = keyboard
+
+        return keyboard
+
+    @staticmethod
+    def text(name: str, locale: str = DEFAULT_LOCALE, **slots) -> str:
+        """Текст экрана по шаблону с подстановкой пользовательских слотов"""
+        template = TEXTS.get(locale, TEXTS[DEFAULT_LOCALE])[name]
+        if not slots:
+            return template
+
+        country = slots.get("country")
+        if country is not None:
+            slots.setdefault("country_in", COUNTRY_IN.get(country, COUNTRY_IN["kazakhstan"]))
+
+        return template.format(**slots)
+
+
+screens = ScreenRegistry()
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.storage.base import BaseEventIsolation, StorageKey
+from aiogram.types import TelegramObject
+
+from shared.metrics import CHAT_LOCKS, UPDATE_WAIT_SECONDS, UPDATES_IN_PROGRESS, UPDATES_QUEUED
+
+
+class ChatEventIsolation(BaseEventIsolation):
+    """
+    Последовательная обработка апдейтов одного ключа FSM (чат и пользователь), разные пользователи - параллельно.
+
+    Блокировку берет FSMContextMiddleware до чтения состояния, поэтому обработчик второго
+    нажатия видит состояние и данные, уже записанные первым. Блокировка удаляется,
+    как только ее никто не держит и не ждет (в SimpleEventIsolation они копятся навсегда).
+    """
+
+    def __init__(self):
+        # Ключ -> [блокировка, число апдейтов, которые ее держат или ждут]
+        self._locks: Dict[StorageKey, list] = {}
+        self.waiting = 0
+
+    @asynccontextmanager
+    async def lock(self, key: StorageKey) -> AsyncGenerator[None, None]:
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            lock = entry[0]
+            if lock.locked():
+                # Повторное нажатие, пока обрабатывается предыдущее
+                self.waiting += 1
+                started = time.monotonic()
+                try:
+                    await lock.acquire()
+                finally:
+                    self.waiting -= 1
+                UPDATE_WAIT_SECONDS.observe(time.monotonic() - started, stage="chat")
+            else:
+                await lock.acquire()
+            try:
+                yield
+            finally:
+                lock.release()
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+    async def close(self) -> None:
+        self._locks.clear()
+
+    def collect(self):
+        """Сборщик метрик: очередь апдейтов за своими же чатами"""
+        UPDATES_QUEUED.set(self.waiting, stage="chat")
+        CHAT_LOCKS.set(len(self._locks))
+
+
+class ConcurrencyLimitMiddleware(BaseMiddleware):
+    """Общий предел одновременно обрабатываемых апдейтов; остальные ждут свободного слота"""
+
+    def __init__(self, max_concurrent: int = 64):
+        self.max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.waiting = 0
+        self.in_progress = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if self._semaphore.locked():
+            self.waiting += 1
+            started = time.monotonic()
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+            UPDATE_WAIT_SECONDS.observe(time.monotonic() - started, stage="slot")
+        else:
+            await self._semaphore.acquire()
+
+        self.in_progress += 1
+        try:
+            return await handler(event, data)
+        finally:
+            self.in_progress -= 1
+            self._semaphore.release()
+
+    def collect(self):
+        """Сборщик метрик: апдейты в обработке и в ожидании слота"""
+        UPDATES_QUEUED.set(self.waiting, stage="slot")
+        UPDATES_IN_PROGRESS.set(self.in_progress)
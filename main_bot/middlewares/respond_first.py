@@ -0,0 +1,42 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery, TelegramObject
+
+logger = logging.getLogger(__name__)
+
+RESPOND_FIRST_FLAG = "respond_first"
+
+
+class RespondFirstMiddleware(BaseMiddleware):
+    """
+    Мгновенный ответ на коллбек до выполнения обработчика.
+
+    Обработчики, зарегистрированные с флагом respond_first, получают уже
+    отвеченный коллбек и не должны вызывать callback.answer() повторно.
+    Значение флага: True или словарь с ключами text / show_alert.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        flag = get_flag(data, RESPOND_FIRST_FLAG)
+
+        if not flag or not isinstance(event, CallbackQuery):
+            return await handler(event, data)
+
+        options = flag if isinstance(flag, dict) else {}
+
+        try:
+            await event.answer(text=options.get("text"), show_alert=options.get("show_alert"))
+        except TelegramAPIError as e:
+            # Ответ не критичен - продолжаем обработку, спиннер погаснет по таймауту
+            logger.warning(f"Не удалось ответить на коллбек {event.id}: {e}")
+
+        return await handler(event, data)
@@ -0,0 +1,109 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import queue
+import secrets
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+logger = logging.getLogger(__name__)
+
+# Персональные данные, которые не попадают в запись
+DROPPED_FIELDS = {"username", "last_name", "phone_number", "contact", "location", "title", "bio"}
+
+
+class UpdateAnonymizer:
+    """Замена telegram id на псевдонимы (HMAC с солью) и вычистка персональных данных"""
+
+    def __init__(self, salt: bytes):
+        self.salt = salt
+
+    def pseudonym(self, telegram_id: int) -> int:
+        """Стабильный в пределах соли псевдоним; личный чат и пользователь получают один и тот же"""
+        digest = hmac.new(self.salt, str(abs(telegram_id)).encode(), hashlib.sha256).digest()
+        pseudonym = int.from_bytes(digest[:6], "big") or 1
+        return -pseudonym if telegram_id < 0 else pseudonym
+
+    def anonymize(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.anonymize(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        # User (is_bot) и Chat (type) - объекты с telegram id
+        is_identity = "id" in value and ("is_bot" in value or "type" in value) and isinstance(value["id"], int)
+        result = {}
+        for key, item in value.items():
+            if key in DROPPED_FIELDS:
+                continue
+            if is_identity and key == "id":
+                result[key] = self.pseudonym(item)
+            elif is_identity and key == "first_name":
+                result[key] = "User"
+            else:
+                result[key] = self.anonymize(item)
+        return result
+
+
+class _CaptureFormatter(logging.Formatter):
+    """Запись апдейта одной JSON-строкой; обезличивание выполняется в потоке записи"""
+
+    def __init__(self, anonymizer: UpdateAnonymizer):
+        super().__init__()
+        self.anonymizer = anonymizer
+
+    def format(self, record: logging.LogRecord) -> str:
+        captured = record.msg
+        return json.dumps(
+            {"t": captured["t"], "update": self.anonymizer.anonymize(captured["update"])},
+            ensure_ascii=False, separators=(",", ":")
+        )
+
+
+class UpdateRecorder(BaseMiddleware):
+    """
+    Запись входящих апдейтов в ротируемый JSONL для воспроизведения (main_bot.utils.update_replay).
+
+    В цикле событий апдейт только сериализуется в словарь и кладется в очередь;
+    обезличивание, JSON и запись на диск выполняет поток QueueListener.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024, backups: int = 5,
+                 salt: Optional[str] = None):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "updates.jsonl")
+        # Без заданной соли псевдонимы не связываются между перезапусками
+        anonymizer = UpdateAnonymizer(salt.encode() if salt else secrets.token_bytes(16))
+
+        handler = RotatingFileHandler(self.path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(_CaptureFormatter(anonymizer))
+        self._queue = queue.SimpleQueue()
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+        logger.info(f"📼 Запись апдейтов включена: {self.path}")
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if isinstance(event, Update):
+            try:
+                payload = event.model_dump(mode="json", exclude_none=True, by_alias=True)
+                self._queue.put(logging.makeLogRecord({"msg": {"t": time.time(), "update": payload}}))
+            except Exception as e:
+                logger.warning(f"Не удалось записать апдейт {event.update_id}: {e}")
+        return await handler(event, data)
+
+    def close(self):
+        """Дописать очередь и закрыть файл"""
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
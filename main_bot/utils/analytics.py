@@ -1,12 +1,15 @@
 import json
 import logging
-import sqlite3
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 from main_bot.config.settings import DB_FILE
+from shared.instrumented_db import connect
+from shared.metrics import timed_db
 
 logger = logging.getLogger(__name__)
+# Частые события каждого взаимодействия: в лог попадает выборка (LOG_SAMPLE_RATES)
+event_logger = logging.getLogger(f"{__name__}.events")
 
 
 class AnalyticsTracker:
@@ -17,8 +20,9 @@ class AnalyticsTracker:
 
     def get_connection(self):
         """Получение соединения с БД"""
-        return sqlite3.connect(self.db_file)
+        return connect(self.db_file, "analytics")
 
+    @timed_db("analytics")
     async def track_user_start(self, user_id: int, username: str = None, first_name: str = None):
         """Регистрация нового пользователя или обновление активности"""
         conn = self.get_connection()
@@ -43,6 +47,7 @@ class AnalyticsTracker:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def track_session_start(self, user_id: int, age: int, country: str) -> Optional[int]:
         """Начало новой сессии поиска займа"""
         conn = self.get_connection()
@@ -70,7 +75,7 @@ class AnalyticsTracker:
             """, (db_user_id,))
 
             conn.commit()
-            logger.info(f"Новая сессия: user={user_id}, session={session_id}")
+            event_logger.info(f"Новая сессия: user={user_id}, session={session_id}")
             return session_id
 
         except Exception as e:
@@ -79,6 +84,7 @@ class AnalyticsTracker:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def track_offers_shown(self, session_id: int, offer_ids: List[str]):
         """Сохранение показанных офферов"""
         if not session_id:
@@ -90,12 +96,13 @@ class AnalyticsTracker:
             offers_json = json.dumps(offer_ids)
             cursor.execute("UPDATE sessions SET shown_offers = ? WHERE id = ?", (offers_json, session_id))
             conn.commit()
-            logger.info(f"Показаны офферы в сессии {session_id}: {offer_ids}")
+            event_logger.info(f"Показаны офферы в сессии {session_id}: {offer_ids}")
         except Exception as e:
             logger.error(f"Ошибка сохранения показанных офферов: {e}")
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def track_session_parameters(self, session_id: int, amount: int):
         """Сохранение параметров сессии (сумма запроса)"""
         if not session_id:
@@ -111,6 +118,7 @@ class AnalyticsTracker:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def track_link_click(self, user_id: int, session_id: int, offer_id: str, country: str):
         """ГЛАВНАЯ МЕТРИКА: Клик по партнерской ссылке"""
         conn = self.get_connection()
@@ -149,6 +157,7 @@ class AnalyticsTracker:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def get_analytics_summary(self, days: int = 7) -> Dict[str, Any]:
         """Получение сводной аналитики за период"""
         conn = self.get_connection()
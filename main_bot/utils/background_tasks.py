@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from typing import Coroutine, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    """Супервизор фоновых задач (аналитика, профиль) после ответа пользователю"""
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+        self.failed_count = 0
+
+    @property
+    def pending_count(self) -> int:
+        """Количество незавершенных задач"""
+        return len(self._tasks)
+
+    def spawn(self, coro: Coroutine, name: Optional[str] = None) -> asyncio.Task:
+        """Запуск корутины в фоне с удержанием ссылки и отчетом об ошибках"""
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_done)
+        return task
+
+    def _on_done(self, task: asyncio.Task):
+        """Обработка завершения задачи: снимаем ссылку и логируем исключения"""
+        self._tasks.discard(task)
+
+        if task.cancelled():
+            return
+
+        error = task.exception()
+        if error is not None:
+            self.failed_count += 1
+            logger.error(
+                f"Ошибка фоновой задачи {task.get_name()}: {error!r}",
+                exc_info=(type(error), error, error.__traceback__)
+            )
+
+    async def shutdown(self, timeout: float = 5.0):
+        """Ожидание завершения фоновых задач при остановке бота"""
+        if not self._tasks:
+            return
+
+        logger.info(f"Ожидание завершения фоновых задач: {len(self._tasks)}")
+        done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+
+        for task in pending:
+            task.cancel()
+
+        if pending:
+            logger.warning(f"Отменено незавершенных фоновых задач: {len(pending)}")
@@ -0,0 +1,31 @@
+import logging
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.types import User
+
+logger = logging.getLogger(__name__)
+
+
+class BotIdentity:
+    """Кэш данных самого бота: get_me запрашивается один раз за процесс"""
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._me: Optional[User] = None
+
+    async def load(self) -> User:
+        """Загрузка данных бота из Telegram (повторно только если кэш пуст)"""
+        if self._me is None:
+            self._me = await self.bot.get_me()
+            logger.info(f"Данные бота загружены: @{self._me.username}")
+
+        return self._me
+
+    async def username(self) -> str:
+        """Username бота без обращения к API после первой загрузки"""
+        return (await self.load()).username
+
+    async def share_url(self) -> str:
+        """Ссылка на бота для кнопок «Поделиться»"""
+        return f"https://t.me/{await self.username()}"
@@ -0,0 +1,40 @@
+import asyncio
+import logging
+from typing import Optional
+
+from shared.offer_manager import OfferManager
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogWatcher:
+    """Фоновое отслеживание изменений каталога из админки (отдельный процесс/контейнер)"""
+
+    def __init__(self, offer_manager: OfferManager, interval: float = 0.5):
+        self.offer_manager = offer_manager
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Запуск опроса PRAGMA data_version; каталог читается только при изменениях"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="catalog_watcher")
+
+    async def stop(self):
+        """Остановка опроса"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                self.offer_manager.refresh()
+            except Exception as e:
+                logger.error(f"Ошибка отслеживания каталога: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Dict
+
+from main_bot.config.settings import PROFILES_DIR
+from shared.control_channel import ControlListener
+from shared.memory_diff import MemorySnapshotter
+from shared.profiler import SamplingProfiler
+from shared.resource_monitor import ResourceMonitor
+
+logger = logging.getLogger(__name__)
+
+# Ограничение длительности профилирования по команде из админки
+MAX_PROFILE_SECONDS = 300
+MAX_MEMORY_SECONDS = 3600
+MAX_MEMORY_SNAPSHOTS = 10
+
+
+def count_found_offers(storage) -> int:
+    """Копии офферов, лежащие в данных FSM (found_offers) у всех пользователей"""
+    records = list(getattr(storage, 'storage', {}).values())
+    return sum(len(record.data.get('found_offers', ())) for record in records)
+
+
+class DiagnosticsCommands:
+    """Служебные команды основного бота, приходящие из админки через канал команд"""
+
+    def __init__(self, listener: ControlListener, resources: ResourceMonitor, storage):
+        self.profiler = SamplingProfiler(PROFILES_DIR)
+        self.resources = resources
+        self.memory = MemorySnapshotter(PROFILES_DIR, extra_counts={
+            "fsm found_offers": lambda: count_found_offers(storage)
+        })
+        listener.register("profile", self.profile)
+        listener.register("resources", self.resource_history)
+        listener.register("memory", self.memory_diff)
+
+    async def profile(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Сэмплирование стеков цикла событий на N секунд с записью collapsed-стеков"""
+        seconds = min(max(int(args.get('seconds', 30)), 1), MAX_PROFILE_SECONDS)
+        # Сэмплируем поток, в котором крутится цикл событий и выполняются обработчики
+        loop_thread_id = threading.get_ident()
+        return await asyncio.to_thread(self.profiler.run, loop_thread_id, seconds)
+
+    async def resource_history(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Кольцевой буфер замеров ресурсов плюс свежий замер на момент запроса"""
+        current = await self.resources.sample()
+        return {
+            "interval": self.resources.interval,
+            "samples": self.resources.history(int(args.get('limit', 0)) or None),
+            "current": current
+        }
+
+    async def memory_diff(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Снимки tracemalloc через равные интервалы: прирост по местам выделений и счетчики объектов"""
+        seconds = min(max(int(args.get('seconds', 300)), 10), MAX_MEMORY_SECONDS)
+        snapshots = min(max(int(args.get('snapshots', 3)), 2), MAX_MEMORY_SNAPSHOTS)
+        return await self.memory.run(seconds, snapshots)
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from main_bot.config.settings import DB_FILE
+from shared.instrumented_db import connect
+from shared.metrics import FUNNEL_ACTIVE, FUNNEL_DWELL_SECONDS, FUNNEL_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+# Вне состояний: вход в воронку и выход из нее (state.clear())
+OUTSIDE_STATE = "-"
+# Пользователь без перехода дольше этого срока считается ушедшим из воронки
+ABANDONED_STATE = "abandoned"
+
+UPSERT_SQL = """
+    INSERT INTO funnel_transitions (period, from_state, to_state, transitions, dwell_seconds)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (period, from_state, to_state) DO UPDATE SET
+        transitions = transitions + excluded.transitions,
+        dwell_seconds = dwell_seconds + excluded.dwell_seconds
+"""
+
+
+def short_state(state: Optional[str]) -> str:
+    """LoanFlow:choosing_age -> choosing_age"""
+    return state.split(":", 1)[-1] if state else OUTSIDE_STATE
+
+
+class FunnelTracker:
+    """Переходы между состояниями FSM: счетчики в памяти и периодическая запись почасовых агрегатов"""
+
+    def __init__(self, db_file: str = DB_FILE, flush_interval: float = 60.0, abandon_after: float = 1800.0):
+        self.db_file = db_file
+        self.flush_interval = flush_interval
+        self.abandon_after = abandon_after
+        # Текущее состояние пользователя и момент входа в него
+        self._entered: Dict[Tuple[int, int], Tuple[str, float]] = {}
+        # (час UTC, из, в) -> [переходов, суммарное время в исходном состоянии]
+        self._pending: Dict[Tuple[str, str, str], list] = {}
+        self._seen_states = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def transition(self, key: Tuple[int, int], state: Optional[str]):
+        """Смена состояния пользователя; вызывается из цикла событий, без блокировок"""
+        now = time.monotonic()
+        previous = self._entered.get(key)
+        new_state = short_state(state) if state else None
+
+        if previous is None and new_state is None:
+            return
+        if previous is not None and previous[0] == new_state:
+            # Повторная установка того же состояния (листание офферов) не сбрасывает время
+            return
+
+        if new_state is None:
+            del self._entered[key]
+        else:
+            self._entered[key] = (new_state, now)
+
+        if previous is None:
+            self._count(OUTSIDE_STATE, new_state, None)
+        else:
+            self._count(previous[0], new_state or OUTSIDE_STATE, now - previous[1])
+
+    def _count(self, from_state: str, to_state: str, dwell: Optional[float]):
+        FUNNEL_TRANSITIONS.inc(from_state=from_state, to_state=to_state)
+        if dwell is not None:
+            FUNNEL_DWELL_SECONDS.observe(dwell, state=from_state)
+
+        period = time.strftime("%Y-%m-%d %H:00:00", time.gmtime())
+        totals = self._pending.get((period, from_state, to_state))
+        if totals is None:
+            totals = self._pending[(period, from_state, to_state)] = [0, 0.0]
+        totals[0] += 1
+        totals[1] += dwell or 0.0
+
+    def expire_abandoned(self):
+        """Пользователи, застрявшие в состоянии дольше abandon_after, уходят в abandoned"""
+        now = time.monotonic()
+        expired = [key for key, (_, entered_at) in self._entered.items() if now - entered_at > self.abandon_after]
+        for key in expired:
+            state, entered_at = self._entered.pop(key)
+            self._count(state, ABANDONED_STATE, now - entered_at)
+
+    def collect(self):
+        """Сборщик метрик: сколько пользователей сейчас в каждом состоянии"""
+        active = Counter(state for state, _ in list(self._entered.values()))
+        # Опустевшие состояния обнуляем, а не оставляем последнее значение
+        self._seen_states.update(active)
+        for state in self._seen_states:
+            FUNNEL_ACTIVE.set(active.get(state, 0), state=state)
+
+    async def flush(self):
+        """Запись накопленных агрегатов в funnel_transitions"""
+        self.expire_abandoned()
+        if not self._pending:
+            return
+        # Подмена словаря в цикле событий: новые переходы копятся уже в новом
+        pending, self._pending = self._pending, {}
+        try:
+            await asyncio.to_thread(self._write, pending)
+        except Exception as e:
+            logger.error(f"Ошибка записи агрегатов воронки: {e}")
+            # Вернем несохраненное, чтобы не потерять при следующей записи
+            for key, (transitions, dwell) in pending.items():
+                totals = self._pending.setdefault(key, [0, 0.0])
+                totals[0] += transitions
+                totals[1] += dwell
+
+    def _write(self, pending: Dict[Tuple[str, str, str], list]):
+        conn = connect(self.db_file, "analytics")
+        try:
+            with conn:
+                conn.executemany(UPSERT_SQL, [
+                    (period, from_state, to_state, transitions, round(dwell, 3))
+                    for (period, from_state, to_state), (transitions, dwell) in pending.items()
+                ])
+        finally:
+            conn.close()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="funnel_flush")
+
+    async def stop(self):
+        """Остановка с финальной записью накопленного"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+class FunnelTrackingStorage(MemoryStorage):
+    """MemoryStorage, сообщающая трекеру воронки о каждом set_state (в т.ч. state.clear())"""
+
+    def __init__(self, tracker: FunnelTracker):
+        super().__init__()
+        self.tracker = tracker
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await super().set_state(key, state)
+        self.tracker.transition((key.chat_id, key.user_id), state.state if isinstance(state, State) else state)
@@ -0,0 +1,74 @@
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+from main_bot.config.settings import LOGO_FILE_IDS_FILE, LOGOS_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class LogoFileIdCache:
+    """Кэш file_id загруженных логотипов, чтобы не отправлять файл повторно"""
+
+    def __init__(self, cache_file: str = LOGO_FILE_IDS_FILE, logos_dir: str = LOGOS_DIR):
+        self.cache_file = cache_file
+        self.logos_dir = logos_dir
+        self._entries: Dict[str, Dict] = {}
+
+    def load(self):
+        """Загрузка сохраненных file_id с диска"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+            logger.info(f"Загружено file_id логотипов: {len(self._entries)}")
+        except FileNotFoundError:
+            self._entries = {}
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ошибка загрузки кэша логотипов: {e}")
+            self._entries = {}
+
+    def path(self, logo: str) -> str:
+        """Путь к файлу логотипа"""
+        return os.path.join(self.logos_dir, logo)
+
+    def _fingerprint(self, logo: str) -> Optional[str]:
+        """Отпечаток файла: замена логотипа под тем же именем сбрасывает file_id"""
+        try:
+            stat = os.stat(self.path(logo))
+        except OSError:
+            return None
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def get(self, logo: str) -> Optional[str]:
+        """file_id логотипа, если файл не менялся с момента загрузки"""
+        entry = self._entries.get(logo)
+        if entry and entry.get('fingerprint') == self._fingerprint(logo):
+            return entry.get('file_id')
+        return None
+
+    def remember(self, logo: str, file_id: str):
+        """Сохранение file_id после первой загрузки логотипа"""
+        fingerprint = self._fingerprint(logo)
+        if fingerprint is None:
+            return
+
+        self._entries[logo] = {'file_id': file_id, 'fingerprint': fingerprint}
+        self._save()
+
+    def forget(self, logo: str):
+        """Удаление невалидного file_id"""
+        if self._entries.pop(logo, None) is not None:
+            self._save()
+
+    def _save(self):
+        try:
+            cache_dir = os.path.dirname(self.cache_file)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить кэш логотипов: {e}")
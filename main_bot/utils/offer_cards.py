@@ -0,0 +1,138 @@
+"""Предрендеренные карточки офферов для текущей версии каталога"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+
+from main_bot.utils.currency_utils import get_currency_symbol
+
+
+def _escape_slots(text: str) -> str:
+    """Экранирование фигурных скобок, чтобы текст оффера не ломал шаблон"""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+@dataclass
+class OfferCard:
+    """Шаблоны карточки оффера для одной страны; слоты заполняются при отправке"""
+    offer_id: str
+    caption_template: str
+    success_template: str
+    logo: Optional[str]
+    _keyboards: Dict[Tuple[bool, bool], InlineKeyboardMarkup] = field(default_factory=dict)
+    _success_rows: List[List[InlineKeyboardButton]] = field(default_factory=list)
+
+    def caption(self, amount: int, term: int, index: int, total: int) -> str:
+        """Текст карточки с условиями пользователя и позицией в выдаче"""
+        return self.caption_template.format(
+            amount=f"{amount:,}".replace(',', ' '),
+            term=term,
+            position=index + 1,
+            total=total
+        )
+
+    def keyboard(self, index: int, total: int) -> InlineKeyboardMarkup:
+        """Клавиатура карточки; зависит только от наличия соседних офферов"""
+        return self._keyboards[(index > 0, index < total - 1)]
+
+    def success_text(self, amount: int, term: int) -> str:
+        """Текст экрана перехода к оформлению"""
+        return self.success_template.format(amount=f"{amount:,}", term=term)
+
+    def success_keyboard(self, personalized_link: str) -> InlineKeyboardMarkup:
+        """Клавиатура экрана перехода: персональная ссылка + готовые кнопки"""
+        link_row = [InlineKeyboardButton(text="🚀 ПОЛУЧИТЬ ДЕНЬГИ СЕЙЧАС!", url=personalized_link)]
+        return InlineKeyboardMarkup(inline_keyboard=[link_row, *self._success_rows])
+
+
+class OfferCardRenderer:
+    """Рендерер карточек (offer, country), пересобирается при смене версии каталога"""
+
+    def __init__(self):
+        self.version = None
+        self._cards: Dict[Tuple[str, str], OfferCard] = {}
+
+    def rebuild(self, microloans: Dict[str, Dict], version):
+        """Предрендер карточек всех активных офферов для новой версии каталога"""
+        self._cards = {}
+        self.version = version
+
+        for offer in microloans.values():
+            self._render_offer(offer)
+
+    def update(self, offer_ids, microloans: Dict[str, Dict], version):
+        """Перерисовка только измененных офферов; удаленные офферы пропадают из кэша"""
+        self._cards = {key: card for key, card in self._cards.items() if key[0] not in offer_ids}
+        self.version = version
+
+        for offer_id in offer_ids:
+            if offer_id in microloans:
+                self._render_offer(microloans[offer_id])
+
+    def _render_offer(self, offer: Dict):
+        """Карточки активного оффера для всех его стран"""
+        if not offer.get('status', {}).get('is_active', False):
+            return
+        for country in offer.get('geography', {}).get('countries', []):
+            self._cards[(offer['id'], country)] = self._render(offer, country)
+
+    def card(self, offer: Dict, country: str) -> OfferCard:
+        """Карточка оффера из кэша или рендер по требованию"""
+        key = (offer['id'], country)
+        card = self._cards.get(key)
+
+        if card is None:
+            card = self._render(offer, country)
+            self._cards[key] = card
+
+        return card
+
+    @staticmethod
+    def _render(offer: Dict, country: str) -> OfferCard:
+        """Сборка шаблонов текста и всех вариантов клавиатуры карточки"""
+        name = _escape_slots(offer.get('name', 'Без названия'))
+        description = _escape_slots(offer.get('description', 'Быстрое получение займа'))
+        currency = get_currency_symbol(country)
+        zero_text = '0% для новых клиентов' if offer.get('zero_percent') else 'Выгодные условия'
+
+        caption_template = (
+            f"🏦 <b>{name}</b>\n\n"
+            f"{description}\n\n"
+            f"💰 <b>Сумма:</b> {{amount}}{currency}\n"
+            f"📅 <b>Срок:</b> {{term}} дней\n"
+            f"🆓 <b>Процент:</b> {zero_text}\n\n"
+            f"📊 <b>Вариант {{position}} из {{total}}</b>"
+        )
+
+        success_template = (
+            f"✅ <b>Отличный выбор!</b>\n\n"
+            f"🏦 {_escape_slots(str(offer.get('name')))}\n"
+            f"💰 {{amount}}{currency} на {{term}} дней\n\n"
+            f"👆 <b>Нажмите кнопку для оформления займа</b>"
+        )
+
+        get_loan_row = [InlineKeyboardButton(text="💰 ПОЛУЧИТЬ ЗАЙМ", callback_data=f"get_loan_{offer['id']}")]
+        change_row = [InlineKeyboardButton(text="🔄 Изменить условия", callback_data="change_params")]
+        prev_button = InlineKeyboardButton(text="⬅️ Назад", callback_data="prev_offer")
+        next_button = InlineKeyboardButton(text="➡️ Еще варианты", callback_data="next_offer")
+
+        keyboards = {}
+        for has_prev in (False, True):
+            for has_next in (False, True):
+                nav_row = ([prev_button] if has_prev else []) + ([next_button] if has_next else [])
+                rows = [get_loan_row] + ([nav_row] if nav_row else []) + [change_row]
+                keyboards[(has_prev, has_next)] = InlineKeyboardMarkup(inline_keyboard=rows)
+
+        success_rows = [
+            [InlineKeyboardButton(text="🔙 Посмотреть другие варианты", callback_data="back_to_offers")],
+            [InlineKeyboardButton(text="🚀 Поделиться ботом", callback_data="share_bot")]
+        ]
+
+        return OfferCard(
+            offer_id=offer['id'],
+            caption_template=caption_template,
+            success_template=success_template,
+            logo=offer.get('logo'),
+            _keyboards=keyboards,
+            _success_rows=success_rows
+        )
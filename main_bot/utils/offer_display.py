@@ -1,76 +1,56 @@
 import os
 import logging
 from typing import Dict
-from aiogram.types import Message, FSInputFile, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import Message, FSInputFile
 from aiogram.fsm.context import FSMContext
 
+from main_bot.utils.logo_cache import LogoFileIdCache
+from main_bot.utils.offer_cards import OfferCard, OfferCardRenderer
+from shared.offer_manager import OfferManager
+
 logger = logging.getLogger(__name__)
 
 
 class OfferDisplay:
     """Класс для отображения офферов с логотипами"""
 
-    @staticmethod
-    async def show_single_offer(message: Message, state: FSMContext, offer: Dict, index: int, total: int):
-        """Показ одного оффера с возможностью листать"""
+    def __init__(self, offer_manager: OfferManager, logo_cache: LogoFileIdCache):
+        self.offer_manager = offer_manager
+        self.logo_cache = logo_cache
+        self.cards = OfferCardRenderer()
+        offer_manager.add_listener(self.on_catalog_change)
+
+    def on_catalog_change(self, offer_ids):
+        """Изменения каталога: точечная перерисовка карточек или полная пересборка"""
+        microloans = self.offer_manager.offers_data.get('microloans', {})
+        if offer_ids is None:
+            self.cards.rebuild(microloans, self.offer_manager.version)
+        else:
+            self.cards.update(offer_ids, microloans, self.offer_manager.version)
 
-        # Формируем текст оффера
-        name = offer.get('name', 'Без названия')
-        description = offer.get('description', 'Быстрое получение займа')
+    def sync(self):
+        """Пересборка карточек при смене версии каталога"""
+        if self.cards.version != self.offer_manager.version:
+            self.cards.rebuild(self.offer_manager.offers_data.get('microloans', {}), self.offer_manager.version)
+
+    def get_card(self, offer: Dict, country: str) -> OfferCard:
+        """Карточка оффера для актуальной версии каталога"""
+        self.sync()
+        return self.cards.card(offer, country)
+
+    async def show_single_offer(self, message: Message, state: FSMContext, offer: Dict, index: int, total: int):
+        """Показ одного оффера с возможностью листать"""
 
         # Получаем данные пользователя для показа условий
         user_data = await state.get_data()
-        amount_formatted = f"{user_data.get('amount', 0):,}".replace(',', ' ')
         country = user_data.get('country', 'russia')
-        currency = "₸" if country == "kazakhstan" else "₽"
-
-        offer_text = (
-            f"🏦 <b>{name}</b>\n\n"
-            f"{description}\n\n"
-            f"💰 <b>Сумма:</b> {amount_formatted}{currency}\n"
-            f"📅 <b>Срок:</b> {user_data.get('term', 0)} дней\n"
-            f"🆓 <b>Процент:</b> {'0% для новых клиентов' if offer.get('zero_percent') else 'Выгодные условия'}\n\n"
-            f"📊 <b>Вариант {index + 1} из {total}</b>"
-        )
-
-        # Формируем кнопки
-        buttons = []
-
-        # Главная кнопка - получить займ
-        buttons.append([
-            InlineKeyboardButton(
-                text="💰 ПОЛУЧИТЬ ЗАЙМ",
-                callback_data=f"get_loan_{offer['id']}"
-            )
-        ])
-
-        # Кнопки навигации
-        nav_buttons = []
-
-        # Кнопка "Назад" если не первый
-        if index > 0:
-            nav_buttons.append(
-                InlineKeyboardButton(text="⬅️ Назад", callback_data="prev_offer")
-            )
-
-        # Кнопка "Далее" если не последний
-        if index < total - 1:
-            nav_buttons.append(
-                InlineKeyboardButton(text="➡️ Еще варианты", callback_data="next_offer")
-            )
-
-        if nav_buttons:
-            buttons.append(nav_buttons)
-
-        # Кнопка изменения параметров
-        buttons.append([
-            InlineKeyboardButton(text="🔄 Изменить условия", callback_data="change_params")
-        ])
-
-        keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
+
+        # Готовая карточка: заполняем только пользовательские слоты
+        card = self.get_card(offer, country)
+        offer_text = card.caption(user_data.get('amount', 0), user_data.get('term', 0), index, total)
+        keyboard = card.keyboard(index, total)
 
         # Удаляем предыдущее сообщение с оффером всегда, чтобы убрать картинки
-        user_data = await state.get_data()
         last_message_id = user_data.get('last_offer_message_id')
         if last_message_id:
             try:
@@ -79,11 +59,13 @@ class OfferDisplay:
                 logger.error(f"Не удалось удалить предыдущее сообщение: {e}")
 
         # Проверяем наличие логотипа и отправляем соответствующим образом
-        logo_path = offer.get('logo')
-        if logo_path and os.path.exists(f"data/images/logos/{logo_path}"):
+        logo_path = card.logo
+        if logo_path and os.path.exists(self.logo_cache.path(logo_path)):
+            # Уже загруженный логотип отправляем по file_id без повторной выгрузки файла
+            file_id = self.logo_cache.get(logo_path)
             try:
                 # Отправляем с фото
-                photo = FSInputFile(f"data/images/logos/{logo_path}")
+                photo = file_id or FSInputFile(self.logo_cache.path(logo_path))
                 sent_message = await message.bot.send_photo(
                     chat_id=message.chat.id,
                     photo=photo,
@@ -92,15 +74,20 @@ class OfferDisplay:
                     parse_mode="HTML"
                 )
 
+                if not file_id and sent_message.photo:
+                    self.logo_cache.remember(logo_path, sent_message.photo[-1].file_id)
+
                 # Сохраняем ID сообщения для следующего удаления
                 await state.update_data(last_offer_message_id=sent_message.message_id)
 
             except Exception as e:
                 logger.error(f"Ошибка отправки фото {logo_path}: {e}")
+                if file_id:
+                    self.logo_cache.forget(logo_path)
                 # Отправляем без картинки при ошибке
                 sent_message = await message.answer(offer_text, reply_markup=keyboard, parse_mode="HTML")
                 await state.update_data(last_offer_message_id=sent_message.message_id)
         else:
             # Отправляем без картинки
             sent_message = await message.answer(offer_text, reply_markup=keyboard, parse_mode="HTML")
-            await state.update_data(last_offer_message_id=sent_message.message_id)
\ No newline at end of file
+            await state.update_data(last_offer_message_id=sent_message.message_id)
@@ -0,0 +1,190 @@
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import SendPhoto
+from aiogram.types import Chat, Message, PhotoSize, Update, User
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STUB_TOKEN = "123456:REPLAY"
+
+
+class StubSession(BaseSession):
+    """Сессия Bot API без сети: правдоподобные ответы и опциональная задержка как у Telegram"""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.calls = Counter()
+        self._message_id = 0
+
+    async def close(self):
+        pass
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+    async def make_request(self, bot, method, timeout=None):
+        self.calls[type(method).__name__] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        returning = str(method.__returning__)
+        if method.__returning__ is User:
+            return User(id=42, is_bot=True, first_name="Replay", username="replay_bot")
+        if "Message" in returning:
+            self._message_id += 1
+            photo = None
+            if isinstance(method, SendPhoto):
+                photo = [PhotoSize(file_id=f"replay_{self._message_id}", file_unique_id=str(self._message_id),
+                                   width=512, height=512)]
+            return Message(message_id=self._message_id, date=datetime.now(),
+                           chat=Chat(id=getattr(method, "chat_id", 0) or 0, type="private"), photo=photo)
+        return True
+
+
+def load_loan_bot():
+    """Класс LoanBot из main_bot.py (файл точки входа, не пакет main_bot)"""
+    os.environ.setdefault("MAIN_BOT_TOKEN", STUB_TOKEN)
+    spec = importlib.util.spec_from_file_location("main_bot_entry", os.path.join(PROJECT_ROOT, "main_bot.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.LoanBot
+
+
+def read_capture(paths: List[str]) -> List[Dict[str, Any]]:
+    """Записи из файлов захвата в порядке времени (ротированные файлы можно передать все сразу)"""
+    records = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda record: record["t"])
+    return records
+
+
+def prepare_workdir(source_dir: str, with_analytics: bool) -> str:
+    """Рабочий каталог с копией каталога офферов: воспроизведение не пишет в боевые базы"""
+    workdir = tempfile.mkdtemp(prefix="replay_")
+    data_dir = os.path.join(workdir, "data")
+    os.makedirs(data_dir)
+
+    databases = ["offers.db"] + (["analytics.db"] if with_analytics else [])
+    for name in databases:
+        source = os.path.join(source_dir, "data", name)
+        if not os.path.exists(source):
+            continue
+        # backup API дает согласованный снимок даже при работающем боте
+        src, dst = sqlite3.connect(source), sqlite3.connect(os.path.join(data_dir, name))
+        try:
+            src.backup(dst)
+        finally:
+            src.close()
+            dst.close()
+
+    logos = os.path.join(source_dir, "data", "images")
+    if os.path.isdir(logos):
+        os.symlink(os.path.abspath(logos), os.path.join(data_dir, "images"))
+    return workdir
+
+
+async def replay(paths: List[str], speed: float = 1.0, api_latency: float = 0.0,
+                 source_dir: str = ".", with_analytics: bool = False, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Подача захвата в диспетчер LoanBot; speed 0 - без пауз между апдейтами"""
+    import start
+    from shared.database import init_database
+
+    records = read_capture(paths)[:limit]
+    source_dir = os.path.abspath(source_dir)
+    LoanBot = load_loan_bot()
+
+    workdir = prepare_workdir(source_dir, with_analytics)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        # Схема как при боевом запуске: колонки профиля (users.age, users.country) создает start.py
+        start.init_database()
+        await init_database()
+        loan_bot = LoanBot(STUB_TOKEN)
+        session = StubSession(api_latency)
+        loan_bot.bot.session = session
+        await loan_bot.warm_up()
+
+        latencies: List[float] = []
+        errors = Counter()
+
+        async def feed(update: Update):
+            started = time.perf_counter()
+            try:
+                await loan_bot.dp.feed_update(loan_bot.bot, update)
+            except Exception as e:
+                errors[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+        tasks = set()
+        started = time.perf_counter()
+        first_t = records[0]["t"] if records else 0
+        for record in records:
+            if speed > 0:
+                delay = (record["t"] - first_t) / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            update = Update.model_validate(record["update"], context={"bot": loan_bot.bot})
+            # Как при polling: каждый апдейт - отдельная задача
+            task = asyncio.create_task(feed(update))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        await loan_bot.background.shutdown()
+        elapsed = time.perf_counter() - started
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies.sort()
+    return {
+        "updates": len(records),
+        "elapsed": round(elapsed, 3),
+        "throughput": round(len(records) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else 0,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else 0,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else 0,
+        "errors": dict(errors),
+        "api_calls": dict(session.calls)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Воспроизведение записанных апдейтов через диспетчер LoanBot с заглушкой Bot API",
+        epilog="пример: python -m main_bot.utils.update_replay data/captures/updates.jsonl --speed 10"
+    )
+    parser.add_argument("capture", nargs="+", help="файлы updates.jsonl (включая ротированные .1, .2 ...)")
+    parser.add_argument("--speed", type=float, default=1.0, help="ускорение относительно записи, 0 - без пауз")
+    parser.add_argument("--api-latency-ms", type=float, default=0.0, help="задержка ответа заглушки Bot API")
+    parser.add_argument("--source-dir", default=".", help="каталог проекта с data/offers.db")
+    parser.add_argument("--with-analytics", action="store_true", help="взять копию analytics.db вместо пустой")
+    parser.add_argument("--limit", type=int, help="воспроизвести только первые N апдейтов")
+    args = parser.parse_args()
+
+    result = asyncio.run(replay(
+        [os.path.abspath(path) for path in args.capture], args.speed, args.api_latency_ms / 1000,
+        args.source_dir, args.with_analytics, args.limit
+    ))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
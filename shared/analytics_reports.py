@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Tuple
+
+from main_bot.config.settings import DB_FILE
+from main_bot.states.loan_flow import LoanFlow
+from shared.instrumented_db import connect
+from shared.metrics import timed_db
+
+logger = logging.getLogger(__name__)
+
+# Окна отчета: код для кнопок -> (подпись, длина окна в часах, время жизни кэша в секундах)
+REPORT_WINDOWS = {
+    "1h": ("1 час", 1, 30),
+    "24h": ("24 часа", 24, 60),
+    "7d": ("7 дней", 24 * 7, 300),
+    "30d": ("30 дней", 24 * 30, 600)
+}
+
+SUMMARY_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM users WHERE created_at >= :since) AS new_users,
+        (SELECT COUNT(*) FROM (
+            SELECT user_id FROM sessions WHERE session_start >= :since
+            UNION
+            SELECT user_id FROM link_clicks WHERE clicked_at >= :since
+        )) AS active_users,
+        (SELECT COUNT(DISTINCT user_id) FROM link_clicks WHERE clicked_at >= :since) AS converting_users,
+        (SELECT COUNT(*) FROM sessions WHERE session_start >= :since) AS sessions,
+        (SELECT COUNT(*) FROM sessions WHERE session_start >= :since AND completed = 1) AS completed_sessions,
+        (SELECT COUNT(*) FROM link_clicks WHERE clicked_at >= :since) AS clicks
+"""
+
+TOP_OFFERS_SQL = """
+    SELECT offer_id, COUNT(*) AS clicks FROM link_clicks
+    WHERE clicked_at >= :since
+    GROUP BY offer_id ORDER BY clicks DESC LIMIT 5
+"""
+
+COUNTRIES_SQL = """
+    SELECT s.country, COUNT(*) AS sessions, SUM(s.completed = 1) AS completed
+    FROM sessions s
+    WHERE s.session_start >= :since
+    GROUP BY s.country ORDER BY sessions DESC
+"""
+
+# Шаги воронки в порядке LoanFlow; пишет их main_bot.utils.funnel в funnel_transitions по часам
+FUNNEL_STEPS = [state.state.split(":", 1)[-1] for state in LoanFlow.__all_states__]
+
+FUNNEL_SQL = """
+    SELECT from_state, to_state, SUM(transitions) AS transitions, SUM(dwell_seconds) AS dwell_seconds
+    FROM funnel_transitions
+    WHERE period >= strftime('%Y-%m-%d %H:00:00', :since)
+    GROUP BY from_state, to_state
+"""
+
+
+def build_funnel(rows) -> list:
+    """Шаги воронки: вошли, ушли дальше по воронке, среднее время на шаге"""
+    position = {step: index for index, step in enumerate(FUNNEL_STEPS)}
+    steps = {step: {'state': step, 'entered': 0, 'left': 0, 'advanced': 0, 'dwell_seconds': 0.0}
+             for step in FUNNEL_STEPS}
+
+    for row in rows:
+        source, target = steps.get(row['from_state']), steps.get(row['to_state'])
+        if target is not None and row['from_state'] != row['to_state']:
+            target['entered'] += row['transitions']
+        if source is not None:
+            source['left'] += row['transitions']
+            source['dwell_seconds'] += row['dwell_seconds']
+            if position.get(row['to_state'], -1) > position[row['from_state']]:
+                source['advanced'] += row['transitions']
+
+    for step in steps.values():
+        step['advance_rate'] = round(step['advanced'] / step['entered'] * 100) if step['entered'] else 0
+        step['avg_dwell'] = step['dwell_seconds'] / step['left'] if step['left'] else 0
+    return [steps[step] for step in FUNNEL_STEPS]
+
+
+class AnalyticsReports:
+    """Отчеты по трафику из analytics.db для админки: только чтение, с кэшем результатов"""
+
+    def __init__(self, db_file: str = DB_FILE):
+        self.db_file = db_file
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def get_connection(self):
+        """Соединение только для чтения: в режиме WAL не блокирует запись основного бота"""
+        conn = connect(f"file:{self.db_file}?mode=ro", "analytics", uri=True, timeout=5)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @timed_db("analytics")
+    def build_summary(self, hours: int) -> Dict[str, Any]:
+        """Сводка за последние hours часов (синхронно, выполняется в отдельном потоке)"""
+        conn = self.get_connection()
+        try:
+            # Снапшот WAL: все запросы отчета видят одно состояние базы
+            conn.execute("BEGIN")
+            since = conn.execute("SELECT datetime('now', ?)", (f"-{hours} hours",)).fetchone()[0]
+            params = {"since": since}
+
+            summary = dict(conn.execute(SUMMARY_SQL, params).fetchone())
+            summary['ctr'] = round(summary['clicks'] / summary['sessions'] * 100, 1) if summary['sessions'] else 0
+            summary['completion_rate'] = (
+                round(summary['completed_sessions'] / summary['sessions'] * 100, 1) if summary['sessions'] else 0
+            )
+            summary['conversion_rate'] = (
+                round(summary['converting_users'] / summary['active_users'] * 100, 1)
+                if summary['active_users'] else 0
+            )
+            summary['top_offers'] = [dict(row) for row in conn.execute(TOP_OFFERS_SQL, params)]
+            summary['countries'] = [dict(row) for row in conn.execute(COUNTRIES_SQL, params)]
+
+            # Агрегаты воронки появляются после первого запуска основного бота с трекером
+            has_funnel = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'funnel_transitions'"
+            ).fetchone()
+            summary['funnel'] = build_funnel(conn.execute(FUNNEL_SQL, params).fetchall()) if has_funnel else []
+            return summary
+        finally:
+            conn.close()
+
+    async def get_summary(self, window: str) -> Dict[str, Any]:
+        """Сводка за окно из REPORT_WINDOWS; повторные запросы в пределах TTL отдаются из кэша"""
+        _, hours, ttl = REPORT_WINDOWS[window]
+
+        cached = self._cache.get(window)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        # Одновременные запросы одного окна ждут один расчет, а не запускают свои
+        lock = self._locks.setdefault(window, asyncio.Lock())
+        async with lock:
+            cached = self._cache.get(window)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            summary = await asyncio.to_thread(self.build_summary, hours)
+            summary['built_at'] = time.time()
+            self._cache[window] = (time.monotonic() + ttl, summary)
+            return summary
+
+    def invalidate(self):
+        """Сброс кэша (кнопка «Обновить»)"""
+        self._cache.clear()
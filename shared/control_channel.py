@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from main_bot.config.settings import CONTROL_DB_FILE
+from shared.instrumented_db import connect
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS control_requests (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        target TEXT NOT NULL,
+        command TEXT NOT NULL,
+        args TEXT,
+        status TEXT NOT NULL DEFAULT 'pending',
+        result TEXT,
+        error TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        finished_at TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_control_requests_pending ON control_requests (target, status)"
+]
+
+# Необработанные запросы старше этого срока считаются устаревшими (бот был выключен)
+REQUEST_TTL_SECONDS = 300
+
+ControlHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class ControlChannel:
+    """Канал служебных команд между процессами ботов через SQLite (админка -> основной бот)"""
+
+    def __init__(self, db_file: str = CONTROL_DB_FILE):
+        self.db_file = db_file
+        self._initialized = False
+
+    def get_connection(self):
+        """Соединение с БД канала; схема создается при первом обращении"""
+        if not self._initialized:
+            directory = os.path.dirname(self.db_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = connect(self.db_file, "control", timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode = WAL")
+            for sql_command in SCHEMA:
+                conn.execute(sql_command)
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def submit(self, target: str, command: str, args: Optional[Dict[str, Any]] = None) -> int:
+        """Постановка команды в очередь процесса target; возвращает id запроса"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO control_requests (target, command, args) VALUES (?, ?, ?)",
+                    (target, command, json.dumps(args or {}, ensure_ascii=False))
+                )
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    def get_request(self, request_id: int) -> Optional[Dict[str, Any]]:
+        """Состояние запроса с разобранным результатом"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT * FROM control_requests WHERE id = ?", (request_id,)).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        request = dict(row)
+        request['args'] = json.loads(request['args']) if request['args'] else {}
+        request['result'] = json.loads(request['result']) if request['result'] else None
+        return request
+
+    async def wait_result(self, request_id: int, timeout: float, interval: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Ожидание завершения запроса; None - не дождались за timeout секунд"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            request = await asyncio.to_thread(self.get_request, request_id)
+            if request and request['status'] in ('done', 'failed'):
+                return request
+            await asyncio.sleep(interval)
+        return None
+
+    def claim_pending(self, target: str) -> list:
+        """Забирает новые запросы процесса target (pending -> running), устаревшие помечает expired"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "UPDATE control_requests SET status = 'expired', finished_at = CURRENT_TIMESTAMP "
+                    "WHERE target = ? AND status = 'pending' AND created_at < datetime('now', ?)",
+                    (target, f"-{REQUEST_TTL_SECONDS} seconds")
+                )
+                rows = conn.execute(
+                    "SELECT id, command, args FROM control_requests "
+                    "WHERE target = ? AND status = 'pending' ORDER BY id",
+                    (target,)
+                ).fetchall()
+                if rows:
+                    conn.executemany(
+                        "UPDATE control_requests SET status = 'running' WHERE id = ?",
+                        [(row['id'],) for row in rows]
+                    )
+            return [
+                {'id': row['id'], 'command': row['command'], 'args': json.loads(row['args'] or '{}')}
+                for row in rows
+            ]
+        finally:
+            conn.close()
+
+    def complete(self, request_id: int, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """Запись результата выполнения запроса"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE control_requests SET status = ?, result = ?, error = ?, finished_at = CURRENT_TIMESTAMP "
+                    "WHERE id = ?",
+                    ('failed' if error else 'done', json.dumps(result, ensure_ascii=False) if result else None,
+                     error, request_id)
+                )
+        finally:
+            conn.close()
+
+
+class ControlListener:
+    """Фоновый опрос канала служебных команд и запуск их обработчиков"""
+
+    def __init__(self, channel: ControlChannel, target: str, interval: float = 1.0):
+        self.channel = channel
+        self.target = target
+        self.interval = interval
+        self._handlers: Dict[str, ControlHandler] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._running: set = set()
+
+    def register(self, command: str, handler: ControlHandler):
+        """Регистрация обработчика команды: async handler(args) -> dict с результатом"""
+        self._handlers[command] = handler
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="control_listener")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        for task in list(self._running):
+            task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                for request in await asyncio.to_thread(self.channel.claim_pending, self.target):
+                    task = asyncio.create_task(self._execute(request), name=f"control_{request['command']}")
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+            except Exception as e:
+                logger.error(f"Ошибка опроса канала команд: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _execute(self, request: Dict[str, Any]):
+        """Выполнение одной команды и запись результата"""
+        handler = self._handlers.get(request['command'])
+        result, error = None, None
+        if handler is None:
+            error = f"Неизвестная команда: {request['command']}"
+        else:
+            logger.info(f"🛠 Служебная команда {request['command']} #{request['id']}: {request['args']}")
+            try:
+                result = await handler(request['args'])
+            except Exception as e:
+                logger.error(f"Ошибка служебной команды {request['command']}: {e}")
+                error = f"{type(e).__name__}: {e}"
+
+        try:
+            await asyncio.to_thread(self.channel.complete, request['id'], result, error)
+        except Exception as e:
+            logger.error(f"Ошибка записи результата команды #{request['id']}: {e}")
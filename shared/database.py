@@ -1,11 +1,31 @@
-import sqlite3
 import logging
 import os
 from main_bot.config.settings import DB_FILE
+from shared.instrumented_db import connect
 
 logger = logging.getLogger(__name__)
 
 
+def apply_read_concurrency(cursor):
+    """WAL и индексы для отчетов админки: чтение не блокирует запись основного бота"""
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_created_at ON users (created_at)")
+
+
+def apply_telemetry_schema(cursor):
+    """Агрегаты воронки подбора по часам (пишет основной бот, читает админка)"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS funnel_transitions (
+            period TEXT NOT NULL,
+            from_state TEXT NOT NULL,
+            to_state TEXT NOT NULL,
+            transitions INTEGER NOT NULL DEFAULT 0,
+            dwell_seconds REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (period, from_state, to_state)
+        ) WITHOUT ROWID
+    """)
+
+
 async def init_database():
     """Проверка и инициализация базы данных при необходимости"""
     try:
@@ -15,7 +35,7 @@ async def init_database():
         # Проверяем, существует ли БД и корректна ли её структура
         if os.path.exists(DB_FILE):
             # Проверяем структуру существующей БД
-            conn = sqlite3.connect(DB_FILE)
+            conn = connect(DB_FILE, "analytics")
             cursor = conn.cursor()
 
             # Проверяем наличие основных таблиц
@@ -26,6 +46,9 @@ async def init_database():
             existing_tables = [row[0] for row in cursor.fetchall()]
 
             if len(existing_tables) == 3:
+                apply_read_concurrency(cursor)
+                apply_telemetry_schema(cursor)
+                conn.commit()
                 logger.info(f"✅ База данных уже существует и корректна: {DB_FILE}")
                 conn.close()
                 return
@@ -33,7 +56,7 @@ async def init_database():
             conn.close()
 
         # Если БД нет или структура неполная, создаём/дополняем
-        conn = sqlite3.connect(DB_FILE)
+        conn = connect(DB_FILE, "analytics")
         cursor = conn.cursor()
 
         # Выполняем создание таблиц (IF NOT EXISTS защитит от дублирования)
@@ -86,6 +109,8 @@ async def init_database():
 
         for sql_command in sql_commands:
             cursor.execute(sql_command)
+        apply_read_concurrency(cursor)
+        apply_telemetry_schema(cursor)
 
         conn.commit()
         logger.info(f"✅ База данных проверена/создана: {DB_FILE}")
@@ -95,4 +120,25 @@ async def init_database():
         raise
     finally:
         if conn:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+async def warm_up_database():
+    """Прогрев БД до первого апдейта: схема и индекс пользователей попадают в кэш ОС"""
+    conn = None
+    try:
+        conn = connect(DB_FILE, "analytics")
+        cursor = conn.cursor()
+
+        # Первый запрос читает схему, COUNT по telegram_id проходит индекс профилей
+        cursor.execute("SELECT COUNT(telegram_id) FROM users")
+        users_count = cursor.fetchone()[0]
+        cursor.execute("SELECT MAX(id) FROM sessions")
+        cursor.execute("SELECT MAX(id) FROM link_clicks")
+
+        logger.info(f"✅ База данных прогрета, пользователей: {users_count}")
+
+    except Exception as e:
+        logger.warning(f"Не удалось прогреть БД: {e}")
+    finally:
+        if conn:
+            conn.close()
@@ -0,0 +1,160 @@
+import collections
+import functools
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Deque, Dict, Tuple
+
+from shared.metrics import REGISTRY, SQL_P99_SECONDS, SQL_ROWS, SQL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Порог медленного запроса и не чаще одного лога с планом на выражение за интервал
+SLOW_QUERY_SECONDS = 0.1
+SLOW_QUERY_LOG_INTERVAL = 60
+# Последние длительности выражения для p99
+P99_WINDOW = 512
+
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+
+_durations: Dict[Tuple[str, str], Deque[float]] = {}
+_slow_logged: Dict[Tuple[str, str], float] = {}
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_statement(sql: str) -> str:
+    """Выражение без литералов и лишних пробелов - ключ статистики и метка метрик"""
+    statement = _LITERALS.sub("?", _WHITESPACE.sub(" ", sql).strip())
+    # IN (?, ?, ?) разной длины - одно выражение
+    statement = _PLACEHOLDER_LISTS.sub("?, ...", statement)
+    return statement if len(statement) <= 160 else statement[:157] + "..."
+
+
+def _record(conn: "InstrumentedConnection", sql: str, parameters, elapsed: float, rows: int) -> str:
+    """Учет выполнения выражения: гистограмма, строки, окно для p99, лог медленных запросов"""
+    statement = normalize_statement(sql)
+    key = (conn.db_name, statement)
+    SQL_SECONDS.observe(elapsed, db=conn.db_name, statement=statement)
+    if rows > 0:
+        SQL_ROWS.inc(rows, db=conn.db_name, statement=statement)
+
+    with _lock:
+        window = _durations.get(key)
+        if window is None:
+            window = _durations[key] = collections.deque(maxlen=P99_WINDOW)
+        window.append(elapsed)
+
+        if elapsed < SLOW_QUERY_SECONDS:
+            return statement
+        now = time.monotonic()
+        if now - _slow_logged.get(key, -SLOW_QUERY_LOG_INTERVAL) < SLOW_QUERY_LOG_INTERVAL:
+            return statement
+        _slow_logged[key] = now
+
+    logger.warning(
+        f"🐌 Медленный запрос {conn.db_name}: {elapsed * 1000:.0f} мс\n{statement}\n{conn.explain(sql, parameters)}"
+    )
+    return statement
+
+
+def collect_sql_p99():
+    """Сборщик p99 длительности по выражениям из окна последних выполнений"""
+    with _lock:
+        windows = [(key, sorted(window)) for key, window in _durations.items()]
+    for (db, statement), durations in windows:
+        SQL_P99_SECONDS.set(durations[int(len(durations) * 0.99)], db=db, statement=statement)
+
+
+REGISTRY.add_collector(collect_sql_p99)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Курсор с замером execute и подсчетом затронутых/прочитанных строк"""
+
+    _statement = None
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            # Для SELECT execute выполняет запрос до первой строки: агрегаты и сортировки целиком
+            self._statement = _record(self.connection, sql, parameters, time.perf_counter() - started,
+                                      max(self.rowcount, 0))
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _record(self.connection, sql, None, time.perf_counter() - started, max(self.rowcount, 0))
+            self._statement = None
+
+    def _count_fetched(self, rows: int):
+        if self._statement is not None and rows:
+            SQL_ROWS.inc(rows, db=self.connection.db_name, statement=self._statement)
+
+    def fetchone(self):
+        row = super().fetchone()
+        self._count_fetched(row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._count_fetched(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count_fetched(len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        self._count_fetched(1)
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Соединение SQLite, все выражения которого проходят через InstrumentedCursor"""
+    db_name = "unknown"
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def explain(self, sql: str, parameters) -> str:
+        """План запроса для лога медленных выражений"""
+        if parameters is None or not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return "(план недоступен)"
+        try:
+            # Обычный курсор: план не должен попадать в статистику выражений
+            cursor = sqlite3.Connection.cursor(self)
+            plan = cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error as e:
+            return f"(план недоступен: {e})"
+
+        lines, depth = [], {0: 0}
+        for node_id, parent, _, detail in plan:
+            depth[node_id] = depth.get(parent, 0) + 1
+            lines.append(f"{'  ' * depth[node_id]}{detail}")
+        return "\n".join(lines)
+
+
+def connect(database: str, db_name: str, **kwargs) -> InstrumentedConnection:
+    """sqlite3.connect с учетом времени и строк каждого выражения под именем db_name"""
+    conn = sqlite3.connect(database, factory=InstrumentedConnection, **kwargs)
+    conn.db_name = db_name
+    return conn
@@ -0,0 +1,116 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+PLAIN_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись - одна JSON-строка"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        # Служебные поля фильтра: доля выборки и число отброшенных записей перед этой
+        for field in ("sample_rate", "dropped"):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Выборка и ограничение частоты INFO/DEBUG по логгерам; WARNING и выше проходят всегда"""
+
+    def __init__(self, rate: float = 20.0, burst: int = 100, sample_rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample_rates = sample_rates or {}
+        # Логгер -> [токены, время пополнения]; отброшенные с последней пропущенной записи
+        self._buckets: Dict[str, list] = {}
+        self._dropped: Dict[str, int] = {}
+
+    def _sample_rate(self, name: str) -> float:
+        """Доля выборки логгера или ближайшего родителя (aiogram.event -> aiogram)"""
+        while name:
+            if name in self.sample_rates:
+                return self.sample_rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        sample_rate = self._sample_rate(record.name)
+        if sample_rate < 1.0:
+            if random.random() >= sample_rate:
+                return False
+            record.sample_rate = sample_rate
+
+        now = time.monotonic()
+        bucket = self._buckets.get(record.name)
+        if bucket is None:
+            bucket = self._buckets[record.name] = [float(self.burst), now]
+        bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if bucket[0] < 1:
+            self._dropped[record.name] = self._dropped.get(record.name, 0) + 1
+            return False
+        bucket[0] -= 1
+
+        dropped = self._dropped.pop(record.name, None)
+        if dropped:
+            record.dropped = dropped
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler без форматирования в вызывающем потоке: запись форматирует поток QueueListener"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Очередь внутри процесса: запись передается как есть, f-строка уже собрана при вызове
+        return record
+
+
+def setup_queue_logging(level: int = logging.INFO, sample_rates: Optional[Dict[str, float]] = None,
+                        rate: float = 20.0, burst: int = 100) -> QueueListener:
+    """Логирование через очередь: в цикле событий только фильтр и put, формат и вывод - в отдельном потоке.
+    LOG_FORMAT=text - прежний текстовый формат вместо JSON-строк"""
+    output = logging.StreamHandler()
+    if os.getenv("LOG_FORMAT", "json").lower() == "text":
+        output.setFormatter(logging.Formatter(PLAIN_FORMAT))
+    else:
+        output.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(rate, burst, sample_rates))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    # При выходе дописываем все, что осталось в очереди
+    atexit.register(listener.stop)
+    return listener
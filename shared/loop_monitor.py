@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from shared.metrics import LOOP_LAG_SECONDS, LOOP_STALLS
+from shared.metrics_middleware import running_handler
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoopLagMonitor:
+    """Монитор задержки цикла событий: замер лага и стек блокирующего кода"""
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, stack_depth: int = 12):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._stall_handler: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Запуск замера в цикле событий и сторожевого потока"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._tick(), name="loop_lag_monitor")
+        self._thread = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        """Остановка монитора"""
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._thread.join(timeout=self.interval * 2)
+        self._thread = None
+
+    async def _tick(self):
+        """Плановый сон: опоздание пробуждения и есть задержка цикла"""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._heartbeat = now
+            LOOP_LAG_SECONDS.observe(lag)
+
+            if self._stall_handler is not None:
+                logger.warning(f"🐢 Цикл событий был заблокирован {lag:.3f} с ({self._stall_handler})")
+                self._stall_handler = None
+
+    def _watch(self):
+        """Сторожевой поток: если пульс цикла пропал дольше порога, снимаем стек потока цикла"""
+        while not self._stopped.wait(self.interval):
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled < self.threshold or self._stall_handler is not None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            handler = self._find_handler(frame)
+            self._stall_handler = handler
+            LOOP_STALLS.inc(handler=handler)
+            stack = "".join(traceback.format_stack(frame)[-self.stack_depth:])
+            logger.warning(
+                f"🐢 Цикл событий заблокирован дольше {stalled:.3f} с, обработчик: {handler}\n{stack.rstrip()}"
+            )
+
+    def _find_handler(self, frame) -> str:
+        """Имя обработчика, в котором сейчас выполняется блокирующий код"""
+        handler = running_handler(frame)
+        if handler is not None:
+            return handler
+
+        outermost = None
+        while frame is not None:
+            if frame.f_code.co_filename.startswith(PROJECT_ROOT) and frame.f_code.co_filename != __file__:
+                outermost = frame.f_code.co_qualname
+            frame = frame.f_back
+
+        # Вне обработчиков: фоновая задача или код проекта, вызванный из цикла
+        task = asyncio.current_task(self._loop)
+        if task is not None and not task.get_name().startswith("Task-"):
+            return f"task:{task.get_name()}"
+        return outermost or "unknown"
@@ -0,0 +1,160 @@
+import asyncio
+import gc
+import logging
+import os
+import time
+import tracemalloc
+import types
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Собственные выделения трассировки и импорта не интересны
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>")
+]
+
+# Типы, подозреваемые в утечках: профили, клавиатуры, записи FSM, сессии aiohttp
+TRACKED_TYPES = {
+    "UserProfile", "InlineKeyboardMarkup", "InlineKeyboardButton", "ReplyKeyboardMarkup", "KeyboardButton",
+    "MemoryStorageRecord", "FSMContext", "ClientSession", "TCPConnector"
+}
+
+
+def count_objects() -> Counter:
+    """Число объектов отслеживаемых типов, словарей-офферов и замыканий среди объектов сборщика мусора"""
+    counts = Counter()
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in TRACKED_TYPES:
+            counts[name] += 1
+        elif isinstance(obj, dict):
+            if "limits" in obj and "geography" in obj:
+                counts["offer dict"] += 1
+        elif isinstance(obj, types.FunctionType) and obj.__closure__:
+            counts["closure"] += 1
+    return counts
+
+
+def _site(traceback: tracemalloc.Traceback) -> str:
+    frame = traceback[0]
+    filename = frame.filename
+    if filename.startswith(PROJECT_ROOT):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        filename = "/".join(filename.split(os.sep)[-2:])
+    return f"{filename}:{frame.lineno}"
+
+
+class MemorySnapshotter:
+    """Серия снимков tracemalloc через равные интервалы: места выделений с наибольшим приростом памяти"""
+
+    def __init__(self, output_dir: str, nframes: int = 10, top: int = 15,
+                 extra_counts: Optional[Dict[str, Callable[[], int]]] = None):
+        self.output_dir = output_dir
+        self.nframes = nframes
+        self.top = top
+        self.extra_counts = extra_counts or {}
+        self._running = False
+
+    @property
+    def busy(self) -> bool:
+        return self._running
+
+    def _counts(self) -> Counter:
+        counts = count_objects()
+        for name, counter in self.extra_counts.items():
+            counts[name] = counter()
+        return counts
+
+    async def run(self, duration: float, snapshots: int = 3) -> Dict[str, Any]:
+        """Снимки в начале и через каждые duration / (snapshots - 1) секунд; сравнение последнего с первым"""
+        if self._running:
+            raise RuntimeError("Снимок памяти уже выполняется")
+        self._running = True
+
+        # Трассировка стоит памяти и CPU - включаем только на время замера, если ее не включили при запуске
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.nframes)
+        try:
+            started = time.monotonic()
+            counts_before = self._counts()
+            series = [tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)]
+            for _ in range(max(snapshots, 2) - 1):
+                await asyncio.sleep(duration / (max(snapshots, 2) - 1))
+                series.append(tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS))
+            counts_after = self._counts()
+            traced, peak = tracemalloc.get_traced_memory()
+            elapsed = time.monotonic() - started
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self._running = False
+
+        # Тяжелое сравнение снимков - вне цикла событий
+        return await asyncio.to_thread(self._report, series, counts_before, counts_after, elapsed, peak)
+
+    def _report(self, series: List[tracemalloc.Snapshot], counts_before: Counter, counts_after: Counter,
+                elapsed: float, peak: int) -> Dict[str, Any]:
+        totals = [sum(stat.size for stat in snapshot.statistics("filename")) for snapshot in series]
+        per_snapshot = [
+            {stat.traceback: stat.size for stat in snapshot.statistics("lineno")} for snapshot in series
+        ]
+
+        sites = []
+        for stat in series[-1].compare_to(series[0], "lineno")[:self.top]:
+            if stat.size_diff <= 0:
+                break
+            sizes = [sizes.get(stat.traceback, 0) for sizes in per_snapshot]
+            # Рост между всеми соседними снимками - главный признак утечки, а не разового всплеска
+            steady = all(later >= earlier for earlier, later in zip(sizes, sizes[1:]))
+            sites.append({
+                "site": _site(stat.traceback),
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+                "steady": steady
+            })
+
+        objects = {
+            name: [counts_before.get(name, 0), counts_after.get(name, 0)]
+            for name in sorted(set(counts_before) | set(counts_after))
+        }
+        stacks = series[-1].compare_to(series[0], "traceback")[:3]
+        path = self._write(sites, objects, stacks, totals)
+        return {
+            "path": path,
+            "duration": round(elapsed, 1),
+            "snapshots": len(series),
+            "traced_growth": [total - totals[0] for total in totals],
+            "peak": peak,
+            "sites": sites,
+            "objects": objects
+        }
+
+    def _write(self, sites: List[Dict], objects: Dict[str, List[int]], stacks: list, totals: List[int]) -> str:
+        """Полный отчет: места выделений, счетчики объектов и стеки трех самых растущих мест"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Отслеживаемая память по снимкам: " + ", ".join(f"{total / 1024:.0f} KiB" for total in totals))
+            f.write("\n\nМеста выделений по приросту (* - рост между всеми снимками):\n")
+            for site in sites:
+                f.write(f"{'*' if site['steady'] else ' '} {site['size_diff'] / 1024:+10.1f} KiB "
+                        f"{site['count_diff']:+8d} блоков  {site['site']}\n")
+            f.write("\nОбъекты (до -> после):\n")
+            for name, (before, after) in objects.items():
+                f.write(f"  {name:<24} {before:>8} -> {after:<8} ({after - before:+d})\n")
+            for stat in stacks:
+                f.write(f"\n{stat.size_diff / 1024:+.1f} KiB, {stat.count_diff:+d} блоков:\n")
+                f.write("\n".join(stat.traceback.format(most_recent_first=True)) + "\n")
+        logger.info(f"🧠 Отчет о памяти записан: {path}")
+        return path
@@ -0,0 +1,309 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Iterable[str], values: Iterable, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Метрика с набором меток; значения хранятся по кортежу значений меток"""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(labels.get(name, "") for name in self.labels)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Монотонно растущий счетчик"""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Текущее значение; обычно выставляется сборщиком в момент запроса /metrics"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Гистограмма длительностей с накопительными бакетами"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # По ключу меток: [счетчики бакетов..., сумма, количество]
+        self._values: Dict[Tuple, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Замер длительности блока кода"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for index, bound in enumerate(self.buckets):
+                cumulative += state[index]
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {state[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {state[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса и сборщиков, вызываемых перед выдачей /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Функция, обновляющая gauge-метрики непосредственно перед выдачей"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus"""
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Ошибка сборщика метрик: {e}")
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+UPDATES_TOTAL = REGISTRY.counter(
+    "bot_updates_total", "Входящие апдейты Telegram по типу", ("update_type",))
+HANDLER_SECONDS = REGISTRY.histogram(
+    "bot_handler_seconds", "Время выполнения обработчика", ("handler",))
+HANDLER_ERRORS = REGISTRY.counter(
+    "bot_handler_errors_total", "Исключения в обработчиках", ("handler", "error"))
+TELEGRAM_API_SECONDS = REGISTRY.histogram(
+    "bot_telegram_api_seconds", "Длительность запросов к Bot API", ("method",))
+TELEGRAM_API_ERRORS = REGISTRY.counter(
+    "bot_telegram_api_errors_total", "Ошибки Bot API по методу и коду", ("method", "error"))
+DB_OPERATION_SECONDS = REGISTRY.histogram(
+    "bot_db_operation_seconds", "Длительность операций с БД", ("db", "operation"))
+CATALOG_VERSION = REGISTRY.gauge(
+    "bot_catalog_version", "Версия каталога офферов в памяти процесса")
+CATALOG_OFFERS = REGISTRY.gauge(
+    "bot_catalog_offers", "Офферы в каталоге", ("status",))
+FSM_KEYS = REGISTRY.gauge(
+    "bot_fsm_keys", "Ключи хранилища FSM", ("kind",))
+SQL_SECONDS = REGISTRY.histogram(
+    "bot_sql_statement_seconds", "Длительность выполнения SQL выражения", ("db", "statement"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+SQL_P99_SECONDS = REGISTRY.gauge(
+    "bot_sql_statement_p99_seconds", "p99 длительности SQL выражения по последним выполнениям", ("db", "statement"))
+SQL_ROWS = REGISTRY.counter(
+    "bot_sql_statement_rows_total", "Строки, прочитанные или измененные SQL выражением", ("db", "statement"))
+FUNNEL_TRANSITIONS = REGISTRY.counter(
+    "bot_funnel_transitions_total", "Переходы между состояниями воронки подбора", ("from_state", "to_state"))
+FUNNEL_DWELL_SECONDS = REGISTRY.histogram(
+    "bot_funnel_dwell_seconds", "Время в состоянии воронки до перехода", ("state",),
+    buckets=(1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0))
+FUNNEL_ACTIVE = REGISTRY.gauge(
+    "bot_funnel_active_users", "Пользователи, находящиеся в состоянии воронки", ("state",))
+LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "bot_event_loop_lag_seconds", "Задержка планирования цикла событий",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+LOOP_STALLS = REGISTRY.counter(
+    "bot_event_loop_stalls_total", "Блокировки цикла событий выше порога", ("handler",))
+PROCESS_RESOURCES = REGISTRY.gauge(
+    "bot_process_resource", "Ресурсы процесса: rss (байты), cpu_percent, threads, fds, tasks", ("resource",))
+STORAGE_BYTES = REGISTRY.gauge(
+    "bot_storage_bytes", "Размер файлов и каталогов данных", ("path",))
+UPDATES_QUEUED = REGISTRY.gauge(
+    "bot_updates_queued", "Апдейты в ожидании: chat - предыдущего апдейта чата, slot - свободного слота", ("stage",))
+UPDATES_IN_PROGRESS = REGISTRY.gauge(
+    "bot_updates_in_progress", "Апдейты, обрабатываемые в данный момент")
+UPDATE_WAIT_SECONDS = REGISTRY.histogram(
+    "bot_update_wait_seconds", "Ожидание апдейтов, которым пришлось встать в очередь", ("stage",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+CHAT_LOCKS = REGISTRY.gauge(
+    "bot_chat_locks", "Чаты, у которых апдейт обрабатывается или ждет очереди")
+
+
+def timed_db(db: str, operation: Optional[str] = None):
+    """Декоратор: длительность операции с БД в bot_db_operation_seconds (sync и async)"""
+    def decorator(func):
+        name = operation or func.__name__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with DB_OPERATION_SECONDS.time(db=db, operation=name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with DB_OPERATION_SECONDS.time(db=db, operation=name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def collect_fsm_keys(storage):
+    """Сборщик числа ключей MemoryStorage: всего и с активным состоянием"""
+    def collector():
+        records = list(getattr(storage, 'storage', {}).values())
+        FSM_KEYS.set(len(records), kind="total")
+        FSM_KEYS.set(sum(1 for record in records if record.state is not None), kind="with_state")
+    return collector
+
+
+def collect_catalog(get_version: Callable[[], Optional[int]], get_offers: Callable[[], Dict[str, Dict]]):
+    """Сборщик версии и размера каталога из кэша процесса"""
+    def collector():
+        offers = get_offers()
+        active = sum(1 for offer in offers.values() if offer.get('status', {}).get('is_active', False))
+        CATALOG_VERSION.set(get_version() or 0)
+        CATALOG_OFFERS.set(active, status="active")
+        CATALOG_OFFERS.set(len(offers) - active, status="inactive")
+    return collector
+
+
+class MetricsServer:
+    """Локальный HTTP сервер с эндпоинтом /metrics"""
+
+    def __init__(self, port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY):
+        self.port = port
+        self.host = host
+        self.registry = registry
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    async def start(self):
+        """Запуск сервера; порт 0 - метрики отключены"""
+        if not self.port:
+            return
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, self.host, self.port).start()
+        except OSError as e:
+            logger.error(f"Не удалось запустить сервер метрик на {self.host}:{self.port}: {e}")
+            await self._runner.cleanup()
+            self._runner = None
+            return
+        logger.info(f"📈 Метрики доступны на http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
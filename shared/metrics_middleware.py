@@ -0,0 +1,109 @@
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import (
+    TelegramBadRequest, TelegramConflictError, TelegramEntityTooLarge, TelegramForbiddenError,
+    TelegramNetworkError, TelegramNotFound, TelegramRetryAfter, TelegramServerError, TelegramUnauthorizedError
+)
+from aiogram.types import TelegramObject, Update
+
+from shared.metrics import HANDLER_ERRORS, HANDLER_SECONDS, TELEGRAM_API_ERRORS, TELEGRAM_API_SECONDS, \
+    UPDATES_TOTAL
+
+# Коды ошибок Bot API по классам исключений aiogram
+_API_ERROR_CODES = (
+    (TelegramRetryAfter, "429"),
+    (TelegramEntityTooLarge, "413"),
+    (TelegramBadRequest, "400"),
+    (TelegramUnauthorizedError, "401"),
+    (TelegramForbiddenError, "403"),
+    (TelegramNotFound, "404"),
+    (TelegramConflictError, "409"),
+    (TelegramServerError, "5xx"),
+    (TelegramNetworkError, "network"),
+)
+
+# Выполняющиеся обработчики: id кадра корутины middleware -> имя обработчика (для монитора цикла событий)
+ACTIVE_HANDLERS: Dict[int, str] = {}
+
+
+def handler_name(callback: Callable) -> str:
+    """Имя обработчика для метрик: Класс.метод или функция"""
+    return getattr(callback, '__qualname__', None) or repr(callback)
+
+
+def running_handler(frame) -> Optional[str]:
+    """Имя обработчика, внутри которого выполняется кадр (по стеку потока цикла событий)"""
+    while frame is not None:
+        handler = ACTIVE_HANDLERS.get(id(frame))
+        if handler is not None:
+            return handler
+        frame = frame.f_back
+    return None
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Счетчик входящих апдейтов по типу (внешний middleware на dp.update)"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if isinstance(event, Update):
+            UPDATES_TOTAL.inc(update_type=event.event_type)
+        return await handler(event, data)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Латентность и ошибки каждого зарегистрированного обработчика (внутренний middleware)"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        name = handler_name(handler_object.callback) if handler_object is not None else "unknown"
+
+        frame_id = id(sys._getframe())
+        ACTIVE_HANDLERS[frame_id] = name
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            HANDLER_ERRORS.inc(handler=name, error=type(e).__name__)
+            raise
+        finally:
+            HANDLER_SECONDS.observe(time.perf_counter() - started, handler=name)
+            ACTIVE_HANDLERS.pop(frame_id, None)
+
+
+class TelegramApiMetricsMiddleware(BaseRequestMiddleware):
+    """Длительность и коды ошибок запросов к Bot API (middleware сессии бота)"""
+
+    async def __call__(self, make_request, bot, method):
+        name = type(method).__name__
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as e:
+            code = next((code for error, code in _API_ERROR_CODES if isinstance(e, error)), type(e).__name__)
+            TELEGRAM_API_ERRORS.inc(method=name, error=code)
+            raise
+        finally:
+            TELEGRAM_API_SECONDS.observe(time.perf_counter() - started, method=name)
+
+
+def setup_metrics_middlewares(dp: Dispatcher, bot):
+    """Подключение метрик к диспетчеру и сессии бота"""
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    handler_metrics = HandlerMetricsMiddleware()
+    for observer in (dp.message, dp.callback_query):
+        observer.middleware(handler_metrics)
+    bot.session.middleware(TelegramApiMetricsMiddleware())
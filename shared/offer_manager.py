@@ -1,8 +1,8 @@
-import json
 import logging
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Set
 
 from main_bot.config.settings import OFFERS_FILE
+from shared.offer_repository import OfferRepository
 
 logger = logging.getLogger(__name__)
 
@@ -10,51 +10,109 @@ logger = logging.getLogger(__name__)
 class OfferManager:
     """Управление офферами и их ранжирование"""
 
-    def __init__(self, offers_file: str = OFFERS_FILE):
+    def __init__(self, offers_file: str = OFFERS_FILE, repository: OfferRepository = None):
         self.offers_file = offers_file
-        self.offers_data = {}
+        self.repository = repository or OfferRepository()
+        self.offers_data = {"microloans": {}}
+        # Версия снапшота каталога - версия каталога в БД на момент загрузки
+        self.version = 0
+        self._listeners: List[Callable[[Optional[Set[str]]], None]] = []
+        # Постоянное соединение для PRAGMA data_version: меняется, только когда БД изменил другой процесс
+        self._probe = None
+        self._data_version = None
+        self.repository.init_catalog(offers_file)
         self.load_offers()
 
+    def add_listener(self, callback: Callable[[Optional[Set[str]]], None]):
+        """Подписка на изменения каталога: callback(ID измененных офферов или None - изменилось все)"""
+        self._listeners.append(callback)
+
+    def _notify(self, offer_ids: Optional[Set[str]]):
+        for callback in self._listeners:
+            try:
+                callback(offer_ids)
+            except Exception as e:
+                logger.error(f"Ошибка обработчика изменений каталога: {e}")
+
     def load_offers(self):
-        """Загрузка офферов из JSON файла"""
+        """Загрузка снапшота офферов из БД каталога"""
         try:
-            with open(self.offers_file, 'r', encoding='utf-8') as f:
-                self.offers_data = json.load(f)
-            logger.info(f"Загружено {len(self.offers_data.get('microloans', {}))} офферов")
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            self.version, microloans = self.repository.load_catalog()
+            self.offers_data = {"microloans": microloans}
+            logger.info(f"Загружено {len(microloans)} офферов (версия каталога {self.version})")
+            self._notify(None)
+        except Exception as e:
             logger.warning(f"Ошибка загрузки офферов: {e}")
-            self.offers_data = {"microloans": {}}
 
-    def get_filtered_offers(self, user_criteria: Dict[str, Any]) -> List[Dict]:
-        """Получение и ранжирование офферов по критериям пользователя"""
-        offers = []
+    def _catalog_touched(self) -> bool:
+        """Дешевая проверка без чтения каталога: были ли коммиты в БД из других соединений"""
+        try:
+            if self._probe is None:
+                self._probe = self.repository.get_connection()
+            data_version = self._probe.execute("PRAGMA data_version").fetchone()[0]
+        except Exception as e:
+            logger.warning(f"Ошибка проверки изменений каталога: {e}")
+            self._probe = None
+            return True
+
+        touched = data_version != self._data_version
+        self._data_version = data_version
+        return touched
+
+    def refresh(self):
+        """Подтягивание изменений из админки: только измененные офферы по журналу каталога"""
+        if not self._catalog_touched():
+            return
 
-        for offer_id, offer in self.offers_data.get('microloans', {}).items():
-            # Базовые проверки
-            if (not offer.get('status', {}).get('is_active', False) or
-                    offer.get('priority', {}).get('manual_boost', 1) == 0 or
-                    user_criteria['country'] not in offer.get('geography', {}).get('countries', [])):
-                continue
+        try:
+            version, offer_ids, offers = self.repository.load_changes(self.version)
+        except Exception as e:
+            logger.warning(f"Ошибка чтения изменений каталога: {e}")
+            return
+
+        if offer_ids is None:
+            # Журнал не покрывает разрыв (массовая замена или долгий простой) - полная перезагрузка
+            self.load_offers()
+            return
+        if not offer_ids:
+            return
+
+        microloans = self.offers_data.setdefault('microloans', {})
+        for offer_id in offer_ids:
+            if offer_id in offers:
+                microloans[offer_id] = offers[offer_id]
+            else:
+                microloans.pop(offer_id, None)
+
+        self.version = version
+        logger.info(f"Каталог обновлен до версии {version}, изменено офферов: {len(offer_ids)}")
+        self._notify(offer_ids)
 
-            # Проверки лимитов
-            limits = offer.get('limits', {})
-            if not (limits.get('min_age', 18) <= user_criteria['age'] <= limits.get('max_age', 70)):
-                continue
+    def get_filtered_offers(self, user_criteria: Dict[str, Any]) -> List[Dict]:
+        """Получение и ранжирование офферов по критериям пользователя"""
+        self.refresh()
 
-            requested_amount = user_criteria.get('amount', 0)
-            if not (limits.get('min_amount', 0) <= requested_amount <= limits.get('max_amount', 999999)):
-                continue
+        # Фильтрация и сортировка по приоритету выполняются индексированным запросом
+        eligible = self.repository.find_eligible(
+            country=user_criteria['country'],
+            age=user_criteria['age'],
+            amount=user_criteria.get('amount', 0),
+            zero_percent_only=user_criteria.get('zero_percent_only', False)
+        )
 
-            # Проверка 0%
-            if user_criteria.get('zero_percent_only', False) and not offer.get('zero_percent', False):
+        offers = []
+        microloans = self.offers_data.get('microloans', {})
+        for offer_id, priority in eligible:
+            offer = microloans.get(offer_id)
+            if offer is None:
                 continue
 
             # Добавляем с приоритетом
             offer_copy = offer.copy()
-            offer_copy['calculated_priority'] = self.calculate_priority(offer, user_criteria)
+            offer_copy['calculated_priority'] = priority
             offers.append(offer_copy)
 
-        return sorted(offers, key=lambda x: x['calculated_priority'], reverse=True)[:10]
+        return offers
 
     def calculate_priority(self, offer: Dict, user_criteria: Dict) -> float:
         """Расчет приоритета оффера для пользователя"""
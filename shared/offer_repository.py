@@ -0,0 +1,444 @@
+import json
+import logging
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from main_bot.config.settings import OFFERS_DB_FILE, OFFERS_FILE
+from shared.instrumented_db import connect
+from shared.metrics import timed_db
+
+logger = logging.getLogger(__name__)
+
+# Поля оффера, которые раскладываются по колонкам; остальное хранится в offers.extra
+_KNOWN_FIELDS = {
+    'id', 'name', 'logo', 'description', 'zero_percent', 'geography', 'limits', 'loan_terms',
+    'payment_methods', 'metrics', 'priority', 'status'
+}
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS offers (
+        id TEXT PRIMARY KEY,
+        position INTEGER NOT NULL,
+        name TEXT,
+        logo TEXT,
+        description TEXT,
+        zero_percent INTEGER NOT NULL DEFAULT 0,
+        min_days INTEGER,
+        max_days INTEGER,
+        manual_boost INTEGER,
+        final_score REAL,
+        is_active INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT,
+        updated_at TEXT,
+        extra TEXT
+    )""",
+
+    # enabled = страна в geography.countries; ссылка может быть задана и для выключенной страны
+    """CREATE TABLE IF NOT EXISTS offer_geography (
+        offer_id TEXT NOT NULL REFERENCES offers (id) ON DELETE CASCADE,
+        country TEXT NOT NULL,
+        enabled INTEGER NOT NULL DEFAULT 0,
+        link TEXT,
+        has_link INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (offer_id, country)
+    )""",
+
+    """CREATE TABLE IF NOT EXISTS offer_limits (
+        offer_id TEXT PRIMARY KEY REFERENCES offers (id) ON DELETE CASCADE,
+        min_amount INTEGER,
+        max_amount INTEGER,
+        min_age INTEGER,
+        max_age INTEGER
+    )""",
+
+    """CREATE TABLE IF NOT EXISTS offer_metrics (
+        offer_id TEXT PRIMARY KEY REFERENCES offers (id) ON DELETE CASCADE,
+        cr REAL,
+        ar REAL,
+        epc REAL,
+        epl REAL
+    )""",
+
+    """CREATE TABLE IF NOT EXISTS offer_payment_methods (
+        offer_id TEXT NOT NULL REFERENCES offers (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        method TEXT NOT NULL,
+        PRIMARY KEY (offer_id, method)
+    )""",
+
+    """CREATE TABLE IF NOT EXISTS catalog_meta (
+        key TEXT PRIMARY KEY,
+        value
+    )""",
+
+    # Журнал изменений для точечной перезагрузки в других процессах; offer_id NULL - изменен весь каталог
+    """CREATE TABLE IF NOT EXISTS catalog_changes (
+        version INTEGER NOT NULL,
+        offer_id TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_catalog_changes_version ON catalog_changes (version)",
+
+    # Индексы под запрос подбора: страна -> активные офферы -> лимиты
+    "CREATE INDEX IF NOT EXISTS idx_offer_geography_country ON offer_geography (country, enabled, offer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_offers_active ON offers (is_active, position)",
+    # MAX(position) при вставке оффера - без индекса полный просмотр на каждую запись
+    "CREATE INDEX IF NOT EXISTS idx_offers_position ON offers (position)",
+    "CREATE INDEX IF NOT EXISTS idx_offer_limits_age ON offer_limits (min_age, max_age)",
+    "INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('version', 0)"
+]
+
+# Подбор офферов: фильтрация и скор считаются в SQLite (формула OfferManager.calculate_priority)
+ELIGIBLE_OFFERS_SQL = """
+    SELECT o.id,
+           ROUND((COALESCE(m.cr, 0) * 2.0 + COALESCE(m.epc, 0) / 50.0) * COALESCE(o.manual_boost, 1)
+                 + CASE WHEN :zero_only AND o.zero_percent THEN 25 ELSE 0 END, 2) AS score
+    FROM offer_geography g
+    JOIN offers o ON o.id = g.offer_id
+    LEFT JOIN offer_limits l ON l.offer_id = o.id
+    LEFT JOIN offer_metrics m ON m.offer_id = o.id
+    WHERE g.country = :country AND g.enabled = 1
+      AND o.is_active = 1
+      AND COALESCE(o.manual_boost, 1) != 0
+      AND COALESCE(l.min_age, 18) <= :age AND :age <= COALESCE(l.max_age, 70)
+      AND COALESCE(l.min_amount, 0) <= :amount AND :amount <= COALESCE(l.max_amount, 999999)
+      AND (:zero_only = 0 OR o.zero_percent = 1)
+    ORDER BY score DESC, o.position
+    LIMIT :limit
+"""
+
+
+# Сколько последних версий хранит журнал изменений; отставшие читатели перезагружают каталог целиком
+CHANGE_LOG_VERSIONS = 1000
+
+
+def _compact(values: Dict) -> Dict:
+    """Словарь без незаданных полей (как в исходном JSON)"""
+    return {key: value for key, value in values.items() if value is not None}
+
+
+class OfferRepository:
+    """Каталог офферов в SQLite - общий API для основного и админского ботов"""
+
+    def __init__(self, db_file: str = OFFERS_DB_FILE):
+        self.db_file = db_file
+
+    def get_connection(self):
+        """Получение соединения с БД каталога"""
+        conn = connect(self.db_file, "offers", timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def init_catalog(self, json_file: str = OFFERS_FILE):
+        """Создание схемы и однократная миграция офферов из JSON"""
+        directory = os.path.dirname(self.db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self.get_connection()
+        try:
+            # WAL: чтение каталога ботом не блокируется записью из админки
+            conn.execute("PRAGMA journal_mode = WAL")
+            for sql_command in SCHEMA:
+                conn.execute(sql_command)
+            conn.commit()
+
+            migrated = conn.execute("SELECT value FROM catalog_meta WHERE key = 'json_migrated'").fetchone()
+            if migrated is None:
+                self._migrate_from_json(conn, json_file)
+        finally:
+            conn.close()
+
+    def _migrate_from_json(self, conn, json_file: str):
+        """Перенос офферов из старого offers.json одной транзакцией"""
+        microloans = {}
+        if os.path.exists(json_file):
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    microloans = json.load(f).get('microloans', {})
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"Ошибка чтения {json_file} для миграции: {e}")
+                return
+
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Другой процесс мог завершить миграцию, пока мы читали JSON
+            if conn.execute("SELECT 1 FROM catalog_meta WHERE key = 'json_migrated'").fetchone():
+                return
+            for offer_id, offer in microloans.items():
+                self._write_offer(conn, offer_id, offer)
+            conn.execute("INSERT INTO catalog_meta (key, value) VALUES ('json_migrated', 1)")
+            if microloans:
+                self._bump_version(conn, None)
+
+        logger.info(f"✅ Мигрировано офферов из {json_file}: {len(microloans)}")
+
+    @timed_db("offers")
+    def get_version(self) -> int:
+        """Версия каталога - дешевая проверка актуальности кэшей"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()
+            return row[0] if row else 0
+        finally:
+            conn.close()
+
+    @timed_db("offers")
+    def load_catalog(self) -> Tuple[int, Dict[str, Dict]]:
+        """Все офферы в порядке каталога и версия, прочитанные одним снимком"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute("BEGIN")
+                row = conn.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()
+                offers = self._read_offers(conn)
+            return (row[0] if row else 0), offers
+        finally:
+            conn.close()
+
+    @timed_db("offers")
+    def get_offer(self, offer_id: str) -> Optional[Dict]:
+        """Один оффер по ID"""
+        conn = self.get_connection()
+        try:
+            return self._read_offers(conn, [offer_id]).get(offer_id)
+        finally:
+            conn.close()
+
+    @timed_db("offers")
+    def load_changes(self, since_version: int) -> Tuple[int, Optional[Set[str]], Dict[str, Dict]]:
+        """
+        Изменения каталога после since_version одним снимком:
+        (версия, ID измененных офферов, их актуальные данные). Удаленных офферов нет в данных.
+        None вместо ID - журнал не покрывает разрыв, нужна полная перезагрузка
+        """
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute("BEGIN")
+                version = conn.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()[0]
+                if version == since_version:
+                    return version, set(), {}
+
+                rows = conn.execute("SELECT version, offer_id FROM catalog_changes WHERE version > ?",
+                                    (since_version,)).fetchall()
+                logged_versions = {row['version'] for row in rows}
+                if (version < since_version or len(logged_versions) != version - since_version
+                        or any(row['offer_id'] is None for row in rows)):
+                    return version, None, {}
+
+                offer_ids = {row['offer_id'] for row in rows}
+                return version, offer_ids, self._read_offers(conn, sorted(offer_ids))
+        finally:
+            conn.close()
+
+    @timed_db("offers")
+    def find_eligible(self, country: str, age: int, amount: int, zero_percent_only: bool = False,
+                      limit: int = 10) -> List[Tuple[str, float]]:
+        """ID подходящих офферов со скором, отсортированные по приоритету"""
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(ELIGIBLE_OFFERS_SQL, {
+                'country': country,
+                'age': age,
+                'amount': amount,
+                'zero_only': 1 if zero_percent_only else 0,
+                'limit': limit
+            }).fetchall()
+            return [(row['id'], row['score']) for row in rows]
+        finally:
+            conn.close()
+
+    def upsert_offer(self, offer_id: str, offer: Dict) -> int:
+        """Сохранение одного оффера; возвращает новую версию каталога"""
+        return self.upsert_offers({offer_id: offer})
+
+    @timed_db("offers")
+    def upsert_offers(self, offers: Dict[str, Dict]) -> int:
+        """Сохранение нескольких офферов одной транзакцией"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for offer_id, offer in offers.items():
+                    self._write_offer(conn, offer_id, offer)
+                return self._bump_version(conn, offers)
+        finally:
+            conn.close()
+
+    @timed_db("offers")
+    def update_metrics(self, metrics: Dict[str, Dict], updated_at: Optional[str] = None) -> int:
+        """Обновление CPA метрик нескольких офферов одной транзакцией"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO offer_metrics (offer_id, cr, ar, epc, epl) VALUES (?, ?, ?, ?, ?)",
+                    [(offer_id, values.get('cr'), values.get('ar'), values.get('epc'), values.get('epl'))
+                     for offer_id, values in metrics.items()]
+                )
+                if updated_at:
+                    conn.executemany("UPDATE offers SET updated_at = ? WHERE id = ?",
+                                     [(updated_at, offer_id) for offer_id in metrics])
+                return self._bump_version(conn, metrics)
+        finally:
+            conn.close()
+
+    @timed_db("offers")
+    def delete_offer(self, offer_id: str) -> bool:
+        """Удаление оффера со всеми связанными записями"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                deleted = conn.execute("DELETE FROM offers WHERE id = ?", (offer_id,)).rowcount
+                if deleted:
+                    self._bump_version(conn, [offer_id])
+            return bool(deleted)
+        finally:
+            conn.close()
+
+    @timed_db("offers")
+    def replace_catalog(self, offers: Dict[str, Dict]) -> int:
+        """Полная замена каталога (массовые операции) одной транзакцией"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                placeholders = ",".join("?" * len(offers))
+                conn.execute(f"DELETE FROM offers WHERE id NOT IN ({placeholders})", list(offers))
+                for offer_id, offer in offers.items():
+                    self._write_offer(conn, offer_id, offer)
+                return self._bump_version(conn, None)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _bump_version(conn, offer_ids: Optional[Iterable[str]]) -> int:
+        """Новая версия каталога и запись в журнал: какие офферы изменены (None - весь каталог)"""
+        conn.execute("UPDATE catalog_meta SET value = value + 1 WHERE key = 'version'")
+        version = conn.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()[0]
+
+        ids = [None] if offer_ids is None else list(offer_ids)
+        conn.executemany("INSERT INTO catalog_changes (version, offer_id) VALUES (?, ?)",
+                         [(version, offer_id) for offer_id in ids])
+        conn.execute("DELETE FROM catalog_changes WHERE version <= ?", (version - CHANGE_LOG_VERSIONS,))
+        return version
+
+    @staticmethod
+    def _write_offer(conn, offer_id: str, offer: Dict):
+        """Запись оффера во все нормализованные таблицы"""
+        geography = offer.get('geography') or {}
+        limits = offer.get('limits')
+        loan_terms = offer.get('loan_terms') or {}
+        metrics = offer.get('metrics')
+        priority = offer.get('priority') or {}
+        status = offer.get('status') or {}
+        extra = {key: value for key, value in offer.items() if key not in _KNOWN_FIELDS}
+
+        conn.execute("""
+            INSERT INTO offers (id, position, name, logo, description, zero_percent, min_days, max_days,
+                                manual_boost, final_score, is_active, created_at, updated_at, extra)
+            VALUES (?, (SELECT COALESCE(MAX(position), 0) + 1 FROM offers), ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                name = excluded.name, logo = excluded.logo, description = excluded.description,
+                zero_percent = excluded.zero_percent, min_days = excluded.min_days, max_days = excluded.max_days,
+                manual_boost = excluded.manual_boost, final_score = excluded.final_score,
+                is_active = excluded.is_active, created_at = excluded.created_at,
+                updated_at = excluded.updated_at, extra = excluded.extra
+        """, (
+            offer_id, offer.get('name'), offer.get('logo'), offer.get('description'),
+            1 if offer.get('zero_percent') else 0, loan_terms.get('min_days'), loan_terms.get('max_days'),
+            priority.get('manual_boost'), priority.get('final_score'),
+            1 if status.get('is_active', False) else 0, status.get('created_at'), status.get('updated_at'),
+            json.dumps(extra, ensure_ascii=False) if extra else None
+        ))
+
+        for table in ('offer_geography', 'offer_limits', 'offer_metrics', 'offer_payment_methods'):
+            conn.execute(f"DELETE FROM {table} WHERE offer_id = ?", (offer_id,))
+
+        countries = list(geography.get('countries', []))
+        linked = [key[:-len('_link')] for key in geography if key.endswith('_link')]
+        conn.executemany(
+            "INSERT INTO offer_geography (offer_id, country, enabled, link, has_link) VALUES (?, ?, ?, ?, ?)",
+            [(offer_id, country, 1 if country in countries else 0, geography.get(f"{country}_link"),
+              1 if f"{country}_link" in geography else 0)
+             for country in dict.fromkeys(countries + linked)]
+        )
+
+        if limits is not None:
+            conn.execute(
+                "INSERT INTO offer_limits (offer_id, min_amount, max_amount, min_age, max_age) VALUES (?, ?, ?, ?, ?)",
+                (offer_id, limits.get('min_amount'), limits.get('max_amount'), limits.get('min_age'),
+                 limits.get('max_age'))
+            )
+
+        if metrics is not None:
+            conn.execute(
+                "INSERT INTO offer_metrics (offer_id, cr, ar, epc, epl) VALUES (?, ?, ?, ?, ?)",
+                (offer_id, metrics.get('cr'), metrics.get('ar'), metrics.get('epc'), metrics.get('epl'))
+            )
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO offer_payment_methods (offer_id, position, method) VALUES (?, ?, ?)",
+            [(offer_id, position, method) for position, method in enumerate(offer.get('payment_methods') or [])]
+        )
+
+    @staticmethod
+    def _read_offers(conn, offer_ids: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Сборка офферов в JSON-формате из нормализованных таблиц (всех или только offer_ids)"""
+        if offer_ids is None:
+            where = where_offers = ""
+            params = ()
+        else:
+            placeholders = ",".join("?" * len(offer_ids))
+            where, where_offers = f"WHERE offer_id IN ({placeholders})", f"WHERE id IN ({placeholders})"
+            params = tuple(offer_ids)
+
+        offers: Dict[str, Dict] = {}
+        for row in conn.execute(f"SELECT * FROM offers {where_offers} ORDER BY position", params):
+            offer = _compact({'id': row['id'], 'name': row['name']})
+            offer.update({
+                'logo': row['logo'],
+                'geography': {'countries': []},
+                'zero_percent': bool(row['zero_percent']),
+                'payment_methods': [],
+                'priority': _compact({'manual_boost': row['manual_boost'], 'final_score': row['final_score']}),
+                'status': _compact({
+                    'is_active': bool(row['is_active']),
+                    'created_at': row['created_at'],
+                    'updated_at': row['updated_at']
+                })
+            })
+            if row['description'] is not None:
+                offer['description'] = row['description']
+            if row['min_days'] is not None or row['max_days'] is not None:
+                offer['loan_terms'] = _compact({'min_days': row['min_days'], 'max_days': row['max_days']})
+            if row['extra']:
+                offer.update(json.loads(row['extra']))
+            offers[row['id']] = offer
+
+        for row in conn.execute(f"SELECT * FROM offer_geography {where} ORDER BY rowid", params):
+            geography = offers[row['offer_id']]['geography']
+            if row['enabled']:
+                geography['countries'].append(row['country'])
+            if row['has_link']:
+                geography[f"{row['country']}_link"] = row['link']
+
+        for row in conn.execute(f"SELECT * FROM offer_limits {where}", params):
+            offers[row['offer_id']]['limits'] = _compact({
+                'min_amount': row['min_amount'], 'max_amount': row['max_amount'],
+                'min_age': row['min_age'], 'max_age': row['max_age']
+            })
+
+        for row in conn.execute(f"SELECT * FROM offer_metrics {where}", params):
+            offers[row['offer_id']]['metrics'] = _compact({
+                'cr': row['cr'], 'ar': row['ar'], 'epc': row['epc'], 'epl': row['epl']
+            })
+
+        for row in conn.execute(f"SELECT * FROM offer_payment_methods {where} ORDER BY offer_id, position", params):
+            offers[row['offer_id']]['payment_methods'].append(row['method'])
+
+        return offers
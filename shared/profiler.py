@@ -0,0 +1,103 @@
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from shared.metrics_middleware import running_handler
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Кадры ожидания событий: такие сэмплы считаются простоем цикла, а не работой
+_IDLE_FUNCTIONS = {('selectors.py', 'select'), ('base_events.py', '_run_once')}
+
+
+def _frame_label(frame) -> str:
+    """Подпись кадра для collapsed-стека: модуль проекта или библиотеки и функция"""
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(PROJECT_ROOT):
+        module = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        module = os.path.basename(filename)
+    return f"{module}:{code.co_qualname}"
+
+
+class SamplingProfiler:
+    """Сэмплирующий профайлер потока цикла событий: стеки раз в interval секунд, по обработчикам"""
+
+    def __init__(self, output_dir: str, interval: float = 0.005, max_depth: int = 64):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        """Идет ли сейчас профилирование"""
+        return self._lock.locked()
+
+    def run(self, thread_id: int, duration: float) -> Dict[str, Any]:
+        """Профилирование потока thread_id в течение duration секунд (блокирующе, в отдельном потоке)"""
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("Профилирование уже выполняется")
+        try:
+            return self._sample(thread_id, duration)
+        finally:
+            self._lock.release()
+
+    def _sample(self, thread_id: int, duration: float) -> Dict[str, Any]:
+        stacks = collections.Counter()
+        handlers = collections.Counter()
+        total = idle = 0
+
+        started = time.monotonic()
+        deadline = started + duration
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                break
+            total += 1
+
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FUNCTIONS:
+                idle += 1
+            else:
+                handler = running_handler(frame) or "(loop)"
+                labels = []
+                while frame is not None and len(labels) < self.max_depth:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(handler)
+                stacks[";".join(reversed(labels))] += 1
+                handlers[handler] += 1
+
+            time.sleep(self.interval)
+
+        path = self._write(stacks)
+        busy = total - idle
+        return {
+            'path': path,
+            'duration': round(time.monotonic() - started, 1),
+            'samples': total,
+            'busy_samples': busy,
+            'busy_percent': round(busy / total * 100, 1) if total else 0,
+            'handlers': handlers.most_common(10)
+        }
+
+    def _write(self, stacks: collections.Counter) -> Optional[str]:
+        """Запись collapsed-стеков (формат flamegraph.pl / speedscope)"""
+        if not stacks:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        logger.info(f"🔥 Профиль записан: {path} ({sum(stacks.values())} сэмплов)")
+        return path
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from shared.metrics import PROCESS_RESOURCES, STORAGE_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+def directory_size(path: str) -> int:
+    """Суммарный размер файлов каталога (рекурсивно); 0 - каталога нет"""
+    total = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    total += directory_size(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    except FileNotFoundError:
+        pass
+    return total
+
+
+def file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class ResourceMonitor:
+    """Периодические замеры ресурсов процесса и файлов данных с кольцевым буфером последних значений"""
+
+    def __init__(self, files: Dict[str, str], directories: Dict[str, str],
+                 interval: float = 30.0, history: int = 240):
+        self.files = files
+        self.directories = directories
+        self.interval = interval
+        self.samples: deque = deque(maxlen=history)
+        self._process = psutil.Process()
+        self._task: Optional[asyncio.Task] = None
+
+    def _sample_process(self, measure_cpu: bool) -> Dict[str, Any]:
+        """Замер в отдельном потоке: обход каталога логотипов не должен тормозить цикл событий"""
+        process = self._process
+        with process.oneshot():
+            sample = {
+                "rss": process.memory_info().rss,
+                # Загрузка CPU с прошлого периодического замера; первый вызов возвращает 0
+                "cpu_percent": process.cpu_percent(interval=None) if measure_cpu else None,
+                "threads": process.num_threads(),
+                "fds": process.num_fds() if hasattr(process, "num_fds") else 0
+            }
+        sample["storage"] = {name: file_size(path) for name, path in self.files.items()}
+        sample["storage"].update({name: directory_size(path) for name, path in self.directories.items()})
+        return sample
+
+    async def sample(self, measure_cpu: bool = False) -> Dict[str, Any]:
+        """
+        Один замер без записи в буфер; число задач считается в цикле событий.
+
+        Каждый вызов cpu_percent сбрасывает окно измерения, поэтому CPU меряет только периодический
+        замер, а замер по запросу берет загрузку из последнего замера буфера.
+        """
+        tasks = len(asyncio.all_tasks())
+        sample = await asyncio.to_thread(self._sample_process, measure_cpu)
+        if not measure_cpu:
+            sample["cpu_percent"] = self.samples[-1]["cpu_percent"] if self.samples else 0.0
+        sample["ts"] = round(time.time(), 1)
+        sample["tasks"] = tasks
+        return sample
+
+    def history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Последние замеры от старых к новым"""
+        samples = list(self.samples)
+        return samples[-limit:] if limit else samples
+
+    def collect(self):
+        """Сборщик метрик: значения последнего замера"""
+        if not self.samples:
+            return
+        latest = self.samples[-1]
+        for resource in ("rss", "cpu_percent", "threads", "fds", "tasks"):
+            PROCESS_RESOURCES.set(latest[resource], resource=resource)
+        for name, size in latest["storage"].items():
+            STORAGE_BYTES.set(size, path=name)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="resource_monitor")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                self.samples.append(await self.sample(measure_cpu=True))
+            except Exception as e:
+                logger.error(f"Ошибка замера ресурсов процесса: {e}")
+            await asyncio.sleep(self.interval)
@@ -1,11 +1,15 @@
-import sqlite3
 import json
 import logging
 from datetime import datetime
 from typing import Dict, Optional, Any
 from dataclasses import dataclass
 
+from shared.instrumented_db import connect
+from shared.metrics import timed_db
+
 logger = logging.getLogger(__name__)
+# Частые события каждого взаимодействия: в лог попадает выборка (LOG_SAMPLE_RATES)
+event_logger = logging.getLogger(f"{__name__}.events")
 
 
 @dataclass
@@ -31,8 +35,9 @@ class UserProfileManager:
 
     def get_connection(self):
         """Получение соединения с БД"""
-        return sqlite3.connect(self.db_file)
+        return connect(self.db_file, "analytics")
 
+    @timed_db("analytics")
     async def get_or_create_profile(self, telegram_id: int, username: str = None,
                                     first_name: str = None) -> UserProfile:
         """Получение или создание профиля пользователя"""
@@ -97,6 +102,7 @@ class UserProfileManager:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def update_profile_preferences(self, telegram_id: int, country: str = None, age: int = None):
         """Обновление предпочтений пользователя"""
         conn = self.get_connection()
@@ -122,13 +128,14 @@ class UserProfileManager:
                 cursor.execute(query, params)
                 conn.commit()
 
-                logger.info(f"Обновлены предпочтения пользователя {telegram_id}: country={country}, age={age}")
+                event_logger.info(f"Обновлены предпочтения пользователя {telegram_id}: country={country}, age={age}")
 
         except Exception as e:
             logger.error(f"Ошибка обновления предпочтений {telegram_id}: {e}")
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def increment_sessions(self, telegram_id: int):
         """Увеличение счетчика сессий"""
         conn = self.get_connection()
@@ -147,6 +154,7 @@ class UserProfileManager:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def increment_clicks(self, telegram_id: int):
         """Увеличение счетчика кликов"""
         conn = self.get_connection()
@@ -165,6 +173,7 @@ class UserProfileManager:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def get_user_stats(self, telegram_id: int) -> Dict[str, Any]:
         """Получение статистики пользователя"""
         conn = self.get_connection()
@@ -197,6 +206,7 @@ class UserProfileManager:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def check_if_returning_user(self, telegram_id: int) -> bool:
         """Проверка, возвращающийся ли пользователь (есть ли сохраненные страна и возраст)"""
         conn = self.get_connection()
@@ -217,6 +227,7 @@ class UserProfileManager:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def clear_profile(self, telegram_id: int):
         """Очистка профиля пользователя - сброс страны и возраста"""
         conn = self.get_connection()
@@ -241,6 +252,7 @@ class UserProfileManager:
         finally:
             conn.close()
 
+    @timed_db("analytics")
     async def get_recent_user_activity(self, days: int = 7) -> Dict[str, int]:
         """Получение статистики активности за последние дни"""
         conn = self.get_connection()
@@ -199,6 +199,19 @@ ADMIN_IDS=123456789,987654321
 
 # Режим отладки
 DEBUG=True
+
+# Формат логов: json (по умолчанию) или text
+LOG_FORMAT=json
+
+# Запись обезличенных апдейтов в data/captures для воспроизведения (1 - включить)
+RECORD_UPDATES=0
+
+# Предел одновременно обрабатываемых апдейтов основного бота
+MAX_CONCURRENT_UPDATES=64
+
+# Эндпоинты /metrics в формате Prometheus (0 - отключить)
+MAIN_BOT_METRICS_PORT=9101
+ADMIN_BOT_METRICS_PORT=9102
 """
         with open('.env', 'w', encoding='utf-8') as f:
             f.write(env_template)